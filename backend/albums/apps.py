@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class AlbumsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "albums"
+
+    def ready(self):
+        from . import (  # noqa: F401
+            artists,
+            cache,
+            changes,
+            facets,
+            genres,
+            metrics,
+            signals,
+        )
+
+        post_migrate.connect(signals.install_search_index, sender=self)
@@ -0,0 +1,77 @@
+"""
+:class:`Artist` rows for the names in ``Album.artist``.
+
+``Album.artist`` stays the string the API returns; ``Album.artist_ref``
+points at the artist of that name (compared case-insensitively), which is
+created on first use. ``Album.save()`` resolves it through ``pre_save``;
+bulk writers (the bulk endpoints, ``seed_csv``, the synthetic generator)
+resolve a whole batch at once with :class:`ArtistCache`.
+"""
+
+from django.db.models.functions import Lower
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from .models import Album, Artist
+
+
+def artist_key(name):
+    """Key under which names are unique, matching ``Lower("name")``."""
+    return name.lower()
+
+
+def resolve_artists(names):
+    """
+    Return ``{artist_key(name): artist id}`` for ``names``, creating the
+    artists that do not exist yet.
+    """
+    # New artists are created with the first spelling of their name.
+    names = dict(reversed([(artist_key(name), name) for name in names]))
+    if not names:
+        return {}
+    Artist.objects.bulk_create(
+        [Artist(name=name) for name in names.values()], ignore_conflicts=True
+    )
+    ids = {
+        artist_key(name): pk
+        for pk, name in Artist.objects.annotate(key=Lower("name"))
+        .filter(key__in=names)
+        .values_list("pk", "name")
+    }
+    # Python and the database can disagree on the lower case of some
+    # non-ASCII names; look those up one by one.
+    for key, name in names.items():
+        if key not in ids:
+            artist, _ = Artist.objects.get_or_create(
+                name__iexact=name, defaults={"name": name}
+            )
+            ids[key] = artist.pk
+    return ids
+
+
+class ArtistCache:
+    """
+    Artist name -> id map for one import: each name is resolved against the
+    database once, then served from memory.
+    """
+
+    def __init__(self):
+        self.ids = {}
+
+    def assign(self, albums):
+        """Set ``artist_ref`` of every album in ``albums`` from its ``artist``."""
+        missing = [
+            album.artist for album in albums if artist_key(album.artist) not in self.ids
+        ]
+        self.ids.update(resolve_artists(missing))
+        for album in albums:
+            album.artist_ref_id = self.ids[artist_key(album.artist)]
+
+
+@receiver(pre_save, sender=Album)
+def album_saving(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    stored = getattr(instance, "_loaded_values", {})
+    if instance.artist_ref_id is None or stored.get("artist") != instance.artist:
+        ArtistCache().assign([instance])
@@ -0,0 +1,129 @@
+"""
+Async serving of the album read endpoints.
+
+Under ASGI a sync DRF view holds a worker thread for the whole request.
+:class:`AsyncReadRouter` routes ``GET``/``HEAD`` requests for ``list``,
+``retrieve`` and ``random`` to coroutines instead: the same viewset
+(filters, pagination, response cache, conditional GET, fast read path) runs
+on the event loop and reaches the database only through the async ORM
+(``acount``, ``aiterator``, ``aget``). Every other request is passed to the
+regular sync view.
+"""
+
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.urls import URLPattern
+from rest_framework.routers import DefaultRouter
+
+# Viewset actions served by an ``a<action>`` coroutine.
+ASYNC_ACTIONS = {"list", "retrieve", "random"}
+
+
+async def adispatch(view, request, *args, **kwargs):
+    """
+    ``APIView.dispatch`` for a read action, awaiting ``a<action>``; reads
+    go to a replica as in :class:`~albums.replicas.ReplicaReadMixin`.
+    """
+    view.args = args
+    view.kwargs = kwargs
+    request = view.initialize_request(request, *args, **kwargs)
+    view.request = request
+    view.headers = view.default_response_headers
+
+    with view.read_routing(request):
+        try:
+            await ainitial(view, request, *args, **kwargs)
+            handler = getattr(view, f"a{view.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+
+    view.response = view.finalize_response(request, response, *args, **kwargs)
+    return render(view.response)
+
+
+async def ainitial(view, request, *args, **kwargs):
+    """
+    ``APIView.initial`` without the synchronous authenticator run: the user
+    comes from the session via ``request.auser()``. Requests carrying an
+    ``Authorization`` header never get here (see :func:`async_read_view`).
+    """
+    view.format_kwarg = view.get_format_suffix(**kwargs)
+    negotiated = view.perform_content_negotiation(request)
+    request.accepted_renderer, request.accepted_media_type = negotiated
+    version, scheme = view.determine_version(request, *args, **kwargs)
+    request.version, request.versioning_scheme = version, scheme
+
+    auser = getattr(request._request, "auser", None)
+    if auser is not None:
+        request.user = await auser()
+    request.auth = None
+    view.check_permissions(request)
+    view.check_throttles(request)
+
+
+def render(response):
+    """
+    Render a DRF response on the event loop. A plain ``HttpResponse`` is
+    returned because Django's async handler renders template responses in
+    a thread.
+    """
+    if not hasattr(response, "render"):
+        return response
+    response.render()
+    rendered = HttpResponse(
+        response.content, status=response.status_code, headers=response.headers
+    )
+    rendered.cookies = response.cookies
+    if hasattr(response, "albums_cache_key"):
+        rendered.albums_cache_key = response.albums_cache_key
+    return rendered
+
+
+def async_read_view(sync_view):
+    """
+    Wrap the view ``ViewSet.as_view()`` built for one route so that reads
+    of an async action run as a coroutine and everything else runs
+    ``sync_view`` in a thread, as Django would.
+    """
+    actions = sync_view.actions
+    if actions.get("get") not in ASYNC_ACTIONS:
+        return sync_view
+
+    cls, initkwargs = sync_view.cls, sync_view.initkwargs
+    run_sync = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or "HTTP_AUTHORIZATION" in (
+            request.META
+        ):
+            return await run_sync(request, *args, **kwargs)
+
+        self = cls(**initkwargs)
+        self.action_map = {**actions, "head": actions["get"]}
+        self.request = request
+        return await adispatch(self, request, *args, **kwargs)
+
+    # Keep cls/actions/initkwargs (read by the schema generator) and
+    # csrf_exempt from the DRF view.
+    update_wrapper(view, sync_view)
+    return view
+
+
+class AsyncReadRouter(DefaultRouter):
+    """:class:`DefaultRouter` serving read actions through :func:`async_read_view`."""
+
+    def get_urls(self):
+        urls = []
+        for url in super().get_urls():
+            if isinstance(url, URLPattern) and hasattr(url.callback, "actions"):
+                url = URLPattern(
+                    url.pattern,
+                    async_read_view(url.callback),
+                    url.default_args,
+                    url.name,
+                )
+            urls.append(url)
+        return urls
@@ -0,0 +1,152 @@
+"""
+``GET /albums/batch/?ids=3,1,2``: several albums in one request.
+
+The albums not found in the worker's LRU are read with a single ``id__in``
+query and returned in the requested order; ids with no album are listed
+under ``missing``.
+
+The LRU (``ALBUMS_BATCH_LRU_SIZE`` entries, off when 0) holds serialized
+albums stamped with their generation counters from :mod:`albums.cache`. A
+batch checks all stamps with one cache lookup, so hot albums skip the
+database entirely, and an album changed by any worker is re-read, as long
+as the album cache is a backend shared by the workers. Clients pinned to the
+primary (:mod:`albums.replicas`) read past the LRU and refresh it.
+"""
+
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .bulk import is_id
+from .cache import ALBUM_KEY, EPOCH_KEY, get_generations, is_enabled
+from .replicas import pinned_to_primary
+
+
+def get_max_ids():
+    return getattr(settings, "ALBUMS_BATCH_MAX_IDS", 200)
+
+
+class AlbumLRU:
+    """Serialized albums by id, each with the generation it was read at."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    @property
+    def maxsize(self):
+        return getattr(settings, "ALBUMS_BATCH_LRU_SIZE", 0) if is_enabled() else 0
+
+    def get_many(self, stamps):
+        """The albums of ``{pk: generation}`` stored at that generation."""
+        found = {}
+        with self.lock:
+            for pk, generation in stamps.items():
+                entry = self.entries.get(pk)
+                if entry is not None and entry[0] == generation:
+                    self.entries.move_to_end(pk)
+                    found[pk] = entry[1]
+        return found
+
+    def set_many(self, stamps, albums):
+        maxsize = self.maxsize
+        with self.lock:
+            for pk, data in albums.items():
+                self.entries[pk] = (stamps[pk], data)
+                self.entries.move_to_end(pk)
+            while len(self.entries) > maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+lru = AlbumLRU()
+
+
+def parse_ids(value):
+    """Distinct ids from a comma-separated string, in the given order."""
+    ids = {}
+    for part in filter(None, map(str.strip, value.split(","))):
+        try:
+            pk = int(part)
+        except ValueError:
+            pk = None
+        if not is_id(pk):
+            raise ValidationError({"ids": [f"Not an album id: {part}."]})
+        ids.setdefault(pk)
+    if not ids:
+        raise ValidationError({"ids": ["Pass at least one album id."]})
+    if len(ids) > get_max_ids():
+        raise ValidationError({"ids": [f"At most {get_max_ids()} ids per request."]})
+    return list(ids)
+
+
+class BatchRetrieveMixin:
+    """``GET /albums/batch/?ids=``: albums by id, in the requested order."""
+
+    @extend_schema(
+        summary="Get several albums by id",
+        description="Return the albums with the given ids in the requested "
+        "order, read with a single query; ids with no album are listed under "
+        "`missing`. Duplicate ids are returned once.",
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                description="Comma-separated album ids "
+                "(at most `ALBUMS_BATCH_MAX_IDS`, 200 by default)",
+                required=True,
+                type=str,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description='`{"results": [album, ...], "missing": [id, ...]}`'
+            ),
+            400: OpenApiResponse(description="Missing, invalid or too many ids"),
+        },
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def batch(self, request, *args, **kwargs):
+        ids = parse_ids(request.query_params.get("ids", ""))
+        # The LRU holds whole albums: read them all, then drop fields.
+        names = self.parse_requested_fields()
+        albums = self.get_albums_by_id(ids)
+        results = [albums[pk] for pk in ids if pk in albums]
+        return Response(
+            {
+                "results": self.prune_fields(results, many=True, names=names),
+                "missing": [pk for pk in ids if pk not in albums],
+            }
+        )
+
+    def accepts_sparse_fieldsets(self):
+        return self.action == "batch" or super().accepts_sparse_fieldsets()
+
+    def get_albums_by_id(self, ids):
+        """``{pk: serialized album}`` for the ids that exist."""
+        stamps = {}
+        if lru.maxsize:
+            generations = get_generations(
+                EPOCH_KEY, *(ALBUM_KEY.format(pk) for pk in ids)
+            )
+            stamps = {pk: (generations[0], g) for pk, g in zip(ids, generations[1:])}
+        albums = {} if pinned_to_primary(self.request) else lru.get_many(stamps)
+
+        wanted = [pk for pk in ids if pk not in albums]
+        if wanted:
+            queryset = self.get_read_queryset(self.get_queryset().filter(pk__in=wanted))
+            fetched = {
+                item["id"]: item
+                for item in self.represent(queryset.order_by(), many=True)
+            }
+            if stamps:
+                lru.set_many(stamps, fetched)
+            albums.update(fetched)
+        return albums
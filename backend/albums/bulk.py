@@ -0,0 +1,207 @@
+from django.conf import settings
+from django.db import transaction
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from . import facets, genres
+from .artists import ArtistCache
+from .models import Album
+from .serializers import DUPLICATE_MESSAGE
+from .signals import catalogue_batch, catalogue_changed
+
+BULK_ACTIONS = {"bulk_create", "bulk_update", "bulk_destroy"}
+
+# The range of the bigint primary key; larger ids overflow the query.
+MAX_ID = 2**63 - 1
+
+
+def is_id(value):
+    return (
+        isinstance(value, int) and not isinstance(value, bool) and 0 < value <= MAX_ID
+    )
+
+
+class BulkActionsMixin:
+    """
+    ``POST``/``PATCH``/``DELETE`` on ``/albums/bulk/``: create, update or
+    delete many albums in one request and one transaction.
+
+    Payloads are JSON arrays of at most ``ALBUMS_BULK_MAX_BATCH`` items. The
+    batch is all-or-nothing: if any item is invalid, nothing is written and
+    the 400 response holds one error object per item (``{}`` for valid ones).
+    """
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # Natural key uniqueness is checked once per batch instead of once
+        # per item, see check_natural_keys().
+        context["bulk"] = self.action in BULK_ACTIONS
+        return context
+
+    def get_bulk_items(self, request):
+        items = request.data
+        max_batch = getattr(settings, "ALBUMS_BULK_MAX_BATCH", 1000)
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of items."]})
+        if not items:
+            raise ValidationError({"non_field_errors": ["The list is empty."]})
+        if len(items) > max_batch:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"Ensure this list has no more than {max_batch} items."
+                    ]
+                }
+            )
+        return items
+
+    def check_natural_keys(self, albums, errors):
+        """
+        Flag albums whose natural key is repeated within the batch or already
+        taken by an album outside it; one query for the whole batch.
+        """
+        positions = [index for index, error in enumerate(errors) if not error]
+        keys = [albums[index].natural_key for index in positions]
+        taken = set(
+            Album.objects.filter(natural_key__in=keys)
+            .exclude(pk__in=[albums[index].pk for index in positions])
+            .values_list("natural_key", flat=True)
+        )
+        seen = set()
+        for index, key in zip(positions, keys):
+            if key in taken or key in seen:
+                errors[index] = {"non_field_errors": [DUPLICATE_MESSAGE]}
+            seen.add(key)
+
+    @extend_schema(
+        summary="Create albums in bulk",
+        description="Create a list of albums in a single transaction.",
+        request=serializers.ListSerializer(child=serializers.DictField()),
+        responses={
+            201: OpenApiResponse(description="Created albums, in request order"),
+            400: OpenApiResponse(description="Per-item validation errors"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        # One serializer validates every item; building the fields of a
+        # ModelSerializer costs more than validating a flat album.
+        serializer = self.get_serializer()
+        albums, errors = [], []
+        for item in self.get_bulk_items(request):
+            try:
+                album = Album(**serializer.run_validation(item))
+            except ValidationError as exc:
+                albums.append(None)
+                errors.append(exc.detail)
+                continue
+            album.refresh_natural_key()
+            albums.append(album)
+            errors.append({})
+        self.check_natural_keys(albums, errors)
+        if any(errors):
+            raise ValidationError(errors)
+
+        with transaction.atomic():
+            ArtistCache().assign(albums)
+            Album.objects.bulk_create(albums)
+            genres.sync_genres(
+                ((album.pk, album.genre) for album in albums), created=True
+            )
+            facets.record_saved(albums, created=True)
+            catalogue_changed.send(
+                sender=Album, album_ids=[album.pk for album in albums]
+            )
+
+        data = self.get_serializer(albums, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Update albums in bulk",
+        description="Partially update a list of albums, each identified by `id`, "
+        "in a single transaction.",
+        request=serializers.ListSerializer(child=serializers.DictField()),
+        responses={
+            200: OpenApiResponse(description="Updated albums, in request order"),
+            400: OpenApiResponse(description="Per-item validation errors"),
+        },
+    )
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        items = self.get_bulk_items(request)
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        # Lists and dicts cannot be looked up below; report them as unknown.
+        ids = [pk if is_id(pk) else None for pk in ids]
+        instances = Album.objects.in_bulk([pk for pk in ids if pk is not None])
+
+        serializer = self.get_serializer(partial=True)
+        albums, errors, seen = [], [], set()
+        for item, pk in zip(items, ids):
+            instance = instances.get(pk) if pk not in seen else None
+            seen.add(pk)
+            if instance is None:
+                albums.append(None)
+                errors.append({"id": ["Unknown or repeated album id."]})
+                continue
+            serializer.instance = instance
+            try:
+                attrs = serializer.run_validation(item)
+            except ValidationError as exc:
+                albums.append(None)
+                errors.append(exc.detail)
+                continue
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            instance.refresh_natural_key()
+            albums.append(instance)
+            errors.append({})
+        self.check_natural_keys(albums, errors)
+        if any(errors):
+            raise ValidationError(errors)
+
+        with transaction.atomic():
+            ArtistCache().assign(albums)
+            Album.objects.bulk_update(
+                albums,
+                ["artist", "artist_ref", "title", "year", "genre", "natural_key"],
+            )
+            genres.sync_genres((album.pk, album.genre) for album in albums)
+            facets.record_saved(albums)
+            catalogue_changed.send(
+                sender=Album, album_ids=[album.pk for album in albums]
+            )
+
+        return Response(self.get_serializer(albums, many=True).data)
+
+    @extend_schema(
+        summary="Delete albums in bulk",
+        description="Delete a list of albums, given as an array of ids, "
+        "in a single transaction.",
+        request=serializers.ListSerializer(child=serializers.IntegerField()),
+        responses={
+            204: OpenApiResponse(description="Albums deleted successfully"),
+            400: OpenApiResponse(description="Per-item errors (unknown ids)"),
+        },
+    )
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        ids = self.get_bulk_items(request)
+        existing = set(
+            Album.objects.filter(pk__in=[pk for pk in ids if is_id(pk)]).values_list(
+                "pk", flat=True
+            )
+        )
+        errors = [
+            {} if is_id(pk) and pk in existing else {"id": ["Unknown album id."]}
+            for pk in ids
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+
+        with transaction.atomic(), catalogue_batch(), facets.deferred_deltas():
+            Album.objects.filter(pk__in=existing).delete()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
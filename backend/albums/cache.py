@@ -0,0 +1,231 @@
+"""
+Response cache for the album read endpoints.
+
+Entries are keyed on generation counters instead of being deleted on write:
+every catalogue change bumps the counters it affects, so the next read looks
+up a fresh key and stale entries simply expire. The collection generation
+covers list pages (any write can move rows between pages); album details
+are keyed on a per-album generation plus an epoch bumped by bulk changes.
+
+The backend is any Django cache alias (``ALBUMS_CACHE_ALIAS``): local memory
+for a single process, or a shared backend such as Redis or Memcached when
+several workers must see each other's invalidations.
+"""
+
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.response import Response
+
+from .replicas import pinned_to_primary
+from .signals import catalogue_changed
+
+COLLECTION_KEY = "albums:gen"
+EPOCH_KEY = "albums:gen:epoch"
+ALBUM_KEY = "albums:gen:album:{}"
+# Changes touching more albums than this bump the epoch instead of one
+# counter per album.
+MAX_ALBUM_BUMPS = 50
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[getattr(settings, "ALBUMS_CACHE_ALIAS", "default")]
+
+
+def is_enabled():
+    return getattr(settings, "ALBUMS_CACHE_ENABLED", True)
+
+
+def get_timeout():
+    return getattr(settings, "ALBUMS_CACHE_TIMEOUT", 300)
+
+
+def get_generations(*keys):
+    """
+    Return the current value of each generation counter. Missing counters
+    start from the clock, so an evicted counter can never fall back to a
+    value that older cache entries were stored under.
+    """
+    cache = get_cache()
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns(), None)
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+async def aget_generations(*keys):
+    """Async version of :func:`get_generations`."""
+    cache = get_cache()
+    values = await cache.aget_many(keys)
+    for key in keys:
+        if key not in values:
+            await cache.aadd(key, time.time_ns(), None)
+            values[key] = await cache.aget(key)
+    return [values[key] for key in keys]
+
+
+def collection_generation():
+    return get_generations(COLLECTION_KEY)[0]
+
+
+async def acollection_generation():
+    return (await aget_generations(COLLECTION_KEY))[0]
+
+
+def bump(*keys):
+    cache = get_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+@receiver(catalogue_changed)
+def invalidate(sender, album_ids=None, **kwargs):
+    if album_ids is None or len(album_ids) > MAX_ALBUM_BUMPS:
+        keys = [COLLECTION_KEY, EPOCH_KEY]
+    else:
+        keys = [COLLECTION_KEY, *(ALBUM_KEY.format(pk) for pk in album_ids)]
+    # Bump now for reads later in this transaction, and again on commit so
+    # a concurrent read cannot re-cache the pre-commit state.
+    bump(*keys)
+    transaction.on_commit(lambda: bump(*keys))
+
+
+def record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def stats():
+    """Hit/miss counters of this process."""
+    with _stats_lock:
+        return {"hits": _stats["hit"], "misses": _stats["miss"]}
+
+
+def normalize_query(query_params):
+    """
+    Canonical form of a query string: keys sorted, empty values and the
+    default ``page=1`` dropped, repeated values kept in order.
+    """
+    items = []
+    for key in sorted(query_params):
+        values = [value for value in query_params.getlist(key) if value != ""]
+        if key == "page" and values == ["1"]:
+            continue
+        items.extend((key, value) for value in values)
+    return items
+
+
+def response_key(request, action, generations):
+    raw = repr(
+        (
+            action,
+            generations,
+            # Both end up in the pagination links of the cached data.
+            request.scheme,
+            request.get_host(),
+            request.path,
+            normalize_query(request.query_params),
+        )
+    )
+    return "albums:response:" + hashlib.md5(raw.encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """
+    Serve ``list`` and ``retrieve`` from the album cache. Only successful
+    responses are stored; ``X-Cache`` reports whether the request hit.
+    Clients pinned to the primary always miss, so they see their writes.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            [COLLECTION_KEY], super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        keys = self.get_album_generation_keys()
+        if keys is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.cached_response(keys, super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(
+            [COLLECTION_KEY], super().alist, request, *args, **kwargs
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        keys = self.get_album_generation_keys()
+        if keys is None:
+            return await super().aretrieve(request, *args, **kwargs)
+        return await self.acached_response(
+            keys, super().aretrieve, request, *args, **kwargs
+        )
+
+    def get_album_generation_keys(self):
+        try:
+            pk = int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (KeyError, ValueError):
+            return None
+        return [EPOCH_KEY, ALBUM_KEY.format(pk)]
+
+    def cached_response(self, generation_keys, handler, request, *args, **kwargs):
+        if not is_enabled():
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = response_key(request, self.action, get_generations(*generation_keys))
+        data = None if pinned_to_primary(request) else cache.get(key)
+        if data is not None:
+            return self.cache_hit(data, key)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, get_timeout())
+        return self.cache_miss(response, key)
+
+    async def acached_response(
+        self, generation_keys, handler, request, *args, **kwargs
+    ):
+        if not is_enabled():
+            return await handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        generations = await aget_generations(*generation_keys)
+        key = response_key(request, self.action, generations)
+        data = None if pinned_to_primary(request) else await cache.aget(key)
+        if data is not None:
+            return self.cache_hit(data, key)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(key, response.data, get_timeout())
+        return self.cache_miss(response, key)
+
+    def cache_hit(self, data, key):
+        record("hit")
+        response = Response(data, headers={"X-Cache": "HIT"})
+        # Lets CompressionMiddleware cache the encoded body under this key.
+        response.albums_cache_key = key
+        return response
+
+    def cache_miss(self, response, key):
+        record("miss")
+        response["X-Cache"] = "MISS"
+        if response.status_code == status.HTTP_200_OK:
+            response.albums_cache_key = key
+        return response
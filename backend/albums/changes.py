@@ -0,0 +1,160 @@
+"""
+Change feed: ``GET /albums/changes/?since=<cursor>``.
+
+Every catalogue change bumps :class:`CatalogueVersion` and stamps the
+albums it wrote with the new version in ``Album.change_seq``; deleted
+albums leave an :class:`AlbumTombstone` with that version. The bump locks
+the version row until the writing transaction ends, so changes commit in
+``change_seq`` order and a cursor never skips a change committed later.
+
+Writers that send ``catalogue_changed`` with album ids are stamped by
+:func:`record_changes`. Bulk writers that send ``album_ids=None``
+(``seed_csv``) stamp their rows themselves with :func:`next_change_seq`;
+synthetic albums are not stamped and keep sequence 0, like albums written
+before the feed existed. A sync without ``since`` starts from them.
+
+The feed lists albums and tombstones after the cursor in ``(change_seq,
+id)`` order, read through the ``album_change_seq_idx`` and
+``album_tombstone_seq_idx`` indexes, so a sync costs O(changes).
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.dispatch import receiver
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Album, AlbumTombstone, CatalogueVersion
+from .signals import catalogue_changed
+
+
+def next_change_seq():
+    """The ``change_seq`` for the albums written by the current transaction."""
+    return CatalogueVersion.bump()
+
+
+@receiver(catalogue_changed)
+def record_changes(sender, album_ids=None, **kwargs):
+    with transaction.atomic():
+        seq = next_change_seq()
+        if album_ids:
+            stamp(album_ids, seq)
+
+
+def stamp(album_ids, seq):
+    """Stamp ``album_ids`` with ``seq``; the ids with no album were deleted."""
+    present = set(Album.objects.filter(pk__in=album_ids).values_list("pk", flat=True))
+    if present:
+        Album.objects.filter(pk__in=present).update(change_seq=seq)
+    AlbumTombstone.objects.bulk_create(
+        AlbumTombstone(album_id=pk, change_seq=seq)
+        for pk in album_ids
+        if pk not in present
+    )
+
+
+def get_page_size():
+    return getattr(settings, "ALBUMS_CHANGES_PAGE_SIZE", 1000)
+
+
+def parse_cursor(value):
+    """``(seq, id)`` from ``"seq:id"``, or ``(seq, None)`` from ``"seq"``."""
+    seq, _, pk = value.partition(":")
+    try:
+        return int(seq), int(pk) if pk else None
+    except ValueError:
+        raise ValidationError({"since": [f"Not a change cursor: {value}."]})
+
+
+def after(position, seq_field, id_field):
+    """``(seq_field, id_field) > position``."""
+    seq, pk = position
+    if pk is None:
+        return Q(**{f"{seq_field}__gt": seq})
+    return Q(**{f"{seq_field}__gt": seq}) | Q(**{seq_field: seq, f"{id_field}__gt": pk})
+
+
+class ChangeFeedMixin:
+    """``GET /albums/changes/?since=``: albums changed or deleted after a cursor."""
+
+    @extend_schema(
+        summary="List catalogue changes",
+        description="Albums created, updated or deleted after the `since` "
+        "cursor, oldest change first. Pass the returned `cursor` as `since` "
+        "on the next sync; `next` is set while more changes are waiting. "
+        "Without `since` the feed starts from the beginning of the catalogue.",
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                description="Cursor returned by the previous call",
+                type=str,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="Changes per response "
+                "(at most `ALBUMS_CHANGES_PAGE_SIZE`, 1000 by default)",
+                type=int,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description='`{"changes": [{"seq", "id", "deleted", "album"}, '
+                '...], "cursor": str, "next": url}`'
+            ),
+            400: OpenApiResponse(description="Invalid cursor"),
+        },
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def changes(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        position = parse_cursor(since) if since else (-1, None)
+        limit = self.get_changes_limit(request)
+
+        albums = self.get_read_queryset(
+            self.get_queryset()
+            .filter(after(position, "change_seq", "id"))
+            .order_by("change_seq", "id"),
+            "change_seq",
+        )[: limit + 1]
+        tombstones = (
+            AlbumTombstone.objects.filter(after(position, "change_seq", "album_id"))
+            .order_by("change_seq", "album_id")
+            .values_list("change_seq", "album_id")[: limit + 1]
+        )
+
+        rows = list(albums)
+        changes = [
+            {"seq": row.change_seq, "id": row.id, "deleted": False, "album": album}
+            for row, album in zip(rows, self.represent(rows, many=True))
+        ]
+        changes += [
+            {"seq": seq, "id": pk, "deleted": True, "album": None}
+            for seq, pk in tombstones
+        ]
+        changes.sort(key=lambda change: (change["seq"], change["id"]))
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        cursor = since
+        if changes:
+            cursor = f"{changes[-1]['seq']}:{changes[-1]['id']}"
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "since", cursor
+            )
+        return Response({"changes": changes, "cursor": cursor, "next": next_url})
+
+    def get_changes_limit(self, request):
+        page_size = get_page_size()
+        try:
+            limit = int(request.query_params["limit"])
+        except (KeyError, ValueError):
+            return page_size
+        if limit <= 0:
+            return page_size
+        return min(limit, page_size)
@@ -0,0 +1,227 @@
+"""
+Response compression negotiated through ``Accept-Encoding``.
+
+:class:`CompressionMiddleware` encodes JSON, NDJSON and CSV responses with
+the best coding the client accepts: zstd and brotli when the optional
+``zstandard`` and ``brotli`` packages are installed, gzip otherwise.
+Responses smaller than ``ALBUMS_COMPRESSION_MIN_SIZE`` bytes are sent as
+they are. Streaming responses (the export) are compressed chunk by chunk
+and flushed after every chunk, so nothing is buffered.
+
+Responses served by :class:`~albums.cache.CachedResponseMixin` carry their
+cache key; their compressed bytes are stored next to the cached data, per
+coding and content type, and reused on later hits. They expire with it.
+
+The API carries no secrets or CSRF tokens, so there is no BREACH padding.
+"""
+
+import gzip
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .cache import get_cache, get_timeout
+from .metrics import phase
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional speedup
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is an optional speedup
+    zstandard = None
+
+# Levels that favour speed: responses are compressed on every cache miss.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/csv")
+
+
+class GzipStream:
+    def __init__(self):
+        self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def feed(self, chunk):
+        return self.compressor.compress(chunk) + self.compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliStream:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def feed(self, chunk):
+        return self.compressor.process(chunk) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class ZstdStream:
+    def __init__(self):
+        self.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def feed(self, chunk):
+        return self.compressor.compress(chunk) + self.compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+def gzip_compress(data):
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+# Content coding -> (one-shot compressor, stream class), best first.
+CODINGS = {}
+if zstandard is not None:
+    CODINGS["zstd"] = (
+        zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress,
+        ZstdStream,
+    )
+if brotli is not None:
+    CODINGS["br"] = (
+        lambda data: brotli.compress(data, quality=BROTLI_QUALITY),
+        BrotliStream,
+    )
+CODINGS["gzip"] = (gzip_compress, GzipStream)
+
+
+def parse_accept_encoding(header):
+    """``{coding: q}`` for an ``Accept-Encoding`` header."""
+    weights = {}
+    for item in header.split(","):
+        coding, *params = item.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding.strip():
+            weights[coding.strip().lower()] = q
+    return weights
+
+
+def choose_coding(header):
+    """The preferred available coding acceptable to the client, or ``None``."""
+    weights = parse_accept_encoding(header)
+    best, best_q = None, 0.0
+    for coding in CODINGS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(coding, data):
+    return CODINGS[coding][0](data)
+
+
+def compress_stream(coding, chunks):
+    stream = CODINGS[coding][1]()
+    for chunk in chunks:
+        if output := stream.feed(chunk):
+            yield output
+    yield stream.finish()
+
+
+async def acompress_stream(coding, chunks):
+    stream = CODINGS[coding][1]()
+    async for chunk in chunks:
+        if output := stream.feed(chunk):
+            yield output
+    yield stream.finish()
+
+
+def get_min_size():
+    return getattr(settings, "ALBUMS_COMPRESSION_MIN_SIZE", 1024)
+
+
+class CompressionMiddleware:
+    """Compresses responses as negotiated; works under WSGI and ASGI."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def acall(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if not self.is_compressible(response):
+            return response
+        patch_vary_headers(response, ["Accept-Encoding"])
+        coding = choose_coding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if coding is None:
+            return response
+
+        with phase("compress"):
+            if response.streaming:
+                if response.is_async:
+                    response.streaming_content = acompress_stream(
+                        coding, response.streaming_content
+                    )
+                else:
+                    response.streaming_content = compress_stream(
+                        coding, response.streaming_content
+                    )
+                del response["Content-Length"]
+            else:
+                if len(response.content) < get_min_size():
+                    return response
+                response.content = self.compressed_content(response, coding)
+                response["Content-Length"] = str(len(response.content))
+
+        # The encoded bytes differ from the identity ones.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = coding
+        return response
+
+    def is_compressible(self, response):
+        if response.has_header("Content-Encoding") or response.status_code < 200:
+            return False
+        if response.status_code in (204, 304):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        return content_type in COMPRESSIBLE_TYPES
+
+    def compressed_content(self, response, coding):
+        """Compress the body, through the album cache for cached responses."""
+        cache_key = getattr(response, "albums_cache_key", None)
+        if cache_key is None:
+            return compress(coding, response.content)
+        key = f"{cache_key}:{coding}:{response['Content-Type']}"
+        cache = get_cache()
+        content = cache.get(key)
+        if content is None:
+            content = compress(coding, response.content)
+            cache.set(key, content, get_timeout())
+        return content
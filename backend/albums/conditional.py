@@ -0,0 +1,84 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+
+from .cache import normalize_query
+from .models import Album, CatalogueVersion
+
+
+class ConditionalGetMixin:
+    """
+    Strong ``ETag`` and ``Last-Modified`` for ``list`` and ``retrieve``,
+    derived from :class:`CatalogueVersion`. A matching ``If-None-Match`` (or
+    ``If-Modified-Since``) is answered with 304 after a single primary key
+    lookup, before any album is queried or serialized.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            super().aretrieve, request, *args, **kwargs
+        )
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified, response = self.check_preconditions(
+            request, *CatalogueVersion.current()
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified, response = self.check_preconditions(
+            request, *await CatalogueVersion.acurrent()
+        )
+        if response is None:
+            response = await handler(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def check_preconditions(self, request, version, modified_at):
+        """
+        Return ``(etag, last_modified, response)``; ``response`` is the 304
+        (or 412) to send instead of running the view, or ``None``.
+        """
+        etag = self.get_etag(request, version)
+        last_modified = int(modified_at.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        return etag, last_modified, response
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code not in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+            status.HTTP_412_PRECONDITION_FAILED,
+        ):
+            return response
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+    def get_etag(self, request, version):
+        raw = repr(
+            (
+                Album._meta.label,
+                version,
+                request.get_host(),
+                request.path,
+                normalize_query(request.query_params),
+                request.accepted_media_type,
+            )
+        )
+        return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
@@ -0,0 +1,277 @@
+"""
+Album counts by genre tag, artist and decade for filter sidebars.
+
+Unfiltered facets are read from :class:`FacetCount`, which is kept current
+incrementally: single album saves and deletes and the bulk endpoints apply
+``+1``/``-1`` deltas for the values they add and remove, and changes of
+unknown scope (``catalogue_changed`` with ``album_ids=None``, e.g.
+``seed_csv``) rebuild the table with one ``GROUP BY`` pass. Requests with
+list filters count the matching albums directly.
+"""
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import COLLECTION_KEY
+from .filters import AlbumFilter
+from .models import Album, FacetCount, decade_of, split_genre
+from .signals import catalogue_changed
+
+FACETS = [FacetCount.GENRE, FacetCount.ARTIST, FacetCount.DECADE]
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 1000
+# Query parameters that narrow the counted albums; anything else (ordering,
+# pagination) leaves the stored counts valid.
+FILTER_PARAMS = {*AlbumFilter.base_filters, "search", "q"}
+
+_pending_deltas = ContextVar("albums_pending_facet_deltas", default=None)
+
+
+def facet_values(artist, year, genre):
+    """The ``(facet, value)`` pairs an album with these fields counts towards."""
+    return [
+        (FacetCount.ARTIST, artist),
+        (FacetCount.DECADE, str(decade_of(year))),
+        *((FacetCount.GENRE, tag) for tag in split_genre(genre)),
+    ]
+
+
+def count_facets(queryset):
+    """Facet counts of ``queryset`` as a ``Counter`` of ``(facet, value)``."""
+    queryset = queryset.order_by()
+    counts = Counter()
+    for artist, count in queryset.values_list("artist").annotate(Count("pk")):
+        counts[FacetCount.ARTIST, artist] += count
+    decades = queryset.values_list(F("year") / 10 * 10)
+    for decade, count in decades.annotate(Count("pk")):
+        counts[FacetCount.DECADE, str(decade)] += count
+    # Distinct genre strings are few compared to albums.
+    for genre, count in queryset.values_list("genre").annotate(Count("pk")):
+        for tag in split_genre(genre):
+            counts[FacetCount.GENRE, tag] += count
+    return counts
+
+
+def matching(keys):
+    return reduce(or_, (Q(facet=facet, value=value) for facet, value in keys))
+
+
+@contextmanager
+def deferred_deltas():
+    """
+    Collect the facet changes made inside the block and apply them at once
+    on exit, e.g. around a queryset delete that sends one ``post_delete``
+    per album.
+    """
+    pending = Counter()
+    token = _pending_deltas.set(pending)
+    try:
+        yield
+    finally:
+        _pending_deltas.reset(token)
+    apply_deltas(pending)
+
+
+def apply_deltas(deltas):
+    """Add ``deltas`` (``(facet, value)`` -> change) to the stored counts."""
+    pending = _pending_deltas.get()
+    if pending is not None:
+        pending.update(deltas)
+        return
+    deltas = {key: change for key, change in deltas.items() if change}
+    if not deltas:
+        return
+    # Counts that fail to update must take the album write down with them, so
+    # no savepoint to roll back to: an error marks the outer transaction.
+    with transaction.atomic(savepoint=False):
+        FacetCount.objects.bulk_create(
+            [
+                FacetCount(facet=facet, value=value)
+                for (facet, value), change in deltas.items()
+                if change > 0
+            ],
+            ignore_conflicts=True,
+        )
+        by_change = defaultdict(list)
+        for key, change in deltas.items():
+            by_change[change].append(key)
+        for change, keys in by_change.items():
+            FacetCount.objects.filter(matching(keys)).update(count=F("count") + change)
+        decreased = [key for key, change in deltas.items() if change < 0]
+        if decreased:
+            FacetCount.objects.filter(matching(decreased), count__lte=0).delete()
+
+
+def rebuild():
+    """Recount every facet from the album table."""
+    counts = count_facets(Album.objects.all())
+    with transaction.atomic():
+        FacetCount.objects.all().delete()
+        FacetCount.objects.bulk_create(
+            (
+                FacetCount(facet=facet, value=value, count=count)
+                for (facet, value), count in counts.items()
+            ),
+            batch_size=1000,
+        )
+
+
+def stored_values(album):
+    loaded = getattr(album, "_loaded_values", {})
+    return [
+        loaded.get(name, getattr(album, name)) for name in ("artist", "year", "genre")
+    ]
+
+
+def record_saved(albums, created=False):
+    """
+    Apply the facet changes of ``albums`` written without model signals
+    (``bulk_create``/``bulk_update``). Updated albums must have been loaded
+    from the database, so their previous values are known.
+    """
+    apply_deltas(saved_deltas(albums, created))
+    for album in albums:
+        album.remember_values()
+
+
+def saved_deltas(albums, created):
+    deltas = Counter()
+    for album in albums:
+        if not created:
+            deltas.subtract(facet_values(*stored_values(album)))
+        deltas.update(facet_values(album.artist, album.year, album.genre))
+    return deltas
+
+
+@receiver(post_save, sender=Album)
+def album_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if not created and not hasattr(instance, "_loaded_values"):
+        # Saved over a row this instance was not loaded from.
+        transaction.on_commit(rebuild)
+        return
+    # Album.save() records the new values once every receiver has run.
+    apply_deltas(saved_deltas([instance], created))
+
+
+@receiver(post_delete, sender=Album)
+def album_deleted(sender, instance, **kwargs):
+    deltas = Counter()
+    deltas.subtract(facet_values(*stored_values(instance)))
+    apply_deltas(deltas)
+
+
+@receiver(catalogue_changed)
+def catalogue_rebuilt(sender, album_ids=None, **kwargs):
+    if album_ids is None:
+        transaction.on_commit(rebuild)
+
+
+class FacetsActionMixin:
+    """
+    ``GET /albums/facets/``: album counts by genre tag, artist and decade,
+    narrowed by the same filters and search as the list.
+    """
+
+    @extend_schema(
+        summary="Album facets",
+        filters=True,
+        description="Number of albums per genre tag (genres split on `/`), "
+        "artist and decade, most common first. Accepts the list filters and "
+        "search parameters.",
+        parameters=[
+            OpenApiParameter(
+                name="facet",
+                description="Comma-separated facets to return "
+                "(`genre`, `artist`, `decade`; default: all)",
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description=f"Values per facet (default {DEFAULT_LIMIT}, "
+                f"max {MAX_LIMIT})",
+                required=False,
+                type=int,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="`{facet: [{value, count}, ...]}`, e.g. "
+                '`{"decade": [{"value": 1970, "count": 12}]}`'
+            ),
+            400: OpenApiResponse(description="Unknown facet or invalid limit"),
+        },
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def facets(self, request, *args, **kwargs):
+        return self.cached_response(
+            [COLLECTION_KEY], self.facets_response, request, *args, **kwargs
+        )
+
+    def facets_response(self, request, *args, **kwargs):
+        facets, limit = self.get_facet_params(request)
+        if any(request.query_params.get(param) for param in FILTER_PARAMS):
+            queryset = self.filter_queryset(self.get_queryset())
+            counts = count_facets(Album.objects.filter(pk__in=queryset.values("pk")))
+            top = self.top_counts(counts, facets, limit)
+        else:
+            top = {
+                facet: list(
+                    FacetCount.objects.filter(facet=facet)
+                    .order_by("-count", "value")
+                    .values_list("value", "count")[:limit]
+                )
+                for facet in facets
+            }
+        return Response(
+            {
+                facet: [
+                    {
+                        "value": int(value) if facet == FacetCount.DECADE else value,
+                        "count": count,
+                    }
+                    for value, count in top[facet]
+                ]
+                for facet in facets
+            }
+        )
+
+    def get_facet_params(self, request):
+        facets = request.query_params.get("facet")
+        facets = [f.strip() for f in facets.split(",")] if facets else FACETS
+        unknown = [facet for facet in facets if facet not in FACETS]
+        if unknown:
+            raise ValidationError({"facet": [f"Unknown facet: {', '.join(unknown)}."]})
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValidationError(
+                {"limit": [f"Must be an integer between 1 and {MAX_LIMIT}."]}
+            )
+        return list(dict.fromkeys(facets)), limit
+
+    def top_counts(self, counts, facets, limit):
+        top = {facet: [] for facet in facets}
+        for (facet, value), count in counts.items():
+            if facet in top:
+                top[facet].append((value, count))
+        return {
+            facet: sorted(values, key=lambda item: (-item[1], item[0]))[:limit]
+            for facet, values in top.items()
+        }
@@ -0,0 +1,242 @@
+"""
+Read path for the album list, detail and random endpoints that skips model
+instances and serializer fields.
+
+Rows are fetched with ``values_list()`` and turned into dicts with a field
+mapping compiled once per serializer class. The mapping is only built for
+serializers whose readable fields pass a concrete column through unchanged,
+so the output is exactly what the serializer would produce; anything else
+(method fields, nested or dotted sources, choices) falls back to the
+serializer.
+"""
+
+from functools import lru_cache
+
+from albums.metrics import phase
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.http import Http404
+from rest_framework import exceptions, serializers
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Serializer fields whose to_representation() returns the value of an
+# integer or text column as it comes from the database.
+PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField)
+# DRF 3.16+ maps big integer columns (such as the primary key) to this
+# field, which renders strings when coerce_to_string is enabled.
+BigIntegerField = getattr(serializers, "BigIntegerField", None)
+
+
+def passes_through(field):
+    if type(field) in PASSTHROUGH_FIELDS:
+        return True
+    return (
+        BigIntegerField is not None
+        and type(field) is BigIntegerField
+        and not getattr(
+            field,
+            "coerce_to_string",
+            getattr(api_settings, "COERCE_BIGINT_TO_STRING", False),
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_field_mapping(serializer_class):
+    """
+    Return ``(names, columns)``: the output keys of ``serializer_class``
+    and the model column each one reads, or ``None`` if the serializer
+    cannot be reproduced from raw column values.
+    """
+    model = serializer_class.Meta.model
+    names, columns = [], []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        if not passes_through(field) or field.source in columns:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.is_relation:
+            return None
+        names.append(name)
+        columns.append(field.source)
+    return tuple(names), tuple(columns)
+
+
+@lru_cache(maxsize=None)
+def readable_fields(serializer_class):
+    """Output keys of ``serializer_class``, in order."""
+    return tuple(
+        name
+        for name, field in serializer_class().fields.items()
+        if not field.write_only
+    )
+
+
+@lru_cache(maxsize=1024)
+def prune_field_mapping(mapping, names):
+    """``mapping`` restricted to the output keys in ``names``."""
+    kept = [(name, column) for name, column in zip(*mapping) if name in names]
+    return tuple(name for name, _ in kept), tuple(column for _, column in kept)
+
+
+class FastReadMixin:
+    """
+    Serve ``list`` and ``retrieve`` from ``values_list()`` rows mapped with
+    :func:`compile_field_mapping`. Rows are named tuples that also carry the
+    ordering fields and the primary key, so cursor pagination can read its
+    position from them.
+
+    ``?fields=id,title`` (or ``?omit=genre``) returns only some fields on the
+    actions in ``sparse_fieldset_actions``, and leaves the other columns out
+    of their queries.
+
+    Object permissions are not checked on rows; views that need them should
+    not use this mixin.
+    """
+
+    sparse_fieldset_actions = {"list", "retrieve", "random", "export"}
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    def get_field_mapping(self):
+        mapping = compile_field_mapping(self.get_serializer_class())
+        names = self.get_requested_fields()
+        if mapping is None or names is None:
+            return mapping
+        return prune_field_mapping(mapping, names)
+
+    def accepts_sparse_fieldsets(self):
+        """Whether the current action takes ``?fields=`` and ``?omit=``."""
+        return self.action in self.sparse_fieldset_actions
+
+    def get_requested_fields(self):
+        """
+        The output keys selected by ``?fields=`` and ``?omit=`` on a
+        ``sparse_fieldset_actions`` action, or ``None`` for all of them.
+        """
+        if self.action not in self.sparse_fieldset_actions:
+            return None
+        return self.parse_requested_fields()
+
+    def parse_requested_fields(self):
+        params = self.request.query_params
+        fields = params.get(self.fields_query_param, "")
+        omit = params.get(self.omit_query_param, "")
+        if not (fields or omit):
+            return None
+
+        available = readable_fields(self.get_serializer_class())
+        errors = {}
+        selected = available
+        for param, value in [
+            (self.fields_query_param, fields),
+            (self.omit_query_param, omit),
+        ]:
+            names = {name.strip() for name in value.split(",") if name.strip()}
+            unknown = sorted(names.difference(available))
+            if unknown:
+                errors[param] = [f"Unknown field: {', '.join(unknown)}."]
+            elif names and param == self.fields_query_param:
+                selected = tuple(name for name in selected if name in names)
+            elif names:
+                selected = tuple(name for name in selected if name not in names)
+        if not errors and not selected:
+            errors[self.omit_query_param] = ["At least one field must remain."]
+        if errors:
+            raise exceptions.ValidationError(errors)
+        return selected
+
+    def prune_fields(self, data, many=False, names=None):
+        """Serialized ``data`` restricted to ``names`` (default: as requested)."""
+        names = names or self.get_requested_fields()
+        if names is None:
+            return data
+        if many:
+            return [{name: item[name] for name in names} for item in data]
+        return {name: data[name] for name in names}
+
+    def get_read_queryset(self, queryset, *extra):
+        """
+        ``queryset`` as named ``values_list()`` rows holding the serialized
+        columns, the ordering fields and ``extra``; unchanged when there is
+        no field mapping.
+        """
+        mapping = self.get_field_mapping()
+        if mapping is None:
+            return queryset
+        columns = list(mapping[1])
+        pk = queryset.model._meta.pk.name
+        for field in (*queryset.query.order_by, pk, *extra):
+            name = field.lstrip("-") if isinstance(field, str) else None
+            if name and name != "?" and name not in columns:
+                columns.append(name)
+        return queryset.values_list(*columns, named=True)
+
+    def represent(self, rows, many=False):
+        """Response data for rows from :meth:`get_read_queryset`."""
+        with phase("serialize"):
+            mapping = self.get_field_mapping()
+            if mapping is None:
+                return self.prune_fields(
+                    self.get_serializer(rows, many=many).data, many
+                )
+            names = mapping[0]
+            if many:
+                return [dict(zip(names, row)) for row in rows]
+            return dict(zip(names, rows))
+
+    def represent_stream(self, rows):
+        """Like ``represent(rows, many=True)``, lazily one row at a time."""
+        mapping = self.get_field_mapping()
+        if mapping is None:
+            serializer = self.get_serializer()
+            return (
+                self.prune_fields(serializer.to_representation(row)) for row in rows
+            )
+        names = mapping[0]
+        return (dict(zip(names, row)) for row in rows)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_read_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.represent(page, many=True))
+        return Response(self.represent(queryset, many=True))
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.get_field_mapping() is None:
+            response = super().retrieve(request, *args, **kwargs)
+            response.data = self.prune_fields(response.data)
+            return response
+        queryset = self.get_read_queryset(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return Response(self.represent(row))
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.get_read_queryset(self.filter_queryset(self.get_queryset()))
+        page = None
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, self)
+        if page is not None:
+            return self.get_paginated_response(self.represent(page, many=True))
+        rows = [row async for row in queryset.aiterator()]
+        return Response(self.represent(rows, many=True))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        queryset = self.get_read_queryset(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            row = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        return Response(self.represent(row))
@@ -1,16 +1,89 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
 
-from .models import Album
+from .genres import album_ids_tagged, parse_tags
+from .models import Album, Artist
+from .search import full_text_search
 
 
 class AlbumFilter(filters.FilterSet):
     artist = filters.CharFilter(lookup_expr="icontains")
+    artist_id = filters.NumberFilter(field_name="artist_ref")
     title = filters.CharFilter(lookup_expr="icontains")
     genre = filters.CharFilter(lookup_expr="icontains")
+    genre_any = filters.CharFilter(
+        method="filter_genre_any",
+        label="Albums tagged with any of these comma-separated genres",
+    )
+    genre_all = filters.CharFilter(
+        method="filter_genre_all",
+        label="Albums tagged with all of these comma-separated genres",
+    )
 
     year__gte = filters.NumberFilter(field_name="year", lookup_expr="gte")
     year__lte = filters.NumberFilter(field_name="year", lookup_expr="lte")
 
     class Meta:
         model = Album
-        fields = ["artist", "title", "genre", "year__gte", "year__lte"]
+        fields = [
+            "artist",
+            "artist_id",
+            "title",
+            "genre",
+            "genre_any",
+            "genre_all",
+            "year__gte",
+            "year__lte",
+        ]
+
+    def filter_genre_any(self, queryset, name, value):
+        tags = parse_tags(value)
+        if not tags:
+            return queryset
+        return queryset.filter(pk__in=album_ids_tagged(*tags))
+
+    def filter_genre_all(self, queryset, name, value):
+        for tag in parse_tags(value):
+            queryset = queryset.filter(pk__in=album_ids_tagged(tag))
+        return queryset
+
+
+class AlbumFullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search via ``?q=``. Results come best match first unless
+    the request also asks for an explicit ``ordering``.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+
+        ordering = queryset.query.order_by
+        queryset = full_text_search(queryset, query)
+        if request.query_params.get(OrderingFilter.ordering_param):
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search across artist, title and genre "
+                "tags; every word is matched as a prefix and results are "
+                "ranked by relevance.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class ArtistFilter(filters.FilterSet):
+    name = filters.CharFilter(lookup_expr="icontains")
+
+    class Meta:
+        model = Artist
+        fields = ["name"]
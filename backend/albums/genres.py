@@ -0,0 +1,74 @@
+"""
+Genre tags of albums as rows of :class:`Genre`, linked through
+:class:`AlbumGenre`.
+
+``Album.genre`` stays the source of truth and is what the API returns; the
+links are rewritten from it whenever it is written: by ``Album.save()``
+(through ``post_save``), the bulk endpoints, ``seed_csv`` and the synthetic
+data generator.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Album, AlbumGenre, Genre, normalize_key_part, split_genre
+
+# Separator of the genre_any/genre_all filter values.
+TAG_SEPARATOR = ","
+
+
+def sync_genres(albums, created=False):
+    """
+    Rewrite the genre links of ``albums``, given as ``(pk, genre)`` pairs;
+    ``created`` albums have no links to delete.
+    """
+    tags = {pk: split_genre(genre) for pk, genre in albums}
+    if not tags:
+        return
+    names = {name for album_tags in tags.values() for name in album_tags}
+    # Runs inside the album save or bulk write; without a savepoint, an album
+    # whose tags fail to store is rolled back rather than left untagged.
+    with transaction.atomic(savepoint=False):
+        Genre.objects.bulk_create(
+            [Genre(name=name) for name in names], ignore_conflicts=True
+        )
+        genre_ids = dict(Genre.objects.filter(name__in=names).values_list("name", "pk"))
+        if not created:
+            AlbumGenre.objects.filter(album_id__in=tags).delete()
+        AlbumGenre.objects.bulk_create(
+            AlbumGenre(album_id=pk, genre_id=genre_ids[name])
+            for pk, album_tags in tags.items()
+            for name in album_tags
+        )
+
+
+def sync_written(albums):
+    """
+    :func:`sync_genres` for albums written with ``bulk_create`` options that
+    leave their primary keys unset; they are looked up by natural key.
+    """
+    natural_keys = [album.natural_key for album in albums]
+    sync_genres(
+        Album.objects.filter(natural_key__in=natural_keys).values_list("pk", "genre")
+    )
+
+
+def parse_tags(value):
+    """Normalized tags of a ``genre_any``/``genre_all`` filter value."""
+    tags = (normalize_key_part(tag) for tag in value.split(TAG_SEPARATOR))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+def album_ids_tagged(*names):
+    """Subquery of the ids of albums tagged with any of ``names``."""
+    return AlbumGenre.objects.filter(genre__name__in=names).values("album_id")
+
+
+@receiver(post_save, sender=Album)
+def album_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    stored = getattr(instance, "_loaded_values", {})
+    if created or stored.get("genre") != instance.genre:
+        sync_genres([(instance.pk, instance.genre)], created=created)
@@ -0,0 +1,77 @@
+import statistics
+import time
+
+from albums.compression import CODINGS, compress
+from albums.renderers import FastJSONRenderer
+from albums.synthetic import top_up
+from albums.views import AlbumViewSet
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks response compression: CPU time against bytes saved per "
+        "coding for album pages and the full catalogue"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100_000,
+            help="Top the table up with synthetic albums to this many rows "
+            "(default: 100000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Timed runs per page size and coding (default: 50)",
+        )
+        parser.add_argument(
+            "--export-repeat",
+            type=int,
+            default=3,
+            help="Timed runs of the full catalogue per coding (default: 3)",
+        )
+
+    def handle(self, *args, **options):
+        generated = top_up(options["rows"])
+        if generated:
+            self.stdout.write(f"Generated {generated} synthetic albums")
+
+        request = Request(RequestFactory().get("/api/albums/"))
+        view = AlbumViewSet(request=request, action="list", format_kwarg=None)
+        rows = view.get_read_queryset(view.filter_queryset(view.get_queryset()))
+
+        total = rows.count()
+        self.stdout.write(f"Rows: {total}, codings: {', '.join(CODINGS)}\n")
+        for label, limit, repeat in [
+            ("page_size=20", 20, options["repeat"]),
+            ("page_size=50", 50, options["repeat"]),
+            (f"full catalogue ({total} rows)", None, options["export_repeat"]),
+        ]:
+            page = rows[:limit] if limit else rows
+            body = FastJSONRenderer().render(view.represent(page, many=True))
+            self.stdout.write(f"{label}: {len(body)} bytes")
+            for coding in CODINGS:
+                self.measure(coding, body, repeat)
+
+    def measure(self, coding, body, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            compressed = compress(coding, body)
+            timings.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(timings)
+        saved = len(body) - len(compressed)
+        # Bytes saved per millisecond of CPU: what the coding buys.
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  {coding}: {len(compressed)} bytes "
+                f"({len(compressed) / len(body):.1%}), median {median:.2f} ms, "
+                f"{saved / max(median, 1e-3) / 1024:.0f} KiB saved per ms"
+            )
+        )
@@ -0,0 +1,237 @@
+import asyncio
+import itertools
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Album read endpoints requested in turn by every client.
+DEFAULT_PATHS = [
+    "/api/albums/",
+    "/api/albums/?ordering=-year&page=3",
+    "/api/albums/?cursor=&page_size=50",
+    "/api/albums/random/",
+    "/api/albums/random/?count=10",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests running album API deployments (e.g. gunicorn/WSGI against "
+        "uvicorn/ASGI) and prints p50/p99 latency and requests/sec"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="+",
+            metavar="LABEL=URL",
+            help="Deployments to compare, e.g. wsgi=http://localhost:8000",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=200,
+            help="Simultaneous keep-alive connections (default: 200)",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30,
+            help="Seconds of load per deployment (default: 30)",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=float,
+            default=3,
+            help="Seconds of untimed load before measuring (default: 3)",
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path to request; repeat for several (default: list, "
+            "keyset page and random reads)",
+        )
+        parser.add_argument(
+            "--detail-id",
+            type=int,
+            action="append",
+            default=[],
+            help="Also request /api/albums/<id>/; repeatable",
+        )
+        parser.add_argument(
+            "--json",
+            dest="json_path",
+            help="Write the results to this file as JSON",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="JSON file from an earlier --json run to compare against; "
+            "deployments are matched by label",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=10,
+            help="Fail if requests/sec drops or p99 grows by more than this "
+            "percentage against --baseline (default: 10)",
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["targets"]:
+            label, _, url = target.rpartition("=")
+            parts = urlsplit(url)
+            if parts.scheme != "http" or not parts.hostname:
+                raise CommandError(f"{target}: expected LABEL=http://host:port")
+            targets.append((label or parts.netloc, parts.hostname, parts.port or 80))
+
+        paths = options["paths"] or DEFAULT_PATHS
+        paths = paths + [f"/api/albums/{pk}/" for pk in options["detail_id"]]
+        results = []
+        for label, host, port in targets:
+            self.stdout.write(
+                f"{label}: {options['concurrency']} connections, "
+                f"{options['duration']:g}s..."
+            )
+            result = asyncio.run(
+                self.run_load(
+                    host,
+                    port,
+                    paths,
+                    options["concurrency"],
+                    options["warmup"],
+                    options["duration"],
+                )
+            )
+            results.append((label, result))
+            self.report(label, result)
+
+        if len(results) > 1:
+            base_label, base = results[0]
+            for label, result in results[1:]:
+                self.compare(label, result, base_label, base)
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as file:
+                json.dump(
+                    {
+                        "concurrency": options["concurrency"],
+                        "duration": options["duration"],
+                        "paths": paths,
+                        "results": dict(results),
+                    },
+                    file,
+                    indent=2,
+                )
+        if options["baseline"]:
+            self.check_baseline(
+                dict(results), options["baseline"], options["max_regression"]
+            )
+
+    def compare(self, label, result, base_label, base):
+        self.stdout.write(
+            f"{label} vs {base_label}: "
+            f"{result['rps'] / base['rps']:.2f}x requests/sec, "
+            f"p99 {result['p99']:.1f} ms vs {base['p99']:.1f} ms"
+        )
+
+    def check_baseline(self, results, path, max_regression):
+        with open(path) as file:
+            baseline = json.load(file)["results"]
+        limit = 1 + max_regression / 100
+        regressions = []
+        for label, result in results.items():
+            base = baseline.get(label)
+            if base is None:
+                continue
+            self.compare(label, result, f"baseline {label}", base)
+            if base["rps"] > result["rps"] * limit:
+                regressions.append(f"{label}: requests/sec")
+            if result["p99"] > base["p99"] * limit:
+                regressions.append(f"{label}: p99 latency")
+        if regressions:
+            raise CommandError(
+                f"Regressed by more than {max_regression:g}%: " + ", ".join(regressions)
+            )
+
+    async def run_load(self, host, port, paths, concurrency, warmup, duration):
+        started = time.perf_counter()
+        measure_from = started + warmup
+        stop_at = measure_from + duration
+        timings, errors = [], []
+
+        async def client(offset):
+            reader = writer = None
+            for path in itertools.islice(itertools.cycle(paths), offset, None):
+                if time.perf_counter() >= stop_at:
+                    break
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(host, port)
+                    sent = time.perf_counter()
+                    status, keep_alive = await self.fetch(reader, writer, host, path)
+                    received = time.perf_counter()
+                except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+                    errors.append(type(exc).__name__)
+                    status, keep_alive = None, False
+                if status is not None and sent >= measure_from:
+                    if status >= 500:
+                        errors.append(str(status))
+                    else:
+                        timings.append((received - sent) * 1000)
+                if not keep_alive and writer is not None:
+                    writer.close()
+                    reader = writer = None
+            if writer is not None:
+                writer.close()
+
+        await asyncio.gather(*(client(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - measure_from
+        timings.sort()
+        if not timings:
+            raise CommandError(f"No successful responses ({len(errors)} errors)")
+        return {
+            "requests": len(timings),
+            "errors": len(errors),
+            "rps": len(timings) / elapsed,
+            "p50": statistics.median(timings),
+            "p99": self.percentile(timings, 0.99),
+        }
+
+    async def fetch(self, reader, writer, host, path):
+        """Send one GET and read the whole response; return (status, keep-alive)."""
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            "Accept: application/json\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+
+        status = int((await reader.readuntil(b"\r\n")).split()[1])
+        headers = {}
+        while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+
+        if headers.get("transfer-encoding") == "chunked":
+            while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+                await reader.readexactly(size + 2)
+            await reader.readuntil(b"\r\n")
+        else:
+            await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, headers.get("connection") != "close"
+
+    def report(self, label, result):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: {result['rps']:.0f} req/s, p50 {result['p50']:.1f} ms, "
+                f"p99 {result['p99']:.1f} ms, {result['requests']} requests, "
+                f"{result['errors']} errors"
+            )
+        )
+
+    def percentile(self, timings, fraction):
+        return timings[max(int(len(timings) * fraction) - 1, 0)]
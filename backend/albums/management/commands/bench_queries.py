@@ -0,0 +1,93 @@
+import statistics
+import time
+
+from albums.models import Album
+from albums.synthetic import top_up
+from albums.views import AlbumViewSet
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+# (label, query params) pairs run through the real AlbumViewSet filter
+# backends, so the SQL matches what /api/albums/ executes.
+SCENARIOS = [
+    ("default ordering", {}),
+    ("ordering=year", {"ordering": "year"}),
+    ("ordering=-artist", {"ordering": "-artist"}),
+    ("ordering=title", {"ordering": "title"}),
+    ("artist=wolves", {"artist": "wolves"}),
+    ("title=ocean", {"title": "ocean"}),
+    ("genre=krautrock", {"genre": "krautrock"}),
+    ("search=midnight", {"search": "midnight"}),
+    ("year range", {"year__gte": 1990, "year__lte": 1994, "ordering": "year"}),
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmarks album list queries: prints query plans and page latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Top the table up with synthetic albums to this many rows "
+            "(default: 1000000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed runs per scenario (default: 20)",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=20,
+            help="Rows fetched per timed query (default: 20)",
+        )
+
+    def handle(self, *args, **options):
+        generated = top_up(options["rows"])
+        if generated:
+            self.stdout.write(f"Generated {generated} synthetic albums")
+
+        self.stdout.write(
+            f"Backend: {connection.vendor}, rows: {Album.objects.count()}\n"
+        )
+        for label, params in SCENARIOS:
+            queryset = self.build_queryset(params)
+            page = queryset[: options["page_size"]]
+            page_ms = self.measure(lambda: list(page.all()), options["repeat"])
+            count_ms = self.measure(queryset.count, options["repeat"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label}: page median {statistics.median(page_ms):.2f} ms "
+                    f"(p95 {self.p95(page_ms):.2f}), count median "
+                    f"{statistics.median(count_ms):.2f} ms "
+                    f"(p95 {self.p95(count_ms):.2f})"
+                )
+            )
+            self.stdout.write(self.explain(page) + "\n")
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return sorted(timings)
+
+    def p95(self, timings):
+        return timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+    def build_queryset(self, params):
+        request = Request(RequestFactory().get("/api/albums/", params))
+        view = AlbumViewSet(request=request, action="list", format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
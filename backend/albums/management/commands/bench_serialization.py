@@ -0,0 +1,99 @@
+import statistics
+import time
+
+from albums.renderers import FastJSONRenderer
+from albums.serializers import AlbumSerializer
+from albums.synthetic import top_up
+from albums.views import AlbumViewSet
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks album serialization: AlbumSerializer + JSONRenderer against "
+        "the values_list() fast path + FastJSONRenderer"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100_000,
+            help="Top the table up with synthetic albums to this many rows "
+            "(default: 100000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Timed runs per page size (default: 50)",
+        )
+        parser.add_argument(
+            "--export-repeat",
+            type=int,
+            default=3,
+            help="Timed runs of the full export (default: 3)",
+        )
+
+    def handle(self, *args, **options):
+        generated = top_up(options["rows"])
+        if generated:
+            self.stdout.write(f"Generated {generated} synthetic albums")
+
+        request = Request(RequestFactory().get("/api/albums/"))
+        self.view = AlbumViewSet(request=request, action="list", format_kwarg=None)
+        if self.view.get_field_mapping() is None:
+            raise CommandError("AlbumSerializer has no fast-path field mapping")
+        self.queryset = self.view.filter_queryset(self.view.get_queryset())
+
+        total = self.queryset.count()
+        self.stdout.write(f"Rows: {total}\n")
+        for label, limit, repeat in [
+            ("page_size=20", 20, options["repeat"]),
+            ("page_size=50", 50, options["repeat"]),
+            (f"full export ({total} rows)", None, options["export_repeat"]),
+        ]:
+            self.compare(label, limit, repeat)
+
+    def compare(self, label, limit, repeat):
+        serializer_bytes = self.serializer_path(limit)
+        if serializer_bytes != self.fast_path(limit):
+            raise CommandError(f"{label}: fast path output differs")
+
+        serializer_ms = self.measure(lambda: self.serializer_path(limit), repeat)
+        fast_ms = self.measure(lambda: self.fast_path(limit), repeat)
+        serializer_median = statistics.median(serializer_ms)
+        fast_median = statistics.median(fast_ms)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: serializer median {serializer_median:.2f} ms "
+                f"(p95 {self.p95(serializer_ms):.2f}), fast path median "
+                f"{fast_median:.2f} ms (p95 {self.p95(fast_ms):.2f}), "
+                f"{serializer_median / fast_median:.1f}x, "
+                f"{len(serializer_bytes)} bytes"
+            )
+        )
+
+    def serializer_path(self, limit):
+        albums = self.queryset[:limit] if limit else self.queryset
+        data = AlbumSerializer(albums, many=True).data
+        return JSONRenderer().render(data)
+
+    def fast_path(self, limit):
+        rows = self.view.get_read_queryset(self.queryset)
+        rows = rows[:limit] if limit else rows
+        return FastJSONRenderer().render(self.view.represent(rows, many=True))
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return sorted(timings)
+
+    def p95(self, timings):
+        return timings[max(int(len(timings) * 0.95) - 1, 0)]
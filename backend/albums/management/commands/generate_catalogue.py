@@ -0,0 +1,51 @@
+import time
+
+from albums.models import Album
+from albums.synthetic import top_up
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Tops the album table up with synthetic albums (artists, genre tags and "
+        "facets included) for benchmarks and load tests, up to 10M+ rows"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Target number of albums (default: 1000000)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Albums inserted per transaction (default: 10000)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Random seed, for a reproducible catalogue",
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--rows and --batch-size must be positive")
+
+        started = time.monotonic()
+
+        def progress(done):
+            rate = done / max(time.monotonic() - started, 1e-9)
+            self.stdout.write(f"Generated {done} albums ({rate:.0f} rows/s)")
+
+        generated = top_up(
+            options["rows"], options["batch_size"], options["seed"], progress
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Catalogue holds {Album.objects.count()} albums "
+                f"({generated} generated in {time.monotonic() - started:.1f}s)"
+            )
+        )
@@ -1,9 +1,42 @@
+import csv
+import io
+import json
 import os
-from csv import DictReader
+import time
 
+from albums.artists import ArtistCache
+from albums.changes import next_change_seq
+from albums.genres import sync_written
 from albums.models import Album
+from albums.signals import catalogue_changed
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+COLUMNS = ("artist", "title", "year", "genre")
+# The COPY fast path loads each batch into a temporary table and merges it
+# with INSERT ... ON CONFLICT, since COPY itself cannot skip or update rows
+# that collide on the natural key.
+COPY_COLUMNS = (*COLUMNS, "natural_key", "artist_ref_id", "change_seq")
+COPY_TABLE = "albums_album_import"
+COPY_CREATE_SQL = f"""
+    CREATE TEMPORARY TABLE IF NOT EXISTS {COPY_TABLE} (
+        artist varchar(255), title varchar(255), year integer,
+        genre varchar(255), natural_key varchar(64), artist_ref_id bigint,
+        change_seq bigint
+    ) ON COMMIT DELETE ROWS
+"""
+COPY_SQL = f"COPY {COPY_TABLE} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+COPY_MERGE_SQL = f"""
+    INSERT INTO {Album._meta.db_table} ({', '.join(COPY_COLUMNS)})
+    SELECT {', '.join(COPY_COLUMNS)} FROM {COPY_TABLE}
+    ON CONFLICT (natural_key) DO {{action}}
+"""
+COPY_UPDATE_ACTION = "UPDATE SET " + ", ".join(
+    f"{column} = EXCLUDED.{column}"
+    for column in (*COLUMNS, "artist_ref_id", "change_seq")
+)
 
 
 class Command(BaseCommand):
@@ -15,6 +48,33 @@ class Command(BaseCommand):
             type=str,
             help="Optional: path to the CSV file (default: <BASE_DIR>/data/albums.csv)",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows validated and inserted per transaction (default: 5000)",
+        )
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help="Update albums whose natural key (artist, title, year) already "
+            "exists instead of leaving them untouched",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="PostgreSQL only: load each batch with COPY instead of INSERT",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            help="Optional: file recording progress after every committed batch",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue from the position stored in --checkpoint",
+        )
 
     def handle(self, *args, **options):
         csv_path = options["path"] or os.path.join(
@@ -25,33 +85,185 @@ class Command(BaseCommand):
             self.stderr.write(self.style.ERROR(f"File not found: {csv_path}"))
             return
 
-        with open(csv_path, mode="r") as file:
-            reader = DictReader(file)
-            albums = []
-
-            for row in reader:
-                artist = row.get("artist")
-                title = row.get("title")
-                year = row.get("year")
-                genre = row.get("genre")
-
-                if not artist or not title:
-                    self.stderr.write(
-                        self.style.WARNING(f"Skipping incomplete row: {row}")
-                    )
-                    continue
-
-                albums.append(
-                    Album(
-                        artist=artist.strip(),
-                        title=title.strip(),
-                        year=year.strip() if year else None,
-                        genre=genre.strip() if genre else "",
-                    )
-                )
-
-            Album.objects.bulk_create(albums, ignore_conflicts=True)
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer")
+        if options["copy"] and connection.vendor != "postgresql":
+            raise CommandError("--copy is only supported on PostgreSQL")
+        if options["resume"] and not options["checkpoint"]:
+            raise CommandError("--resume requires --checkpoint")
+
+        self.csv_path = os.path.abspath(csv_path)
+        self.checkpoint_path = options["checkpoint"]
+        self.use_copy = options["copy"]
+        self.upsert = options["upsert"]
+        # Artist name -> id, so each artist is looked up once per import.
+        self.artists = ArtistCache()
+        self.rows_read = self.rows_skipped = 0
+        self.inserted = self.updated = self.unchanged = 0
+        if options["resume"]:
+            self.load_checkpoint()
+        self.resumed_at = self.rows_read
+
+        self.started = time.monotonic()
+        try:
+            with open(csv_path, mode="r", newline="", encoding="utf-8") as file:
+                reader = csv.DictReader(file)
+                batch = []
+                position = self.resumed_at
+                for index, row in enumerate(reader):
+                    if index < self.resumed_at:
+                        continue
+                    position = index + 1
+
+                    values = self.parse_row(row)
+                    if values is not None:
+                        batch.append(values)
+                    if len(batch) >= options["batch_size"]:
+                        self.flush(batch, position)
+                        batch = []
+                if batch or position > self.rows_read:
+                    self.flush(batch, position)
+        finally:
+            if self.inserted or self.updated:
+                catalogue_changed.send(sender=Album, album_ids=None)
+
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
 
         self.stdout.write(
-            self.style.SUCCESS(f"Seeded {len(albums)} albums successfully!")
+            self.style.SUCCESS(
+                f"Seeded {self.inserted + self.updated} albums successfully! "
+                f"({self.summary()})"
+            )
         )
+
+    def parse_row(self, row):
+        """Validate one CSV row; returns a value tuple or ``None`` to skip it."""
+        artist = (row.get("artist") or "").strip()
+        title = (row.get("title") or "").strip()
+        year = (row.get("year") or "").strip()
+        genre = (row.get("genre") or "").strip()
+
+        if not artist or not title:
+            return self.skip(row, "Skipping incomplete row")
+        try:
+            year = int(year)
+        except ValueError:
+            return self.skip(row, "Skipping row with invalid year")
+        return artist, title, year, genre
+
+    def skip(self, row, reason):
+        self.stderr.write(self.style.WARNING(f"{reason}: {row}"))
+        self.rows_skipped += 1
+        return None
+
+    def flush(self, batch, rows_read):
+        """Write one batch in its own transaction, then record progress."""
+        if batch:
+            with transaction.atomic():
+                self.write_batch(batch)
+        self.rows_read = rows_read
+        self.save_checkpoint()
+        self.stdout.write(f"Processed {self.rows_read} rows ({self.summary()})")
+
+    def write_batch(self, batch):
+        """
+        Compare the batch with stored albums by natural key (one query) and
+        write only new rows and, with ``--upsert``, rows that changed.
+        """
+        albums = {}
+        for values in batch:
+            album = Album(**dict(zip(COLUMNS, values)))
+            album.refresh_natural_key()
+            albums[album.natural_key] = album
+        self.unchanged += len(batch) - len(albums)
+
+        existing = {
+            natural_key: values
+            for natural_key, *values in Album.objects.filter(
+                natural_key__in=albums
+            ).values_list("natural_key", *COLUMNS)
+        }
+        to_insert, to_update = [], []
+        for natural_key, album in albums.items():
+            stored = existing.get(natural_key)
+            if stored is None:
+                to_insert.append(album)
+            elif self.upsert and stored != [getattr(album, c) for c in COLUMNS]:
+                to_update.append(album)
+            else:
+                self.unchanged += 1
+
+        to_write = to_insert + to_update
+        if not to_write:
+            return
+        # One change_seq for the batch: it commits as one change.
+        seq = next_change_seq()
+        for album in to_write:
+            album.change_seq = seq
+        self.artists.assign(to_write)
+        if self.use_copy:
+            self.copy_batch(to_write)
+        elif self.upsert:
+            Album.objects.bulk_create(
+                to_write,
+                update_conflicts=True,
+                unique_fields=["natural_key"],
+                update_fields=[*COLUMNS, "artist_ref", "change_seq"],
+            )
+        else:
+            Album.objects.bulk_create(to_write, ignore_conflicts=True)
+        sync_written(to_write)
+        self.inserted += len(to_insert)
+        self.updated += len(to_update)
+
+    def copy_batch(self, albums):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            [getattr(album, column) for column in COPY_COLUMNS] for album in albums
+        )
+        buffer.seek(0)
+        action = COPY_UPDATE_ACTION if self.upsert else "NOTHING"
+        with connection.cursor() as cursor:
+            cursor.execute(COPY_CREATE_SQL)
+            if is_psycopg3:
+                with cursor.copy(COPY_SQL) as copy:
+                    copy.write(buffer.getvalue())
+            else:
+                cursor.copy_expert(COPY_SQL, buffer)
+            cursor.execute(COPY_MERGE_SQL.format(action=action))
+
+    def summary(self):
+        return (
+            f"{self.inserted} inserted, {self.updated} updated, "
+            f"{self.unchanged} unchanged, {self.rows_skipped} skipped, "
+            f"{self.rate():.0f} rows/s"
+        )
+
+    def rate(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (self.rows_read - self.resumed_at) / elapsed
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            raise CommandError(f"Unreadable checkpoint: {self.checkpoint_path}")
+        if state.get("path") != self.csv_path:
+            raise CommandError(
+                f"Checkpoint {self.checkpoint_path} belongs to {state.get('path')}"
+            )
+        self.rows_read = state["rows_read"]
+        self.stdout.write(f"Resuming after row {self.rows_read}")
+
+    def save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        state = {"path": self.csv_path, "rows_read": self.rows_read}
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.checkpoint_path)
@@ -0,0 +1,314 @@
+"""
+Always-on request instrumentation with a Prometheus ``/metrics`` endpoint.
+
+:class:`MetricsMiddleware` records, per route (the URL pattern, so ids do
+not multiply the series):
+
+- request latency and response size histograms, and a request counter by
+  status code;
+- the number of database queries and the time spent in them, measured by
+  an ``execute_wrapper`` installed on every connection as it opens, so
+  ``DEBUG`` is not needed;
+- time spent building response data and rendering it (the blocks wrapped
+  in :func:`phase`).
+
+Requests that repeat one SQL statement ``ALBUMS_METRICS_REPEATED_QUERY_THRESHOLD``
+times or more (a likely N+1) and single queries slower than
+``ALBUMS_METRICS_SLOW_QUERY_MS`` are logged as warnings. With
+``ALBUMS_METRICS_SERVER_TIMING`` the same figures are sent as a
+``Server-Timing`` header.
+
+Metrics live in process memory: under several workers each one serves its
+own, and Prometheus should scrape (or a sidecar aggregate) every worker.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_current = ContextVar("albums_metrics_request", default=None)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        # labels -> per-bucket counts (the last one is +Inf), sum
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = format_labels(labels, le=bound)
+                yield f"{self.name}_bucket{le} {cumulative}"
+            yield f"{self.name}_sum{format_labels(labels)} {total}"
+            yield f"{self.name}_count{format_labels(labels)} {cumulative}"
+
+
+class CounterMetric:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.series = defaultdict(float)
+
+    def inc(self, labels, value=1):
+        self.series[labels] += value
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.series.items()):
+            yield f"{self.name}{format_labels(labels)} {value:g}"
+
+
+def format_labels(labels, **extra):
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in pairs) + "}"
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Registry:
+    """The metrics of this process; :meth:`record` is called once per request."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start every metric from zero."""
+        with self.lock:
+            self.requests = CounterMetric(
+                "http_requests_total", "Requests by route, method and status."
+            )
+            self.latency = Histogram(
+                "http_request_duration_seconds",
+                "Request latency by route and method.",
+                LATENCY_BUCKETS,
+            )
+            self.response_size = Histogram(
+                "http_response_size_bytes",
+                "Response body size by route and method.",
+                SIZE_BUCKETS,
+            )
+            self.queries = Histogram(
+                "db_queries_per_request",
+                "Database queries per request by route and method.",
+                QUERY_COUNT_BUCKETS,
+            )
+            self.db_time = CounterMetric(
+                "db_query_duration_seconds_total",
+                "Time spent in database queries by route and method.",
+            )
+            self.phase_time = CounterMetric(
+                "response_phase_duration_seconds_total",
+                "Time spent serializing and rendering responses by route, method "
+                "and phase.",
+            )
+
+    def record(self, route, method, status, duration, size, stats):
+        labels = (("route", route), ("method", method))
+        with self.lock:
+            self.requests.inc((*labels, ("status", str(status))))
+            self.latency.observe(labels, duration)
+            if size is not None:
+                self.response_size.observe(labels, size)
+            self.queries.observe(labels, stats.query_count)
+            self.db_time.inc(labels, stats.db_time)
+            for name, seconds in stats.phases.items():
+                self.phase_time.inc((*labels, ("phase", name)), seconds)
+
+    def expose(self):
+        with self.lock:
+            metrics = [
+                self.requests,
+                self.latency,
+                self.response_size,
+                self.queries,
+                self.db_time,
+                self.phase_time,
+            ]
+            return "\n".join(line for metric in metrics for line in metric.expose())
+
+
+registry = Registry()
+
+
+class RequestStats:
+    """Database and phase timings of one request."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.slow_queries = []
+        self.phases = defaultdict(float)
+        self.slow_query_seconds = (
+            getattr(settings, "ALBUMS_METRICS_SLOW_QUERY_MS", 200) / 1000
+        )
+
+    def __call__(self, execute, sql, params, many, context):
+        """``execute_wrapper`` hook."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.query_count += 1
+            self.db_time += elapsed
+            self.statements[sql] += 1
+            if elapsed >= self.slow_query_seconds:
+                self.slow_queries.append((elapsed, sql))
+
+    def server_timing(self, duration):
+        entries = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+            *(
+                f"{name};dur={seconds * 1000:.1f}"
+                for name, seconds in self.phases.items()
+            ),
+            f"total;dur={duration * 1000:.1f}",
+        ]
+        return ", ".join(entries)
+
+
+def record_query(execute, sql, params, many, context):
+    """``execute_wrapper`` hook reporting to the request being served, if any."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # Under ASGI, sync views and the async ORM query from sync_to_async worker
+    # threads, each with its own connections; _current follows the request
+    # into them.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def phase(name):
+    """Add the time spent in the block to phase ``name`` of the current request."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[name] += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """Records every request in :data:`registry`; works under WSGI and ASGI."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, "ALBUMS_METRICS_SERVER_TIMING", False)
+        self.repeated_query_threshold = getattr(
+            settings, "ALBUMS_METRICS_REPEATED_QUERY_THRESHOLD", 10
+        )
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        stats, token, started = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, started)
+
+    async def acall(self, request):
+        stats, token, started = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, started)
+
+    def start(self):
+        stats = RequestStats()
+        return stats, _current.set(stats), time.perf_counter()
+
+    def finish(self, request, response, stats, started):
+        duration = time.perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "<unmatched>"
+        size = None if response.streaming else len(response.content)
+        registry.record(
+            route, request.method, response.status_code, duration, size, stats
+        )
+        self.warn(request, route, stats)
+        if self.server_timing:
+            response["Server-Timing"] = stats.server_timing(duration)
+        return response
+
+    def warn(self, request, route, stats):
+        sql, repeats = next(iter(stats.statements.most_common(1)), (None, 0))
+        if repeats >= self.repeated_query_threshold:
+            logger.warning(
+                "Possible N+1 on %s %s (%s): one statement ran %d times: %s",
+                request.method,
+                request.path,
+                route,
+                repeats,
+                sql,
+            )
+        for elapsed, sql in stats.slow_queries:
+            logger.warning(
+                "Slow query on %s %s (%s): %.0f ms: %s",
+                request.method,
+                request.path,
+                route,
+                elapsed * 1000,
+                sql,
+            )
+
+
+def metrics_view(request):
+    """Prometheus text exposition of :data:`registry`."""
+    return HttpResponse(registry.expose() + "\n", content_type=CONTENT_TYPE)
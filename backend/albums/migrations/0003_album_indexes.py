@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:31
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+# GIN trigram indexes over the exact expressions Django emits for
+# ``icontains`` on PostgreSQL (``UPPER(col::text) LIKE UPPER(%s)``), so
+# AlbumFilter and SearchFilter substring matches can use an index.
+# SQLite has no trigram support and keeps the plain B-tree indexes only.
+TRIGRAM_INDEXES = {
+    "album_artist_trgm": "artist",
+    "album_title_trgm": "title",
+    "album_genre_trgm": "genre",
+    "album_year_trgm": "year",
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON albums_album "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0002_alter_album_year"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+        migrations.AddIndex(
+            model_name="album",
+            index=models.Index(
+                fields=["year", "artist", "id"], name="album_year_artist_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="album",
+            index=models.Index(fields=["year", "id"], name="album_year_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="album",
+            index=models.Index(fields=["artist", "id"], name="album_artist_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="album",
+            index=models.Index(fields=["title", "id"], name="album_title_idx"),
+        ),
+    ]
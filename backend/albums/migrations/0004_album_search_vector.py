@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:32
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0003_album_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="album",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def create_singleton(apps, schema_editor):
+    CatalogueVersion = apps.get_model("albums", "CatalogueVersion")
+    CatalogueVersion.objects.get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0004_album_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogueVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                (
+                    "modified_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "Catalogue version",
+            },
+        ),
+        migrations.RunPython(create_singleton, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+BATCH_SIZE = 5000
+GENRE_MAX_LENGTH = 255
+
+
+def normalize_key_part(value):
+    return " ".join(str(value).split()).casefold()
+
+
+def populate_natural_keys(apps, schema_editor):
+    """
+    Fill natural_key for existing rows, then merge duplicates so the unique
+    constraint can be added.
+    """
+    Album = apps.get_model("albums", "Album")
+
+    batch = []
+    for album in Album.objects.only("artist", "title", "year").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        album.natural_key = "\t".join(
+            normalize_key_part(part) for part in (album.artist, album.title, album.year)
+        )
+        batch.append(album)
+        if len(batch) >= BATCH_SIZE:
+            Album.objects.bulk_update(batch, ["natural_key"])
+            batch = []
+    Album.objects.bulk_update(batch, ["natural_key"])
+
+    duplicates = (
+        Album.objects.values("natural_key")
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+    )
+    conflicts = []
+    for duplicate in duplicates.iterator():
+        rows = list(
+            Album.objects.filter(natural_key=duplicate["natural_key"]).order_by("id")
+        )
+        if not merge_duplicates(Album, rows):
+            conflicts.append([row.id for row in rows])
+    if conflicts:
+        raise RuntimeError(
+            "These albums have the same artist, title and year but too many "
+            f"genres to merge; merge them by hand and migrate again: {conflicts}"
+        )
+
+
+def merge_duplicates(Album, rows):
+    """
+    Keep the oldest of ``rows`` with the genres of all of them, and delete
+    the others, printing each one. Returns False, changing nothing, when
+    the merged genres do not fit the column.
+    """
+    keep, *merged = rows
+    genres = {}
+    for row in rows:
+        genres.setdefault(normalize_key_part(row.genre), " ".join(row.genre.split()))
+    genre = " / ".join(genre for genre in genres.values() if genre)
+    if len(genre) > GENRE_MAX_LENGTH:
+        return False
+
+    if genre != keep.genre:
+        Album.objects.filter(id=keep.id).update(genre=genre)
+    Album.objects.filter(id__in=[row.id for row in merged]).delete()
+    for row in merged:
+        print(
+            f"  Merged duplicate album {row.id} into {keep.id}: "
+            f"{row.artist!r}, {row.title!r}, {row.year}, genre {row.genre!r}"
+        )
+    return True
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0005_catalogue_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="album",
+            name="natural_key",
+            field=models.TextField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_natural_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="album",
+            name="natural_key",
+            field=models.TextField(editable=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:05
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def split_genre(genre):
+    tags = (" ".join(tag.split()).casefold() for tag in genre.split("/"))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+def populate_facet_counts(apps, schema_editor):
+    Album = apps.get_model("albums", "Album")
+    FacetCount = apps.get_model("albums", "FacetCount")
+
+    counts = Counter()
+    albums = Album.objects.order_by()
+    for artist, count in albums.values_list("artist").annotate(Count("pk")):
+        counts["artist", artist] += count
+    for year, count in albums.values_list("year").annotate(Count("pk")):
+        counts["decade", str(year // 10 * 10)] += count
+    for genre, count in albums.values_list("genre").annotate(Count("pk")):
+        for tag in split_genre(genre):
+            counts["genre", tag] += count
+
+    FacetCount.objects.bulk_create(
+        (
+            FacetCount(facet=facet, value=value, count=count)
+            for (facet, value), count in counts.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0006_album_natural_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "facet",
+                    models.CharField(
+                        choices=[
+                            ("genre", "Genre"),
+                            ("artist", "Artist"),
+                            ("decade", "Decade"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("value", models.CharField(max_length=255)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Facet count",
+                "indexes": [
+                    models.Index(
+                        fields=["facet", "-count", "value"], name="facet_count_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("facet", "value"), name="facet_count_unique_value"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
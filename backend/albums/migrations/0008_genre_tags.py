@@ -0,0 +1,127 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+
+def split_genre(genre):
+    tags = (" ".join(tag.split()).casefold() for tag in genre.split("/"))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+def populate_genre_links(apps, schema_editor):
+    Album = apps.get_model("albums", "Album")
+    Genre = apps.get_model("albums", "Genre")
+    AlbumGenre = apps.get_model("albums", "AlbumGenre")
+
+    # Distinct genre strings are few compared to albums, so tags are
+    # resolved once per string.
+    tags = {
+        genre: split_genre(genre)
+        for genre in Album.objects.order_by().values_list("genre", flat=True).distinct()
+    }
+    names = {name for genre_tags in tags.values() for name in genre_tags}
+    Genre.objects.bulk_create(
+        [Genre(name=name) for name in sorted(names)], batch_size=BATCH_SIZE
+    )
+    genre_ids = dict(Genre.objects.values_list("name", "pk"))
+
+    links = []
+    for pk, genre in Album.objects.values_list("pk", "genre").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        links.extend(
+            AlbumGenre(album_id=pk, genre_id=genre_ids[name]) for name in tags[genre]
+        )
+        if len(links) >= BATCH_SIZE:
+            AlbumGenre.objects.bulk_create(links)
+            links = []
+    AlbumGenre.objects.bulk_create(links)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0007_facet_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Genre",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                "verbose_name": "Genre",
+                "verbose_name_plural": "Genres",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="AlbumGenre",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "album",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="genre_links",
+                        to="albums.album",
+                    ),
+                ),
+                (
+                    "genre",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="album_links",
+                        to="albums.genre",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Album genre",
+                "indexes": [
+                    models.Index(
+                        fields=["genre", "album"], name="album_genre_genre_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("album", "genre"), name="album_genre_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="album",
+            name="genres",
+            field=models.ManyToManyField(
+                editable=False,
+                related_name="albums",
+                through="albums.AlbumGenre",
+                to="albums.genre",
+            ),
+        ),
+        migrations.RunPython(populate_genre_links, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:35
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+
+def backfill_artists(apps, schema_editor):
+    """Create one Artist per case-insensitively distinct name and link albums."""
+    Album = apps.get_model("albums", "Album")
+    Artist = apps.get_model("albums", "Artist")
+
+    names = {}
+    for name in (
+        Album.objects.order_by("artist").values_list("artist", flat=True).distinct()
+    ):
+        names.setdefault(name.lower(), name)
+    Artist.objects.bulk_create(
+        [Artist(name=name) for name in names.values()], batch_size=BATCH_SIZE
+    )
+    artist_ids = {
+        name.lower(): pk for pk, name in Artist.objects.values_list("pk", "name")
+    }
+
+    batch = []
+    for album in Album.objects.only("artist").iterator(chunk_size=BATCH_SIZE):
+        album.artist_ref_id = artist_ids[album.artist.lower()]
+        batch.append(album)
+        if len(batch) >= BATCH_SIZE:
+            Album.objects.bulk_update(batch, ["artist_ref"])
+            batch = []
+    Album.objects.bulk_update(batch, ["artist_ref"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0008_genre_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Artist",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+            ],
+            options={
+                "verbose_name": "Artist",
+                "verbose_name_plural": "Artists",
+                "ordering": ["name"],
+                "indexes": [
+                    models.Index(fields=["name", "id"], name="artist_name_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        django.db.models.functions.text.Lower("name"),
+                        name="artist_name_ci_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="album",
+            name="artist_ref",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="albums",
+                to="albums.artist",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="album",
+            index=models.Index(
+                fields=["artist_ref", "year", "id"], name="album_artist_ref_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_artists, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0009_artist"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="album",
+            name="change_seq",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="album",
+            index=models.Index(
+                fields=["change_seq", "id"], name="album_change_seq_idx"
+            ),
+        ),
+        migrations.CreateModel(
+            name="AlbumTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("album_id", models.BigIntegerField()),
+                ("change_seq", models.BigIntegerField()),
+                (
+                    "deleted_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name": "Album tombstone",
+                "indexes": [
+                    models.Index(
+                        fields=["change_seq", "album_id"],
+                        name="album_tombstone_seq_idx",
+                    )
+                ],
+            },
+        ),
+    ]
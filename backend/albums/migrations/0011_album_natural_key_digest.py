@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:05
+
+import hashlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+
+
+def normalize_key_part(value):
+    return " ".join(str(value).split()).casefold()
+
+
+def readable_key(album):
+    return "\t".join(
+        normalize_key_part(part) for part in (album.artist, album.title, album.year)
+    )
+
+
+def digest_key(album):
+    return hashlib.sha256(readable_key(album).encode()).hexdigest()
+
+
+def rewrite_natural_keys(build):
+    def rewrite(apps, schema_editor):
+        Album = apps.get_model("albums", "Album")
+        batch = []
+        for album in Album.objects.only("artist", "title", "year").iterator(
+            chunk_size=BATCH_SIZE
+        ):
+            album.natural_key = build(album)
+            batch.append(album)
+            if len(batch) >= BATCH_SIZE:
+                Album.objects.bulk_update(batch, ["natural_key"])
+                batch = []
+        Album.objects.bulk_update(batch, ["natural_key"])
+
+    return rewrite
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("albums", "0010_album_change_feed"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            rewrite_natural_keys(digest_key), rewrite_natural_keys(readable_key)
+        ),
+        migrations.AlterField(
+            model_name="album",
+            name="natural_key",
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
@@ -1,4 +1,48 @@
+import hashlib
+
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+
+def normalize_key_part(value):
+    """Case- and whitespace-insensitive form used in natural keys."""
+    return " ".join(str(value).split()).casefold()
+
+
+def split_genre(genre):
+    """
+    Genre tags of an album, e.g. ``"art pop / art rock"`` -> ``["art pop",
+    "art rock"]``: split on ``/``, normalized, without duplicates.
+    """
+    tags = (normalize_key_part(tag) for tag in genre.split("/"))
+    return list(dict.fromkeys(tag for tag in tags if tag))
+
+
+def decade_of(year):
+    return year // 10 * 10
+
+
+class Artist(models.Model):
+    """A recording artist; names are unique regardless of case."""
+
+    name = models.CharField(max_length=255)
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(Lower("name"), name="artist_name_ci_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["name", "id"], name="artist_name_idx"),
+        ]
+        verbose_name = "Artist"
+        verbose_name_plural = "Artists"
+
+    def __str__(self):
+        return self.name
 
 
 class Album(models.Model):
@@ -10,11 +54,230 @@ class Album(models.Model):
     title = models.CharField(max_length=255)
     year = models.IntegerField()
     genre = models.CharField(max_length=255)
+    # Maintained by a database trigger on PostgreSQL, unused on SQLite
+    # (see albums.search).
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Digest of the normalized (artist, title, year), whose length is not
+    # bounded by the fields' (casefolding turns "ß" into "ss"); kept in sync
+    # by save() and by bulk writers through refresh_natural_key().
+    natural_key = models.CharField(max_length=64, unique=True, editable=False)
+    # The Artist named by ``artist``; kept in sync by albums.artists.
+    artist_ref = models.ForeignKey(
+        Artist,
+        on_delete=models.PROTECT,
+        null=True,
+        related_name="albums",
+        db_index=False,
+        editable=False,
+    )
+    # Normalized tags of ``genre``; kept in sync by albums.genres.
+    genres = models.ManyToManyField(
+        "Genre", through="AlbumGenre", related_name="albums", editable=False
+    )
+    # CatalogueVersion.version of the last change; set by albums.changes.
+    change_seq = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["year", "artist"]
+        indexes = [
+            # Default Meta.ordering plus the id tiebreaker.
+            models.Index(fields=["year", "artist", "id"], name="album_year_artist_idx"),
+            # ?ordering= fields, keyset pagination appends id to each of them.
+            models.Index(fields=["year", "id"], name="album_year_idx"),
+            models.Index(fields=["artist", "id"], name="album_artist_idx"),
+            models.Index(fields=["title", "id"], name="album_title_idx"),
+            # Albums of one artist, in release order.
+            models.Index(
+                fields=["artist_ref", "year", "id"], name="album_artist_ref_idx"
+            ),
+            # The change feed, in (change_seq, id) order.
+            models.Index(fields=["change_seq", "id"], name="album_change_seq_idx"),
+        ]
         verbose_name = "Album"
         verbose_name_plural = "Albums"
 
     def __str__(self):
         return f"{self.artist} - {self.title} ({self.year})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored values, so writes can tell what changed (see albums.facets).
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.refresh_natural_key()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {"artist", "title", "year"} & update_fields:
+                update_fields.add("natural_key")
+            if "artist" in update_fields:
+                update_fields.add("artist_ref")
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+        self.remember_values()
+
+    def remember_values(self):
+        """Record the current field values as the stored ones, after a write."""
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: field.value_from_object(self)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+        }
+
+    @staticmethod
+    def build_natural_key(artist, title, year):
+        key = "\t".join(normalize_key_part(part) for part in (artist, title, year))
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def refresh_natural_key(self):
+        self.natural_key = self.build_natural_key(self.artist, self.title, self.year)
+
+
+class Genre(models.Model):
+    """A genre tag, as produced by :func:`split_genre`."""
+
+    name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name = "Genre"
+        verbose_name_plural = "Genres"
+
+    def __str__(self):
+        return self.name
+
+
+class AlbumGenre(models.Model):
+    """
+    Link between an album and one of its genre tags. The unique constraint
+    indexes (album, genre) and the index (genre, album), so filtering albums
+    by genre and listing an album's genres are both index-only joins.
+    """
+
+    album = models.ForeignKey(
+        Album, on_delete=models.CASCADE, related_name="genre_links", db_index=False
+    )
+    genre = models.ForeignKey(
+        Genre, on_delete=models.CASCADE, related_name="album_links", db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["album", "genre"], name="album_genre_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["genre", "album"], name="album_genre_genre_idx"),
+        ]
+        verbose_name = "Album genre"
+
+    def __str__(self):
+        return f"{self.album_id}: {self.genre_id}"
+
+
+class CatalogueVersion(models.Model):
+    """
+    Single-row counter bumped in the same transaction as every catalogue
+    change; a cheap version marker for ETags and Last-Modified.
+    """
+
+    SINGLETON_ID = 1
+
+    version = models.BigIntegerField(default=0)
+    modified_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Catalogue version"
+
+    def __str__(self):
+        return f"v{self.version} ({self.modified_at:%Y-%m-%d %H:%M:%S})"
+
+    @classmethod
+    def current(cls):
+        """Return ``(version, modified_at)``."""
+        try:
+            return cls.objects.values_list("version", "modified_at").get(
+                pk=cls.SINGLETON_ID
+            )
+        except cls.DoesNotExist:
+            obj, _ = cls.objects.get_or_create(pk=cls.SINGLETON_ID)
+            return obj.version, obj.modified_at
+
+    @classmethod
+    async def acurrent(cls):
+        """Async version of :meth:`current`."""
+        try:
+            return await cls.objects.values_list("version", "modified_at").aget(
+                pk=cls.SINGLETON_ID
+            )
+        except cls.DoesNotExist:
+            obj, _ = await cls.objects.aget_or_create(pk=cls.SINGLETON_ID)
+            return obj.version, obj.modified_at
+
+    @classmethod
+    def bump(cls):
+        """
+        Increment the version and return it. The row stays locked until the
+        transaction ends, so writers that bump commit in version order.
+        """
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(
+            version=F("version") + 1, modified_at=timezone.now()
+        )
+        if not updated:
+            cls.objects.get_or_create(pk=cls.SINGLETON_ID, defaults={"version": 1})
+        return cls.objects.values_list("version", flat=True).get(pk=cls.SINGLETON_ID)
+
+
+class AlbumTombstone(models.Model):
+    """A deleted album, kept for the change feed (see albums.changes)."""
+
+    album_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["change_seq", "album_id"], name="album_tombstone_seq_idx"
+            ),
+        ]
+        verbose_name = "Album tombstone"
+
+    def __str__(self):
+        return f"{self.album_id} (deleted at v{self.change_seq})"
+
+
+class FacetCount(models.Model):
+    """
+    Number of albums per genre tag, artist and decade, maintained by
+    :mod:`albums.facets` on every write so unfiltered facets are a plain
+    table read.
+    """
+
+    GENRE = "genre"
+    ARTIST = "artist"
+    DECADE = "decade"
+    FACET_CHOICES = [(GENRE, "Genre"), (ARTIST, "Artist"), (DECADE, "Decade")]
+
+    facet = models.CharField(max_length=10, choices=FACET_CHOICES)
+    value = models.CharField(max_length=255)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["facet", "value"], name="facet_count_unique_value"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["facet", "-count", "value"], name="facet_count_idx"),
+        ]
+        verbose_name = "Facet count"
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
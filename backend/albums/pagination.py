@@ -1,8 +1,403 @@
+import base64
+import binascii
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import Q
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import get_cache
+
+COUNT_MODES = ("exact", "approximate", "none")
+
+
+def estimate_count(queryset):
+    """
+    The planner's row estimate (``pg_class.reltuples``) for an unfiltered
+    queryset on PostgreSQL; ``None`` when there is none to use.
+    """
+    query = queryset.query
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql" or query.where or query.distinct:
+        return None
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [table],
+        )
+        row = cursor.fetchone()
+    # -1 (or 0 on PostgreSQL < 14) until the table is first analyzed.
+    if row is None or row[0] <= 0:
+        return None
+    return row[0]
+
+
+def cached_count(queryset):
+    """
+    ``queryset.count()`` cached for ``ALBUMS_COUNT_CACHE_TIMEOUT`` seconds
+    under the SQL of the filtered query, so it may lag behind writes.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    raw = repr((queryset.db, sql, params))
+    key = "albums:count:" + hashlib.md5(raw.encode()).hexdigest()
+    cache = get_cache()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, getattr(settings, "ALBUMS_COUNT_CACHE_TIMEOUT", 300))
+    return count
+
+
+def approximate_count(queryset):
+    count = estimate_count(queryset)
+    return cached_count(queryset) if count is None else count
+
+
+class CountFreePage:
+    """
+    The parts of Django's ``Page`` used by ``PageNumberPagination`` for a
+    page fetched with one extra row instead of a count.
+    """
+
+    def __init__(self, rows, number, page_size):
+        self.object_list = rows[:page_size]
+        self.number = number
+        self.more = len(rows) > page_size
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.more
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Forward-only keyset (cursor) pagination.
+
+    Pages are selected with ``WHERE (ordering fields) > (last row)`` instead of
+    ``OFFSET``, so every page costs the same regardless of depth, and no total
+    count is computed. Works with any ordering on concrete model fields; ``id``
+    is appended as a tiebreaker so the ordering is always total.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """The page after the request's cursor, plus one row to detect more."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.build_filter(position))
+        return queryset.order_by(*self.ordering)[: self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        for field in ordering:
+            if not isinstance(field, str) or "__" in field or "?" in field:
+                raise ValidationError(
+                    {"ordering": "Cursor pagination does not support this ordering."}
+                )
+        if not {"id", "-id", "pk", "-pk"} & set(ordering):
+            ordering.append("id")
+        return ordering
+
+    def build_filter(self, position):
+        """
+        Expand ``(f1, f2, ...) > (v1, v2, ...)`` into the equivalent OR of
+        ANDs, honouring the direction of each field.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(payload, dict) or payload.get("o") != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+        position = payload.get("p")
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, item):
+        position = [getattr(item, field.lstrip("-")) for field in self.ordering]
+        payload = json.dumps({"o": self.ordering, "p": position}).encode()
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, CustomPagination.page_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
 
 
 class CustomPagination(pagination.PageNumberPagination):
+    """
+    Page-number pagination by default; ``?pagination=cursor`` (or any request
+    carrying a ``cursor``) switches to :class:`KeysetPagination`.
+
+    ``?count_mode=`` (default ``ALBUMS_PAGINATION_COUNT``) picks how the
+    total is obtained: ``exact`` runs ``COUNT(*)``; ``none`` skips it and
+    fetches one extra row to tell whether there is a next page;
+    ``approximate`` pages the same way and reports the planner's estimate
+    for unfiltered lists on PostgreSQL, or a cached count of the filtered
+    query. ``count_exact`` in the response says which one ``count`` is.
+    """
+
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 50
     page_query_param = "page"
+    mode_query_param = "pagination"
+    count_mode_query_param = "count_mode"
+    keyset_class = KeysetPagination
+
+    keyset = None
+    count_mode = "exact"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            return self.get_keyset().paginate_queryset(queryset, request, view)
+        self.count_mode = self.get_count_mode(request)
+        if self.count_mode == "exact":
+            return super().paginate_queryset(queryset, request, view)
+
+        rows = self.get_count_free_queryset(queryset, request)
+        if rows is None:
+            return None
+        self.set_count_free_page(list(rows))
+        if self.count_mode == "approximate":
+            self.count = approximate_count(queryset)
+        return list(self.page)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async version of :meth:`paginate_queryset`: the same pages, with
+        the count and rows read through the async ORM.
+        """
+        if self.use_keyset(request):
+            return await self.get_keyset().apaginate_queryset(queryset, request, view)
+        self.count_mode = self.get_count_mode(request)
+        if self.count_mode != "exact":
+            rows = self.get_count_free_queryset(queryset, request)
+            if rows is None:
+                return None
+            self.set_count_free_page([row async for row in rows])
+            if self.count_mode == "approximate":
+                self.count = await sync_to_async(approximate_count)(queryset)
+            return list(self.page)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached property; filling it in up front keeps
+        # the page lookup below from counting synchronously.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        self.page.object_list = [row async for row in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_mode_query_param) or getattr(
+            settings, "ALBUMS_PAGINATION_COUNT", "exact"
+        )
+        if mode not in COUNT_MODES:
+            message = f"Expected one of: {', '.join(COUNT_MODES)}."
+            raise ValidationError({self.count_mode_query_param: message})
+        return mode
+
+    def get_count_free_queryset(self, queryset, request):
+        """The requested page plus one row, or ``None`` if not paginating."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        page_number = request.query_params.get(self.page_query_param) or 1
+        try:
+            self.page_number = int(page_number)
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message="Invalid page."
+                )
+            )
+        offset = (self.page_number - 1) * self.page_size
+        return queryset[offset : offset + self.page_size + 1]
+
+    def set_count_free_page(self, rows):
+        if not rows and self.page_number > 1:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=self.page_number,
+                    message="That page contains no results",
+                )
+            )
+        self.page = CountFreePage(rows, self.page_number, self.page_size)
+        self.count = None
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        if self.count_mode == "exact":
+            count, count_exact = self.page.paginator.count, True
+        else:
+            count, count_exact = self.count, False
+        return Response(
+            {
+                "count": count,
+                "count_exact": count_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        properties = response_schema["properties"]
+        count = properties.pop("count")
+        count["nullable"] = True
+        count["description"] = "Total number of results; null with `count_mode=none`."
+        properties = {
+            "count": count,
+            "count_exact": {
+                "type": "boolean",
+                "description": "Whether `count` is exact or an estimate.",
+            },
+            **properties,
+        }
+        response_schema["properties"] = properties
+        response_schema["required"] = ["count", "count_exact", "results"]
+        return response_schema
+
+    def get_keyset(self):
+        self.keyset = self.keyset_class()
+        self.keyset.page_size = self.page_size
+        self.keyset.max_page_size = self.max_page_size
+        return self.keyset
+
+    def use_keyset(self, request):
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in params
+        )
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` for keyset pagination "
+                "(no total count, constant cost per page).",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+            {
+                "name": self.count_mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "`exact` counts all results; `none` skips the "
+                "count; `approximate` returns an estimate (see `count_exact`).",
+                "schema": {"type": "string", "enum": list(COUNT_MODES)},
+            },
+            {
+                "name": self.keyset_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor returned in `next` by keyset pagination.",
+                "schema": {"type": "string"},
+            },
+        ]
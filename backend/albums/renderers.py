@@ -0,0 +1,131 @@
+import csv
+import io
+import itertools
+
+from albums.metrics import phase
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+# Dates and dataclasses go through DRF's encoder, which formats them
+# differently from orjson's native support.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    :class:`JSONRenderer` backed by orjson when it is installed.
+
+    Output is byte-identical to the stock renderer for compact UTF-8 JSON:
+    values orjson cannot encode natively go through DRF's ``JSONEncoder``,
+    and ``U+2028``/``U+2029`` are escaped the same way. Indented output
+    (the browsable API, ``; indent=4``) and non-default JSON settings fall
+    back to the standard library encoder. Floats are the one difference
+    in formatting (orjson writes ``1e16`` where ``json`` writes ``1e+16``);
+    album payloads carry none.
+    """
+
+    default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with phase("render"):
+            return self.encode(data, accepted_media_type, renderer_context)
+
+    def encode(self, data, accepted_media_type, renderer_context):
+        if data is None:
+            return b""
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        except (orjson.JSONEncodeError, TypeError):
+            # Non-string keys or integers beyond 64 bits:
+            # let the standard encoder produce (or reject) them as before.
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Base for line-oriented formats that can also be rendered incrementally:
+    :meth:`render_stream` encodes an iterable of dicts into byte chunks of
+    ``rows_per_chunk`` rows, for use with ``StreamingHttpResponse``.
+    """
+
+    rows_per_chunk = 500
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return b"".join(self.render_stream(rows))
+
+    def render_stream(self, rows, columns=None):
+        rows = iter(rows)
+        while chunk := list(itertools.islice(rows, self.rows_per_chunk)):
+            yield self.render_chunk(chunk, columns)
+
+    def render_chunk(self, rows, columns):
+        raise NotImplementedError
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Newline-delimited JSON: one compact JSON object per line."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    json_renderer = FastJSONRenderer()
+
+    def render_chunk(self, rows, columns):
+        if columns is not None:
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+        return b"".join(self.json_renderer.render(row) + b"\n" for row in rows)
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    CSV with a header row. ``columns`` selects and orders the columns; by
+    default they are the keys of the first row.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render_stream(self, rows, columns=None):
+        rows = iter(rows)
+        if columns is None:
+            first = next(rows, None)
+            if first is None:
+                return
+            columns = list(first)
+            rows = itertools.chain([first], rows)
+        yield self.render_chunk([dict(zip(columns, columns))], columns)
+        yield from super().render_stream(rows, columns)
+
+    def render_chunk(self, rows, columns):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(
+            [self.cell(row.get(column, "")) for column in columns] for row in rows
+        )
+        return buffer.getvalue().encode(self.charset)
+
+    def cell(self, value):
+        # Lists only occur in error responses, e.g. {"year": ["Enter a number."]}.
+        if isinstance(value, (list, tuple)):
+            return " ".join(str(item) for item in value)
+        return value
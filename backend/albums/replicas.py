@@ -0,0 +1,113 @@
+"""
+Read-replica routing for the catalogue API.
+
+``GET``/``HEAD`` requests to views using :class:`ReplicaReadMixin` read
+from one of ``settings.ALBUMS_READ_REPLICAS``, picked at random per
+request; everything else, and every write, uses the ``default`` (primary)
+database. With no replicas configured nothing changes.
+
+Replicas lag behind the primary, so a client that has just written is
+sent back to the primary for ``ALBUMS_REPLICA_STICKY_SECONDS``: a
+successful write sets the ``ALBUMS_REPLICA_STICKY_COOKIE`` cookie, and
+clients that do not keep cookies can send ``X-Read-Primary: 1`` instead.
+
+Async reads under ASGI are routed the same way. The streamed export still
+reads the primary: its rows are fetched after the view has returned.
+
+Clients pinned to the primary skip the response cache and the batch LRU on
+the way in, which may hold a read from a lagging replica, and store what
+they read from the primary. Once stored, those fresh entries are what the
+other clients hit.
+"""
+
+import random
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+STICKY_HEADER = "HTTP_X_READ_PRIMARY"
+
+_read_alias = ContextVar("albums_read_alias", default=None)
+
+
+def pick_replica():
+    return random.choice(settings.ALBUMS_READ_REPLICAS)
+
+
+@contextmanager
+def replica_reads():
+    """Route the reads made in the block to a replica."""
+    token = _read_alias.set(pick_replica())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def reads_primary(request):
+    """Whether ``request`` comes from a client that has just written."""
+    return bool(
+        request.COOKIES.get(settings.ALBUMS_REPLICA_STICKY_COOKIE)
+        or request.META.get(STICKY_HEADER)
+    )
+
+
+def pinned_to_primary(request):
+    """Whether ``request`` reads the primary while replicas serve the others."""
+    return bool(settings.ALBUMS_READ_REPLICAS) and reads_primary(request)
+
+
+class ReplicaRouter:
+    """Sends reads inside :func:`replica_reads` to a replica, writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Also for instances that were read from a replica.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.ALBUMS_READ_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serves safe requests from a read replica and makes the client that
+    writes read from the primary for a while afterwards.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with self.read_routing(request):
+            return super().dispatch(request, *args, **kwargs)
+
+    def read_routing(self, request):
+        if (
+            not settings.ALBUMS_READ_REPLICAS
+            or request.method not in SAFE_METHODS
+            or reads_primary(request)
+        ):
+            return nullcontext()
+        return replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            settings.ALBUMS_READ_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                settings.ALBUMS_REPLICA_STICKY_COOKIE,
+                "1",
+                max_age=settings.ALBUMS_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
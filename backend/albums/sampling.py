@@ -0,0 +1,135 @@
+import random
+
+from django.db.models import Max, Min
+
+from .cache import acollection_generation, collection_generation, get_cache
+from .models import Album
+
+# Bounds are keyed on the collection generation, so every write makes them
+# stale; the timeout only limits how long writes made by other processes
+# go unnoticed when the cache is not shared.
+ID_BOUNDS_CACHE_KEY = "albums:id-bounds:{}"
+ID_BOUNDS_TIMEOUT = 60
+
+# How many candidate ids are drawn per missing album in one ``pk__in`` probe,
+# and how many probes are made before picking offsets into the albums left.
+OVERSAMPLE = 3
+MAX_PROBES = 3
+
+
+def get_id_bounds():
+    """
+    Return the cached ``(min_id, max_id)`` of the album table, or ``None``
+    when it is empty. Both ends are read from the primary key index.
+    """
+    cache = get_cache()
+    key = ID_BOUNDS_CACHE_KEY.format(collection_generation())
+    bounds = cache.get(key)
+    if bounds is None:
+        bounds = Album.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        bounds = (bounds["low"], bounds["high"])
+        cache.set(key, bounds, ID_BOUNDS_TIMEOUT)
+    if bounds[0] is None:
+        return None
+    return bounds
+
+
+async def aget_id_bounds():
+    """Async version of :func:`get_id_bounds`."""
+    cache = get_cache()
+    key = ID_BOUNDS_CACHE_KEY.format(await acollection_generation())
+    bounds = await cache.aget(key)
+    if bounds is None:
+        bounds = await Album.objects.aaggregate(low=Min("pk"), high=Max("pk"))
+        bounds = (bounds["low"], bounds["high"])
+        await cache.aset(key, bounds, ID_BOUNDS_TIMEOUT)
+    if bounds[0] is None:
+        return None
+    return bounds
+
+
+def draw_candidates(low, high, missing, picked):
+    return {random.randint(low, high) for _ in range(missing * OVERSAMPLE)} - picked
+
+
+def pick(rows, missing, picked):
+    """Add ``missing`` of ``rows`` to ``picked``, chosen at random."""
+    rows = list(rows)
+    for album in random.sample(rows, min(missing, len(rows))):
+        picked[album.pk] = album
+
+
+def draw_offsets(total, missing):
+    return sorted(random.sample(range(total), min(missing, total)))
+
+
+def random_albums(queryset, count=1):
+    """
+    Pick up to ``count`` distinct random albums from ``queryset``, which
+    may also yield named ``values_list()`` rows that include ``pk``. Every
+    album matching the queryset is equally likely to be picked.
+
+    Candidate ids are drawn from the primary key range and fetched with a
+    single ``pk__in`` query, which is enough for dense, unfiltered tables.
+    Whatever is still missing after a few probes (gaps left by deletes, or a
+    selective filter) is picked at random offsets into the albums left, so
+    only those calls count the filtered rows.
+    """
+    bounds = get_id_bounds()
+    if bounds is None:
+        return []
+
+    low, high = bounds
+    queryset = queryset.order_by("pk")
+    picked = {}
+
+    for _ in range(MAX_PROBES):
+        missing = count - len(picked)
+        if missing <= 0:
+            break
+        candidates = draw_candidates(low, high, missing, picked.keys())
+        pick(queryset.filter(pk__in=candidates), missing, picked)
+
+    missing = count - len(picked)
+    if missing > 0:
+        remaining = queryset.exclude(pk__in=picked.keys())
+        for offset in draw_offsets(remaining.count(), missing):
+            album = remaining[offset]
+            picked[album.pk] = album
+
+    albums = list(picked.values())
+    random.shuffle(albums)
+    return albums
+
+
+async def arandom_albums(queryset, count=1):
+    """Async version of :func:`random_albums`."""
+    bounds = await aget_id_bounds()
+    if bounds is None:
+        return []
+
+    low, high = bounds
+    queryset = queryset.order_by("pk")
+    picked = {}
+
+    for _ in range(MAX_PROBES):
+        missing = count - len(picked)
+        if missing <= 0:
+            break
+        candidates = draw_candidates(low, high, missing, picked.keys())
+        pick(
+            [album async for album in queryset.filter(pk__in=candidates)],
+            missing,
+            picked,
+        )
+
+    missing = count - len(picked)
+    if missing > 0:
+        remaining = queryset.exclude(pk__in=picked.keys())
+        for offset in draw_offsets(await remaining.acount(), missing):
+            album = await remaining[offset : offset + 1].aget()
+            picked[album.pk] = album
+
+    albums = list(picked.values())
+    random.shuffle(albums)
+    return albums
@@ -0,0 +1,152 @@
+"""
+Ranked full-text search over album artist, title and genre tags.
+
+PostgreSQL keeps ``Album.search_vector`` up to date with a trigger and
+serves queries from a GIN index; SQLite uses an FTS5 external-content table
+kept in sync by triggers. Both support prefix matching on every term.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField
+from django.db.models.expressions import RawSQL
+
+# Queries are reduced to plain word tokens, which keeps them safe to pass
+# to both tsquery and FTS5 MATCH syntax.
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TERMS = 8
+
+POSTGRES_INSTALL = [
+    """
+    CREATE OR REPLACE FUNCTION albums_album_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.artist, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A')
+            || setweight(
+                to_tsvector('simple', replace(coalesce(NEW.genre, ''), '/', ' ')),
+                'B'
+            );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS albums_album_search_vector ON albums_album",
+    """
+    CREATE TRIGGER albums_album_search_vector
+    BEFORE INSERT OR UPDATE OF artist, title, genre ON albums_album
+    FOR EACH ROW EXECUTE FUNCTION albums_album_search_vector_update()
+    """,
+    # Touching a column fires the trigger for rows written before it existed.
+    "UPDATE albums_album SET artist = artist WHERE search_vector IS NULL",
+    """
+    CREATE INDEX IF NOT EXISTS album_search_vector_gin
+    ON albums_album USING gin (search_vector)
+    """,
+]
+
+SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS albums_album_fts USING fts5(
+        artist, title, genre,
+        content='albums_album', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+"""
+SQLITE_TRIGGERS = {
+    "albums_album_fts_insert": """
+        CREATE TRIGGER albums_album_fts_insert AFTER INSERT ON albums_album BEGIN
+            INSERT INTO albums_album_fts(rowid, artist, title, genre)
+            VALUES (new.id, new.artist, new.title, new.genre);
+        END
+    """,
+    "albums_album_fts_delete": """
+        CREATE TRIGGER albums_album_fts_delete AFTER DELETE ON albums_album BEGIN
+            INSERT INTO albums_album_fts(albums_album_fts, rowid, artist, title, genre)
+            VALUES ('delete', old.id, old.artist, old.title, old.genre);
+        END
+    """,
+    "albums_album_fts_update": """
+        CREATE TRIGGER albums_album_fts_update AFTER UPDATE ON albums_album BEGIN
+            INSERT INTO albums_album_fts(albums_album_fts, rowid, artist, title, genre)
+            VALUES ('delete', old.id, old.artist, old.title, old.genre);
+            INSERT INTO albums_album_fts(rowid, artist, title, genre)
+            VALUES (new.id, new.artist, new.title, new.genre);
+        END
+    """,
+}
+# Column weights for bm25(): artist, title, genre.
+SQLITE_RANK = "bm25(albums_album_fts, 10.0, 10.0, 4.0)"
+
+
+def install(connection):
+    """
+    Create the search triggers and index for ``connection``. Idempotent; run
+    after every migrate because SQLite drops triggers whenever a migration
+    rebuilds the album table.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            for statement in POSTGRES_INSTALL:
+                cursor.execute(statement)
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(SQLITE_TABLE)
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'albums_album'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(SQLITE_TRIGGERS[name])
+            if missing:
+                cursor.execute(
+                    "INSERT INTO albums_album_fts(albums_album_fts) VALUES ('rebuild')"
+                )
+
+
+def search_terms(query):
+    return TOKEN_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def full_text_search(queryset, query):
+    """
+    Filter ``queryset`` to albums matching every term of ``query`` (each
+    as a prefix), annotated with ``rank`` and ordered best match first.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        tsquery = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config="simple",
+        )
+        queryset = queryset.filter(search_vector=tsquery).annotate(
+            rank=SearchRank(F("search_vector"), tsquery)
+        )
+    elif vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(
+            id__in=RawSQL(
+                "SELECT rowid FROM albums_album_fts WHERE albums_album_fts MATCH %s",
+                [match],
+            )
+        ).annotate(
+            rank=RawSQL(
+                f"SELECT -{SQLITE_RANK} FROM albums_album_fts "
+                "WHERE albums_album_fts MATCH %s AND rowid = albums_album.id",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {vendor}")
+
+    return queryset.order_by("-rank", "id")
@@ -1,8 +1,49 @@
-from albums.models import Album
+from albums.models import Album, Artist
 from rest_framework import serializers
+from rest_framework.reverse import reverse
+from rest_framework.utils.urls import replace_query_param
+
+DUPLICATE_MESSAGE = "An album with this artist, title and year already exists."
 
 
 class AlbumSerializer(serializers.ModelSerializer):
     class Meta:
         model = Album
         fields = ["id", "artist", "title", "year", "genre"]
+
+    def validate(self, attrs):
+        if self.context.get("bulk"):
+            # Bulk actions check all natural keys of a batch in one query.
+            return attrs
+
+        instance = self.instance
+        values = {
+            field: attrs.get(field, getattr(instance, field, None))
+            for field in ("artist", "title", "year")
+        }
+        natural_key = Album.build_natural_key(**values)
+        duplicates = Album.objects.filter(natural_key=natural_key)
+        if instance is not None:
+            duplicates = duplicates.exclude(pk=instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(DUPLICATE_MESSAGE)
+        return attrs
+
+
+class ArtistSerializer(serializers.ModelSerializer):
+    """
+    Artist with its first albums nested, in release order; ``album_count``
+    and ``albums_url`` cover all of them.
+    """
+
+    albums = AlbumSerializer(source="nested_albums", many=True, read_only=True)
+    album_count = serializers.IntegerField(read_only=True)
+    albums_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Artist
+        fields = ["id", "name", "album_count", "albums_url", "albums"]
+
+    def get_albums_url(self, artist) -> str:
+        url = reverse("album-list", request=self.context.get("request"))
+        return replace_query_param(url, "artist_id", artist.pk)
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections, router
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import search
+from .models import Album
+
+# Sent whenever the album catalogue changes. ``album_ids`` lists the affected
+# primary keys, or is ``None`` for bulk changes (e.g. ``seed_csv``) that touch
+# an unknown set of rows.
+catalogue_changed = Signal()
+
+_pending_ids = ContextVar("albums_pending_ids", default=None)
+
+
+@contextmanager
+def catalogue_batch():
+    """
+    Collect the per-album changes made inside the block and send them as a
+    single ``catalogue_changed`` on exit, e.g. around a queryset delete.
+    """
+    pending = set()
+    token = _pending_ids.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending_ids.reset(token)
+        if pending:
+            catalogue_changed.send(sender=Album, album_ids=sorted(pending))
+
+
+def album_changed(pk):
+    pending = _pending_ids.get()
+    if pending is None:
+        catalogue_changed.send(sender=Album, album_ids=[pk])
+    else:
+        pending.add(pk)
+
+
+@receiver(post_save, sender=Album)
+def album_saved(sender, instance, created, **kwargs):
+    album_changed(instance.pk)
+
+
+@receiver(post_delete, sender=Album)
+def album_deleted(sender, instance, **kwargs):
+    album_changed(instance.pk)
+
+
+def install_search_index(sender, using, **kwargs):
+    """``post_migrate`` hook, connected in ``AlbumsConfig.ready``."""
+    if router.allow_migrate_model(using, Album):
+        search.install(connections[using])
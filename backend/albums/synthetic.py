@@ -0,0 +1,97 @@
+import random
+
+from django.db import connection, transaction
+
+from .artists import ArtistCache
+from .genres import sync_written
+from .models import Album
+from .signals import catalogue_changed
+
+# Small vocabularies keep generation cheap while still giving filters,
+# search and ordering a realistic spread of values to work against.
+ARTIST_WORDS = (
+    "black blue broken cosmic dead electric golden iron lost midnight neon red "
+    "silver velvet white wild"
+).split()
+ARTIST_NOUNS = (
+    "angels band brothers circus collective dogs echoes foxes kings machine "
+    "orchestra quartet riders saints sisters wolves"
+).split()
+TITLE_WORDS = (
+    "after dark days dream fire heart home light love moon night ocean river "
+    "road song summer time world"
+).split()
+GENRES = (
+    "art pop, art rock, blues, electronic, folk, funk, hip-hop, jazz, jazz rock, "
+    "krautrock, pop, pop rock, progressive rock, punk, rock, soul, synth-pop, "
+    "worldbeat"
+).split(", ")
+
+
+def synthetic_artist(rng=random):
+    return (
+        f"{rng.choice(ARTIST_WORDS).title()} {rng.choice(ARTIST_NOUNS).title()}"
+        f" {rng.randint(1, 5000)}"
+    )
+
+
+def synthetic_title(rng=random):
+    return " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 4))).capitalize()
+
+
+def synthetic_year(rng=random):
+    return rng.randint(1950, 2025)
+
+
+def synthetic_genre(rng=random):
+    return " / ".join(rng.sample(GENRES, rng.randint(1, 3)))
+
+
+def synthetic_album(rng=random):
+    album = Album(
+        artist=synthetic_artist(rng),
+        title=synthetic_title(rng),
+        year=synthetic_year(rng),
+        genre=synthetic_genre(rng),
+    )
+    album.refresh_natural_key()
+    return album
+
+
+def generate_albums(count, batch_size=10_000, seed=None, progress=None):
+    """
+    Insert ``count`` synthetic albums in batches of ``batch_size`` and return
+    the number of rows attempted; the rare natural-key collision is skipped.
+    ``progress``, if given, is called with the running total after each batch.
+    """
+    rng = random.Random(seed)
+    artists = ArtistCache()
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        albums = [synthetic_album(rng) for _ in range(size)]
+        with transaction.atomic():
+            artists.assign(albums)
+            Album.objects.bulk_create(albums, ignore_conflicts=True)
+            sync_written(albums)
+        created += size
+        if progress is not None:
+            progress(created)
+    return created
+
+
+def top_up(rows, batch_size=10_000, seed=None, progress=None):
+    """
+    Generate synthetic albums until the table holds about ``rows`` albums
+    and return how many were attempted. Sends ``catalogue_changed`` and, on
+    PostgreSQL, refreshes the planner statistics afterwards.
+    """
+    missing = rows - Album.objects.count()
+    if missing <= 0:
+        return 0
+    generate_albums(missing, batch_size, seed, progress)
+    catalogue_changed.send(sender=Album, album_ids=None)
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Album._meta.db_table}")
+    return missing
@@ -0,0 +1,11 @@
+from albums.async_views import AsyncReadRouter
+from albums.views import AlbumViewSet, ArtistViewSet
+from django.urls import include, path
+
+router = AsyncReadRouter()
+router.register(r"albums", AlbumViewSet, basename="album")
+router.register(r"artists", ArtistViewSet, basename="artist")
+
+urlpatterns = [
+    path("api/", include(router.urls)),
+]
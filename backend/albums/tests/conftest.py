@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import caches
 from rest_framework.test import APIClient
 
 from .factories import AlbumFactory
@@ -14,3 +15,10 @@ def api_client():
 def album_factory():
     """Creates albums for tests."""
     return AlbumFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keeps cached catalogue state from leaking between tests."""
+    for cache in caches.all():
+        cache.clear()
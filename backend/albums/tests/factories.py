@@ -1,4 +1,5 @@
 import factory
+from albums import synthetic
 from albums.models import Album
 from faker import Faker
 
@@ -13,3 +14,15 @@ class AlbumFactory(factory.django.DjangoModelFactory):
     title = factory.Faker("sentence", nb_words=3)
     year = factory.LazyFunction(lambda: int(fake.year()))
     genre = factory.Faker("word")
+
+
+class SyntheticAlbumFactory(AlbumFactory):
+    """
+    Albums from the small vocabularies of :mod:`albums.synthetic`, the same
+    values the benchmark catalogue generator (``generate_catalogue``) uses.
+    """
+
+    artist = factory.LazyFunction(synthetic.synthetic_artist)
+    title = factory.LazyFunction(synthetic.synthetic_title)
+    year = factory.LazyFunction(synthetic.synthetic_year)
+    genre = factory.LazyFunction(synthetic.synthetic_genre)
@@ -0,0 +1,78 @@
+import pytest
+from albums.tests.factories import AlbumFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+def album_queries(queries):
+    return [q["sql"] for q in queries if '"albums_album"' in q["sql"]]
+
+
+@pytest.mark.django_db
+class TestAlbumAdmin:
+    @pytest.fixture(autouse=True)
+    def setup(self, admin_client):
+        self.client = admin_client
+        self.url = reverse("admin:albums_album_changelist")
+        self.jazz = AlbumFactory(title="Kind of Blue", year=1959, genre="Jazz")
+        self.rock = AlbumFactory(title="OK Computer", year=1997, genre="Alt / Rock")
+
+    def changelist(self, **params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == 200
+        return response
+
+    def titles(self, response):
+        return {album.title for album in response.context["cl"].result_list}
+
+    def test_filter_choices_come_from_facet_counts(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.changelist()
+        assert not [sql for sql in album_queries(queries) if "DISTINCT" in sql]
+
+        filters = {f.title: f for f in response.context["cl"].filter_specs}
+        assert [value for value, _ in filters["decade"].lookup_choices] == [
+            "1990",
+            "1950",
+        ]
+        assert {value for value, _ in filters["genre"].lookup_choices} == {
+            "jazz",
+            "alt",
+            "rock",
+        }
+
+    def test_top_genres_only(self, settings):
+        settings.ALBUMS_ADMIN_TOP_GENRES = 1
+        AlbumFactory(genre="Rock")
+        response = self.changelist()
+        filters = {f.title: f for f in response.context["cl"].filter_specs}
+        assert [value for value, _ in filters["genre"].lookup_choices] == ["rock"]
+
+    def test_decade_and_genre_filters(self):
+        assert self.titles(self.changelist(decade="1950")) == {"Kind of Blue"}
+        assert self.titles(self.changelist(genre_tag="rock")) == {"OK Computer"}
+        assert self.titles(self.changelist(decade="1990", genre_tag="jazz")) == set()
+
+    def test_search_uses_full_text_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.changelist(q="comp")
+        assert self.titles(response) == {"OK Computer"}
+        assert not [sql for sql in album_queries(queries) if "LIKE" in sql]
+
+    def test_search_keeps_the_changelist_ordering(self):
+        AlbumFactory(title="Computer World", year=1981)
+        response = self.changelist(q="comp", o="-3")
+        assert [album.title for album in response.context["cl"].result_list] == [
+            "OK Computer",
+            "Computer World",
+        ]
+        assert response.context["cl"].queryset.ordered
+
+    def test_counts_are_cached_and_not_shown_in_full(self):
+        self.changelist()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.changelist()
+        assert not [sql for sql in album_queries(queries) if "COUNT(" in sql]
+        assert response.context["cl"].result_count == 2
+        assert response.context["cl"].full_result_count is None
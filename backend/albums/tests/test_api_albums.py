@@ -32,6 +32,18 @@ class TestAlbumAPI:
         assert Album.objects.count() == 1
         assert Album.objects.first().artist == "Radiohead"
 
+    def test_create_duplicate_album(self):
+        AlbumFactory(artist="Radiohead", title="OK Computer", year=1997)
+        payload = {
+            "artist": "radiohead",
+            "title": " OK  Computer ",
+            "year": 1997,
+            "genre": "Rock",
+        }
+        response = self.client.post(self.list_url, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Album.objects.count() == 1
+
     def test_retrieve_album(self):
         album = AlbumFactory()
         url = reverse("album-detail", args=[album.id])
@@ -61,3 +73,36 @@ class TestAlbumAPI:
         assert response.status_code == status.HTTP_200_OK
         assert "artist" in response.data
         assert "title" in response.data
+
+    def test_random_album_count_returns_distinct_albums(self):
+        AlbumFactory.create_batch(10)
+        response = self.client.get(self.random_url, {"count": 5})
+        assert response.status_code == status.HTTP_200_OK
+        ids = [album["id"] for album in response.data]
+        assert len(ids) == 5
+        assert len(set(ids)) == 5
+
+    def test_random_album_respects_filters(self):
+        AlbumFactory.create_batch(20, genre="rock")
+        jazz = AlbumFactory(genre="jazz")
+        AlbumFactory.create_batch(20, genre="rock")
+        for _ in range(5):
+            response = self.client.get(self.random_url, {"genre": "jazz"})
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data["id"] == jazz.id
+
+    def test_random_album_after_deletes(self):
+        albums = AlbumFactory.create_batch(10)
+        Album.objects.exclude(pk=albums[4].pk).delete()
+        response = self.client.get(self.random_url, {"count": 3})
+        assert response.status_code == status.HTTP_200_OK
+        assert [album["id"] for album in response.data] == [albums[4].id]
+
+    def test_random_album_not_found(self):
+        response = self.client.get(self.random_url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_random_album_invalid_count(self):
+        AlbumFactory()
+        response = self.client.get(self.random_url, {"count": 500})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,126 @@
+import io
+
+import pytest
+from albums.models import Album, Artist
+from albums.tests.factories import AlbumFactory
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestArtistLinks:
+    def test_save_links_artist_case_insensitively(self):
+        first = AlbumFactory(artist="Pink Floyd")
+        second = AlbumFactory(artist="PINK FLOYD")
+
+        assert first.artist_ref_id == second.artist_ref_id
+        assert Artist.objects.get().name == "Pink Floyd"
+
+    def test_changing_artist_relinks(self):
+        album = AlbumFactory(artist="Genesis")
+        album = Album.objects.get(pk=album.pk)
+        album.artist = "Peter Gabriel"
+        album.save(update_fields=["artist"])
+
+        album.refresh_from_db()
+        assert album.artist_ref.name == "Peter Gabriel"
+
+    def test_bulk_endpoints(self):
+        client = APIClient()
+        url = reverse("album-bulk-create")
+        response = client.post(
+            url,
+            [
+                {"artist": "Yes", "title": "Fragile", "year": 1971, "genre": "prog"},
+                {"artist": "yes", "title": "Relayer", "year": 1974, "genre": "prog"},
+            ],
+            format="json",
+        )
+        ids = [item["id"] for item in response.data]
+        assert Album.objects.filter(artist_ref__name="Yes").count() == 2
+
+        client.patch(url, [{"id": ids[1], "artist": "Asia"}], format="json")
+        assert Album.objects.get(pk=ids[1]).artist_ref.name == "Asia"
+
+    def test_seed_csv_looks_up_each_artist_once(self, tmp_path):
+        csv_path = tmp_path / "albums.csv"
+        csv_path.write_text(
+            "artist,title,year,genre\n"
+            + "".join(f"Sting,Album {i},{1980 + i},pop\n" for i in range(20))
+        )
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "seed_csv",
+                "--path",
+                str(csv_path),
+                "--batch-size",
+                "5",
+                stdout=io.StringIO(),
+            )
+
+        # One insert and one select for the first batch, none for the rest.
+        artist_queries = [q for q in queries if '"albums_artist"' in q["sql"]]
+        assert len(artist_queries) == 2
+
+        sting = Artist.objects.get(name="Sting")
+        assert sting.albums.count() == 20
+        assert not Album.objects.filter(artist_ref=None).exists()
+
+
+@pytest.mark.django_db
+class TestArtistsEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("artist-list")
+        AlbumFactory(artist="Yes", title="Fragile", year=1971)
+        AlbumFactory(artist="Yes", title="Close to the Edge", year=1972)
+        AlbumFactory(artist="Genesis", title="Foxtrot", year=1972)
+
+    def test_list_nests_albums_without_n_plus_one(self, django_assert_num_queries):
+        for i in range(10):
+            AlbumFactory(artist=f"Artist {i}")
+        with django_assert_num_queries(3):
+            response = self.client.get(self.list_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 12
+        artists = {artist["name"]: artist for artist in response.data["results"]}
+        genesis = artists["Genesis"]
+        assert [album["title"] for album in genesis["albums"]] == ["Foxtrot"]
+
+    def test_retrieve_orders_albums_by_year(self):
+        yes = Artist.objects.get(name="Yes")
+        response = self.client.get(reverse("artist-detail", args=[yes.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [album["title"] for album in response.data["albums"]] == [
+            "Fragile",
+            "Close to the Edge",
+        ]
+        assert response.data["albums"][0]["artist"] == "Yes"
+
+    def test_nests_a_bounded_number_of_albums(self, settings):
+        settings.ALBUMS_ARTIST_NESTED_ALBUMS = 1
+        yes = Artist.objects.get(name="Yes")
+        response = self.client.get(reverse("artist-detail", args=[yes.id]))
+
+        assert [album["title"] for album in response.data["albums"]] == ["Fragile"]
+        assert response.data["album_count"] == 2
+        albums = self.client.get(response.data["albums_url"])
+        assert albums.data["count"] == 2
+
+    def test_filter_by_name(self):
+        response = self.client.get(self.list_url, {"name": "gen"})
+        assert [artist["name"] for artist in response.data["results"]] == ["Genesis"]
+
+    def test_album_list_filters_by_artist_id(self):
+        yes = Artist.objects.get(name="Yes")
+        response = self.client.get(reverse("album-list"), {"artist_id": yes.id})
+
+        assert response.data["count"] == 2
+        assert {album["artist"] for album in response.data["results"]} == {"Yes"}
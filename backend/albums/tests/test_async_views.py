@@ -0,0 +1,114 @@
+from inspect import iscoroutinefunction
+
+import pytest
+from albums.tests.factories import AlbumFactory
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("albums.tests.async_urls")
+class TestAsyncReads:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+
+    def test_only_read_routes_are_coroutines(self):
+        for url in [
+            self.list_url,
+            reverse("album-detail", args=[1]),
+            reverse("album-random"),
+        ]:
+            assert iscoroutinefunction(resolve(url).func)
+        assert not iscoroutinefunction(resolve(reverse("album-export")).func)
+
+    def test_list(self):
+        albums = AlbumFactory.create_batch(3)
+        response = self.client.get(self.list_url, {"ordering": "id"})
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["count"] == 3
+        assert [item["id"] for item in body["results"]] == [a.id for a in albums]
+        assert response["X-Cache"] == "MISS"
+        assert response["ETag"]
+
+    def test_list_matches_sync_view(self, settings):
+        settings.ALBUMS_CACHE_ENABLED = False
+        AlbumFactory.create_batch(5)
+        params = {"ordering": "-year", "page_size": 2, "page": 2}
+        async_body = self.client.get(self.list_url, params).content
+
+        settings.ROOT_URLCONF = "mymusicapi.urls"
+        sync_body = self.client.get(reverse("album-list"), params).content
+        assert async_body == sync_body
+
+    def test_list_keyset_pagination(self):
+        AlbumFactory.create_batch(3)
+        first = self.client.get(self.list_url, {"cursor": "", "page_size": 2}).json()
+        assert len(first["results"]) == 2
+
+        second = self.client.get(first["next"]).json()
+        assert len(second["results"]) == 1
+        assert second["next"] is None
+
+    def test_list_invalid_page(self):
+        response = self.client.get(self.list_url, {"page": 99})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_retrieve(self):
+        album = AlbumFactory()
+        response = self.client.get(reverse("album-detail", args=[album.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["title"] == album.title
+
+    def test_retrieve_missing(self):
+        response = self.client.get(reverse("album-detail", args=[999]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_retrieve_not_modified(self):
+        album = AlbumFactory()
+        url = reverse("album-detail", args=[album.id])
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_second_read_hits_cache(self):
+        AlbumFactory()
+        self.client.get(self.list_url)
+        assert self.client.get(self.list_url)["X-Cache"] == "HIT"
+
+    def test_random(self):
+        albums = AlbumFactory.create_batch(4)
+        response = self.client.get(reverse("album-random"), {"count": 3})
+
+        assert response.status_code == status.HTTP_200_OK
+        ids = [item["id"] for item in response.json()]
+        assert len(set(ids)) == 3
+        assert set(ids) <= {a.id for a in albums}
+
+    def test_random_invalid_count(self):
+        response = self.client.get(reverse("album-random"), {"count": 0})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_random_empty(self):
+        response = self.client.get(reverse("album-random"))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_writes_use_sync_view(self):
+        response = self.client.post(
+            self.list_url,
+            {"artist": "Can", "title": "Tago Mago", "year": 1971, "genre": "kraut"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        url = reverse("album-detail", args=[response.json()["id"]])
+        response = self.client.patch(url, {"year": 1972}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert self.client.get(url).json()["year"] == 1972
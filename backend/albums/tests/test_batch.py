@@ -0,0 +1,95 @@
+import pytest
+from albums.batch import lru
+from albums.models import Album
+from albums.tests.factories import AlbumFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.fixture(autouse=True)
+def empty_lru():
+    lru.clear()
+    yield
+    lru.clear()
+
+
+@pytest.mark.django_db
+class TestBatchRetrieve:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.url = reverse("album-batch")
+        self.albums = AlbumFactory.create_batch(4)
+
+    def get(self, ids):
+        return self.client.get(self.url, {"ids": ",".join(map(str, ids))})
+
+    def test_returns_albums_in_requested_order(self, django_assert_num_queries):
+        first, second, third, _ = self.albums
+        with django_assert_num_queries(1):
+            response = self.get([third.pk, first.pk, 999_999, second.pk, third.pk])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [album["id"] for album in response.data["results"]] == [
+            third.pk,
+            first.pk,
+            second.pk,
+        ]
+        assert response.data["results"][0]["title"] == third.title
+        assert response.data["missing"] == [999_999]
+
+    def test_matches_retrieve(self):
+        album = self.albums[0]
+        detail = self.client.get(reverse("album-detail", args=[album.pk]))
+        assert self.get([album.pk]).data["results"] == [detail.data]
+
+    @pytest.mark.parametrize(
+        "ids",
+        [
+            "",
+            "1,x",
+            ",".join(map(str, range(1, 300))),
+            "1,-1",
+            "0",
+            str(2**63),
+            "99999999999999999999999",
+        ],
+    )
+    def test_invalid_ids(self, ids):
+        response = self.client.get(self.url, {"ids": ids})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "ids" in response.data
+
+
+@pytest.mark.django_db
+class TestBatchLRU:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.ALBUMS_BATCH_LRU_SIZE = 3
+        self.client = APIClient()
+        self.url = reverse("album-batch")
+        self.albums = AlbumFactory.create_batch(4)
+        self.ids = ",".join(str(album.pk) for album in self.albums[:3])
+
+    def test_hot_ids_skip_the_database(self, django_assert_num_queries):
+        self.client.get(self.url, {"ids": self.ids})
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url, {"ids": self.ids})
+        assert len(response.data["results"]) == 3
+
+    def test_changed_album_is_read_again(self, django_assert_num_queries):
+        self.client.get(self.url, {"ids": self.ids})
+        album = Album.objects.get(pk=self.albums[1].pk)
+        album.title = "Renamed"
+        album.save()
+
+        with django_assert_num_queries(1):
+            response = self.client.get(self.url, {"ids": self.ids})
+        assert response.data["results"][1]["title"] == "Renamed"
+
+    def test_least_recently_used_album_is_evicted(self):
+        self.client.get(self.url, {"ids": self.ids})
+        self.client.get(self.url, {"ids": self.albums[3].pk})
+
+        assert set(lru.entries) == {album.pk for album in self.albums[1:]}
@@ -0,0 +1,100 @@
+import pytest
+from albums.models import Album
+from albums.tests.factories import AlbumFactory
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestBulkAlbumAPI:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.bulk_url = reverse("album-bulk-create")
+
+    def test_bulk_create(self, django_assert_max_num_queries):
+        payload = [
+            {"artist": f"Artist {i}", "title": "Debut", "year": 2000, "genre": "pop"}
+            for i in range(100)
+        ]
+        # A fixed number of queries for the whole batch: natural key check,
+        # album insert, facet counts (3), genre tags (3), artists, change feed.
+        with django_assert_max_num_queries(18):
+            response = self.client.post(self.bulk_url, payload, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == 100
+        assert Album.objects.count() == 100
+        assert response.data[0]["id"] == Album.objects.get(artist="Artist 0").id
+
+    def test_bulk_create_reports_errors_per_item(self):
+        AlbumFactory(artist="Tool", title="Lateralus", year=2001)
+        payload = [
+            {"artist": "Sting", "title": "Ten", "year": 1993, "genre": "pop"},
+            {"artist": "Tool", "title": "lateralus", "year": 2001, "genre": "rock"},
+            {"artist": "", "title": "No artist", "year": 1999, "genre": "pop"},
+        ]
+        response = self.client.post(self.bulk_url, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert "non_field_errors" in response.data[1]
+        assert "artist" in response.data[2]
+        assert Album.objects.count() == 1
+
+    @override_settings(ALBUMS_BULK_MAX_BATCH=2)
+    def test_bulk_create_max_batch(self):
+        payload = [
+            {"artist": "A", "title": str(i), "year": 2000, "genre": "pop"}
+            for i in range(3)
+        ]
+        response = self.client.post(self.bulk_url, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Album.objects.count() == 0
+
+    def test_bulk_update(self):
+        first, second = AlbumFactory.create_batch(2, genre="rock")
+        payload = [
+            {"id": first.id, "genre": "jazz"},
+            {"id": second.id, "title": "Renamed"},
+        ]
+        response = self.client.patch(self.bulk_url, payload, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.genre == "jazz"
+        assert second.title == "Renamed"
+        assert second.natural_key == Album.build_natural_key(
+            second.artist, "renamed", second.year
+        )
+
+    def test_bulk_update_unknown_id(self):
+        album = AlbumFactory(genre="rock")
+        payload = [{"id": album.id, "genre": "jazz"}, {"id": 999999, "genre": "x"}]
+        response = self.client.patch(self.bulk_url, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        album.refresh_from_db()
+        assert album.genre == "rock"
+
+    @pytest.mark.parametrize("pk", [[1], {"x": 1}, "1", True, 0, 2**63])
+    def test_bulk_update_invalid_id(self, pk):
+        album = AlbumFactory()
+        payload = [{"id": album.id, "title": "New"}, {"id": pk, "title": "x"}]
+        response = self.client.patch(self.bulk_url, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == [{}, {"id": ["Unknown or repeated album id."]}]
+
+    @pytest.mark.parametrize("pk", [[1], {"x": 1}, -1, 2**63])
+    def test_bulk_destroy_invalid_id(self, pk):
+        album = AlbumFactory()
+        response = self.client.delete(self.bulk_url, [album.id, pk], format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data == [{}, {"id": ["Unknown album id."]}]
+
+    def test_bulk_destroy(self):
+        albums = AlbumFactory.create_batch(3)
+        payload = [albums[0].id, albums[2].id]
+        response = self.client.delete(self.bulk_url, payload, format="json")
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert list(Album.objects.values_list("id", flat=True)) == [albums[1].id]
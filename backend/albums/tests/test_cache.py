@@ -0,0 +1,89 @@
+import csv
+import io
+
+import pytest
+from albums import cache
+from albums.tests.factories import AlbumFactory
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+
+    def test_list_is_served_from_cache(self, django_assert_num_queries):
+        AlbumFactory.create_batch(3)
+        first = self.client.get(self.list_url, {"ordering": "year", "page": 1})
+        assert first["X-Cache"] == "MISS"
+
+        # Only the catalogue version lookup used for the ETag.
+        with django_assert_num_queries(1):
+            second = self.client.get(self.list_url, {"page": "", "ordering": "year"})
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+
+    def test_links_keep_the_scheme_and_host(self, settings):
+        settings.ALLOWED_HOSTS = ["testserver", "api.example.com"]
+        AlbumFactory.create_batch(3)
+        params = {"page_size": 1}
+        self.client.get(self.list_url, params)
+
+        for secure, host in [(True, "testserver"), (False, "api.example.com")]:
+            response = self.client.get(
+                self.list_url, params, secure=secure, HTTP_HOST=host
+            )
+            assert response["X-Cache"] == "MISS"
+            scheme = "https" if secure else "http"
+            assert response.data["next"].startswith(f"{scheme}://{host}/")
+
+    def test_create_invalidates_list(self):
+        AlbumFactory()
+        self.client.get(self.list_url)
+        AlbumFactory()
+
+        response = self.client.get(self.list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 2
+
+    def test_update_invalidates_only_that_album(self):
+        album, other = AlbumFactory.create_batch(2)
+        url = reverse("album-detail", args=[album.id])
+        other_url = reverse("album-detail", args=[other.id])
+        self.client.get(url)
+        self.client.get(other_url)
+
+        self.client.patch(url, {"genre": "jazz"}, format="json")
+
+        response = self.client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["genre"] == "jazz"
+        assert self.client.get(other_url)["X-Cache"] == "HIT"
+
+    def test_seed_csv_invalidates_everything(self, tmp_path):
+        album = AlbumFactory()
+        detail_url = reverse("album-detail", args=[album.id])
+        self.client.get(self.list_url)
+        self.client.get(detail_url)
+
+        csv_path = tmp_path / "albums.csv"
+        with open(csv_path, "w", newline="") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["artist", "title", "year", "genre"])
+            writer.writerow(["Tool", "Lateralus", 2001, "Progressive"])
+        call_command("seed_csv", "--path", str(csv_path), stdout=io.StringIO())
+
+        assert self.client.get(self.list_url).data["count"] == 2
+        assert self.client.get(detail_url)["X-Cache"] == "MISS"
+
+    def test_stats(self):
+        before = cache.stats()
+        self.client.get(self.list_url)
+        self.client.get(self.list_url)
+        after = cache.stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
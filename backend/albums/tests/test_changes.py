@@ -0,0 +1,123 @@
+import io
+
+import pytest
+from albums.models import Album, AlbumTombstone
+from albums.tests.factories import AlbumFactory
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestChangeFeed:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.url = reverse("album-changes")
+
+    def feed(self, **params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def test_lists_changes_in_order(self):
+        first, second = AlbumFactory.create_batch(2)
+        cursor = self.feed()["cursor"]
+
+        first.title = "Renamed"
+        first.save()
+        second_pk = second.pk
+        second.delete()
+        third = AlbumFactory()
+
+        data = self.feed(since=cursor)
+        assert [(c["id"], c["deleted"]) for c in data["changes"]] == [
+            (first.pk, False),
+            (second_pk, True),
+            (third.pk, False),
+        ]
+        assert data["changes"][0]["album"]["title"] == "Renamed"
+        assert data["changes"][1]["album"] is None
+        seqs = [change["seq"] for change in data["changes"]]
+        assert seqs == sorted(seqs)
+        assert data["next"] is None
+
+        assert self.feed(since=data["cursor"]) == {
+            "changes": [],
+            "cursor": data["cursor"],
+            "next": None,
+        }
+
+    def test_pages_with_limit(self):
+        albums = AlbumFactory.create_batch(5)
+        seen, since = [], None
+        while True:
+            data = self.feed(limit=2, **({"since": since} if since else {}))
+            seen += [change["id"] for change in data["changes"]]
+            since = data["cursor"]
+            if data["next"] is None:
+                break
+            assert f"since={since.replace(':', '%3A')}" in data["next"]
+        assert seen == [album.pk for album in albums]
+
+    def test_reads_only_changes_after_cursor(self, django_assert_num_queries):
+        AlbumFactory.create_batch(20)
+        cursor = self.feed()["cursor"]
+        album = AlbumFactory()
+        with django_assert_num_queries(2):
+            data = self.feed(since=cursor)
+        assert [change["id"] for change in data["changes"]] == [album.pk]
+
+    def test_records_bulk_changes(self):
+        albums = AlbumFactory.create_batch(3)
+        cursor = self.feed()["cursor"]
+
+        response = self.client.patch(
+            reverse("album-bulk-create"),
+            [{"id": albums[0].pk, "year": 1999}],
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = self.client.delete(
+            reverse("album-bulk-create"),
+            [albums[1].pk, albums[2].pk],
+            format="json",
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        changes = self.feed(since=cursor)["changes"]
+        assert [(c["id"], c["deleted"]) for c in changes] == [
+            (albums[0].pk, False),
+            (albums[1].pk, True),
+            (albums[2].pk, True),
+        ]
+        assert changes[1]["seq"] == changes[2]["seq"]
+        assert AlbumTombstone.objects.count() == 2
+
+    def test_records_seed_csv_batches(self, tmp_path):
+        AlbumFactory(artist="Tool", title="Lateralus", year=2001, genre="Rock")
+        cursor = self.feed()["cursor"]
+        csv_path = tmp_path / "albums.csv"
+        csv_path.write_text(
+            "artist,title,year,genre\n"
+            "Tool,Lateralus,2001,Progressive\n"
+            "Björk,Homogenic,1997,Electronic\n",
+            encoding="utf-8",
+        )
+        call_command(
+            "seed_csv", "--path", str(csv_path), "--upsert", stdout=io.StringIO()
+        )
+
+        changes = self.feed(since=cursor)["changes"]
+        assert sorted(change["album"]["title"] for change in changes) == [
+            "Homogenic",
+            "Lateralus",
+        ]
+        assert len({change["seq"] for change in changes}) == 1
+        assert Album.objects.filter(change_seq=0).count() == 0
+
+    @pytest.mark.parametrize("since", ["x", "1:y", ":"])
+    def test_invalid_cursor(self, since):
+        response = self.client.get(self.url, {"since": since})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,5 +1,7 @@
 import csv
 import io
+import json
+import os
 
 import pytest
 from albums.models import Album
@@ -36,3 +38,100 @@ def test_seed_csv_command_creates_albums(tmp_path):
 
     assert "Seeded" in out.getvalue()
     assert Album.objects.count() == 2
+
+
+def write_albums_csv(path, rows):
+    with open(path, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["artist", "title", "year", "genre"])
+        writer.writerows(rows)
+
+
+@pytest.mark.django_db
+def test_seed_csv_streams_in_batches_and_skips_invalid_rows(tmp_path):
+    csv_path = tmp_path / "albums.csv"
+    rows = [(f"Artist {i}", f"Title {i}", 1990 + i, "rock") for i in range(7)]
+    rows.insert(3, ("Broken", "Row", "nineteen", "rock"))
+    write_albums_csv(csv_path, rows)
+
+    out = io.StringIO()
+    call_command(
+        "seed_csv",
+        "--path",
+        str(csv_path),
+        "--batch-size",
+        "3",
+        stdout=out,
+        stderr=io.StringIO(),
+    )
+
+    assert Album.objects.count() == 7
+    assert out.getvalue().count("Processed") == 3
+    assert "1 skipped" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_seed_csv_resumes_from_checkpoint(tmp_path):
+    csv_path = tmp_path / "albums.csv"
+    checkpoint = tmp_path / "seed.checkpoint"
+    write_albums_csv(
+        csv_path, [(f"Artist {i}", f"Title {i}", 2000, "pop") for i in range(5)]
+    )
+    checkpoint.write_text(
+        json.dumps({"path": os.path.abspath(csv_path), "rows_read": 2})
+    )
+
+    call_command(
+        "seed_csv",
+        "--path",
+        str(csv_path),
+        "--checkpoint",
+        str(checkpoint),
+        "--resume",
+        stdout=io.StringIO(),
+    )
+
+    assert sorted(Album.objects.values_list("artist", flat=True)) == [
+        "Artist 2",
+        "Artist 3",
+        "Artist 4",
+    ]
+    assert not checkpoint.exists()
+
+
+@pytest.mark.django_db
+def test_seed_csv_twice_does_not_duplicate(tmp_path):
+    csv_path = tmp_path / "albums.csv"
+    write_albums_csv(
+        csv_path,
+        [("Tool", "Lateralus", 2001, "progressive"), ("tool ", "LATERALUS", 2001, "")],
+    )
+
+    call_command("seed_csv", "--path", str(csv_path), stdout=io.StringIO())
+    out = io.StringIO()
+    call_command("seed_csv", "--path", str(csv_path), stdout=out)
+
+    assert Album.objects.count() == 1
+    assert "0 inserted, 0 updated, 2 unchanged" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_seed_csv_upsert_updates_changed_rows(tmp_path, album_factory):
+    album_factory(artist="Tool", title="Lateralus", year=2001, genre="metal")
+    album_factory(artist="Sting", title="Ten", year=1993, genre="pop rock")
+    csv_path = tmp_path / "albums.csv"
+    write_albums_csv(
+        csv_path,
+        [
+            ("Tool", "Lateralus", 2001, "progressive metal"),
+            ("Sting", "Ten", 1993, "pop rock"),
+            ("Kendrick Lamar", "DAMN.", 2017, "hip-hop"),
+        ],
+    )
+
+    out = io.StringIO()
+    call_command("seed_csv", "--path", str(csv_path), "--upsert", stdout=out)
+
+    assert "1 inserted, 1 updated, 1 unchanged" in out.getvalue()
+    assert Album.objects.count() == 3
+    assert Album.objects.get(artist="Tool").genre == "progressive metal"
@@ -0,0 +1,103 @@
+import gzip
+
+import pytest
+from albums import compression
+from albums.tests.factories import AlbumFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+def decode(coding, body):
+    if coding == "gzip":
+        return gzip.decompress(body)
+    if coding == "br":
+        return compression.brotli.decompress(body)
+    return compression.zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+
+def test_accept_encoding_negotiation():
+    assert compression.choose_coding("") is None
+    assert compression.choose_coding("identity") is None
+    assert compression.choose_coding("gzip;q=0, deflate") is None
+    assert compression.choose_coding("gzip, deflate") == "gzip"
+    assert compression.choose_coding("GZIP;q=0.5") == "gzip"
+    assert compression.choose_coding("*") == next(iter(compression.CODINGS))
+
+
+@pytest.mark.parametrize("coding", list(compression.CODINGS))
+def test_stream_round_trip(coding):
+    chunks = [b'{"id": %d, "title": "Album"}\n' % i for i in range(100)]
+    body = b"".join(compression.compress_stream(coding, iter(chunks)))
+    assert decode(coding, body) == b"".join(chunks)
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.ALBUMS_COMPRESSION_MIN_SIZE = 200
+        AlbumFactory.create_batch(10)
+        self.client = APIClient()
+        self.url = reverse("album-list")
+
+    def test_uncompressed_without_accept_encoding(self):
+        response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert not response.has_header("Content-Encoding")
+        assert "Accept-Encoding" in response["Vary"]
+
+    @pytest.mark.parametrize("coding", list(compression.CODINGS))
+    def test_compresses_with_accepted_coding(self, coding):
+        identity = self.client.get(self.url).content
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING=coding)
+        assert response["Content-Encoding"] == coding
+        assert int(response["Content-Length"]) == len(response.content)
+        assert decode(coding, response.content) == identity
+
+    def test_prefers_server_order_among_equal_weights(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br, zstd")
+        assert response["Content-Encoding"] == next(iter(compression.CODINGS))
+
+    def test_small_responses_are_not_compressed(self, settings):
+        settings.ALBUMS_COMPRESSION_MIN_SIZE = 10**6
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        assert not response.has_header("Content-Encoding")
+
+    def test_etag_is_weakened(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        assert response["ETag"].startswith('W/"')
+
+        not_modified = self.client.get(
+            self.url,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_cached_responses_reuse_compressed_bytes(self, monkeypatch):
+        miss = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        assert miss["X-Cache"] == "MISS"
+
+        calls = []
+        monkeypatch.setitem(
+            compression.CODINGS,
+            "gzip",
+            (lambda data: calls.append(data) or b"", compression.GzipStream),
+        )
+        hit = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        assert hit["X-Cache"] == "HIT"
+        assert hit.content == miss.content
+        assert not calls
+
+    def test_streamed_export_is_compressed(self):
+        url = reverse("album-export")
+        identity = b"".join(self.client.get(url, {"format": "csv"}).streaming_content)
+        response = self.client.get(url, {"format": "csv"}, HTTP_ACCEPT_ENCODING="gzip")
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+        assert gzip.decompress(b"".join(response.streaming_content)) == identity
+
+    def test_other_content_types_are_left_alone(self):
+        response = self.client.get(reverse("metrics"), HTTP_ACCEPT_ENCODING="gzip")
+        assert not response.has_header("Content-Encoding")
@@ -0,0 +1,44 @@
+import pytest
+from albums.tests.factories import AlbumFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+
+    def test_list_not_modified(self, django_assert_num_queries):
+        AlbumFactory.create_batch(3)
+        response = self.client.get(self.list_url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+        assert response["Last-Modified"]
+
+        with django_assert_num_queries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response["ETag"] == etag
+
+    def test_etag_depends_on_query(self):
+        AlbumFactory()
+        first = self.client.get(self.list_url)
+        second = self.client.get(self.list_url, {"ordering": "year"})
+        assert first["ETag"] != second["ETag"]
+
+    def test_write_changes_detail_etag(self):
+        album = AlbumFactory()
+        url = reverse("album-detail", args=[album.id])
+        etag = self.client.get(url)["ETag"]
+
+        self.client.patch(url, {"title": "New title"}, format="json")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["title"] == "New title"
+        assert response["ETag"] != etag
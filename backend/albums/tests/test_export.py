@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+
+import pytest
+from albums.models import Album
+from albums.tests.factories import AlbumFactory
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestExport:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.url = reverse("album-export")
+
+    def export(self, **params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        return response, b"".join(response.streaming_content)
+
+    def test_ndjson_is_default(self):
+        albums = AlbumFactory.create_batch(3)
+        response, content = self.export()
+
+        assert response["Content-Type"] == "application/x-ndjson"
+        lines = content.decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [a.id for a in albums]
+        assert set(json.loads(lines[0])) == {"id", "artist", "title", "year", "genre"}
+
+    def test_streams_asynchronously_under_asgi(self):
+        albums = AlbumFactory.create_batch(3)
+
+        async def export():
+            response = await AsyncClient().get(self.url)
+            return response, [chunk async for chunk in response.streaming_content]
+
+        response, chunks = async_to_sync(export)()
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        lines = b"".join(chunks).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [a.id for a in albums]
+
+    def test_csv_uses_seed_format(self):
+        AlbumFactory(artist="Tool", title="Lateralus, Pt. 1", year=2001, genre="prog")
+        response, content = self.export(format="csv")
+
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert 'filename="albums.csv"' in response["Content-Disposition"]
+        rows = list(csv.reader(io.StringIO(content.decode())))
+        assert rows == [
+            ["artist", "title", "year", "genre"],
+            ["Tool", "Lateralus, Pt. 1", "2001", "prog"],
+        ]
+
+    def test_empty_csv_has_header(self):
+        _, content = self.export(format="csv")
+        assert content == b"artist,title,year,genre\r\n"
+
+    def test_honours_filters_and_ordering(self):
+        AlbumFactory(artist="Yes", year=1971)
+        AlbumFactory(artist="Yes", year=1972)
+        AlbumFactory(artist="Genesis", year=1973)
+        _, content = self.export(artist="yes", ordering="-year")
+
+        years = [json.loads(line)["year"] for line in content.splitlines()]
+        assert years == [1972, 1971]
+
+    def test_streams_more_rows_than_one_chunk(self, settings):
+        settings.ALBUMS_EXPORT_CHUNK_SIZE = 7
+        AlbumFactory.create_batch(20)
+        _, content = self.export()
+        assert len(content.splitlines()) == 20
+
+    def test_csv_round_trips_through_seed_csv(self, tmp_path):
+        AlbumFactory.create_batch(5)
+        AlbumFactory(artist='Sigur Rós "Live"', title="Ágætis byrjun")
+        expected = list(Album.objects.values_list("artist", "title", "year"))
+        _, content = self.export(format="csv")
+
+        Album.objects.all().delete()
+        csv_path = tmp_path / "export.csv"
+        csv_path.write_bytes(content)
+        call_command("seed_csv", "--path", str(csv_path), stdout=io.StringIO())
+
+        assert sorted(Album.objects.values_list("artist", "title", "year")) == sorted(
+            expected
+        )
+
+    def test_invalid_filter_in_csv(self):
+        response = self.client.get(self.url, {"format": "csv", "year__gte": "abc"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.content == b"year__gte\r\nEnter a number.\r\n"
@@ -0,0 +1,150 @@
+import io
+
+import pytest
+from albums import facets
+from albums.models import Album, FacetCount, split_genre
+from albums.tests.factories import AlbumFactory
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+def stored_counts():
+    return {
+        (facet, value): count
+        for facet, value, count in FacetCount.objects.values_list(
+            "facet", "value", "count"
+        )
+    }
+
+
+def test_split_genre():
+    assert split_genre("art pop / Art Rock /  worldbeat") == [
+        "art pop",
+        "art rock",
+        "worldbeat",
+    ]
+    assert split_genre("rock / rock / ") == ["rock"]
+
+
+@pytest.mark.django_db
+class TestFacetCounts:
+    def assert_consistent(self):
+        assert stored_counts() == dict(facets.count_facets(Album.objects.all()))
+
+    def test_create_update_delete(self):
+        album = AlbumFactory(artist="Can", year=1971, genre="krautrock / rock")
+        AlbumFactory(artist="Can", year=1973, genre="krautrock")
+        assert stored_counts() == {
+            ("artist", "Can"): 2,
+            ("decade", "1970"): 2,
+            ("genre", "krautrock"): 2,
+            ("genre", "rock"): 1,
+        }
+
+        album = Album.objects.get(pk=album.pk)
+        album.year = 1989
+        album.genre = "jazz"
+        album.save()
+        self.assert_consistent()
+        assert ("genre", "rock") not in stored_counts()
+
+        album.delete()
+        self.assert_consistent()
+        assert stored_counts()[("decade", "1970")] == 1
+
+    def test_bulk_endpoints(self):
+        client = APIClient()
+        url = reverse("album-bulk-create")
+        response = client.post(
+            url,
+            [
+                {"artist": "Yes", "title": "Fragile", "year": 1971, "genre": "prog"},
+                {"artist": "Yes", "title": "Relayer", "year": 1974, "genre": "prog"},
+            ],
+            format="json",
+        )
+        ids = [item["id"] for item in response.data]
+        self.assert_consistent()
+
+        client.patch(url, [{"id": ids[0], "genre": "art rock"}], format="json")
+        self.assert_consistent()
+
+        client.delete(url, ids, format="json")
+        assert stored_counts() == {}
+
+    def test_seed_csv_rebuilds(self, tmp_path, django_capture_on_commit_callbacks):
+        AlbumFactory(artist="Tool", genre="metal")
+        csv_path = tmp_path / "albums.csv"
+        csv_path.write_text(
+            "artist,title,year,genre\n"
+            "Tool,Lateralus,2001,prog metal / art rock\n"
+            "Tool,Fear Inoculum,2019,prog metal\n"
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("seed_csv", "--path", str(csv_path), stdout=io.StringIO())
+
+        self.assert_consistent()
+        assert stored_counts()[("artist", "Tool")] == 3
+
+
+@pytest.mark.django_db
+class TestFacetsEndpoint:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.url = reverse("album-facets")
+        AlbumFactory(artist="Yes", year=1971, genre="prog / art rock")
+        AlbumFactory(artist="Yes", year=1983, genre="pop rock")
+        AlbumFactory(artist="Genesis", year=1973, genre="prog")
+
+    def test_unfiltered_reads_stored_counts(self, django_assert_num_queries):
+        with django_assert_num_queries(3):
+            response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            "genre": [
+                {"value": "prog", "count": 2},
+                {"value": "art rock", "count": 1},
+                {"value": "pop rock", "count": 1},
+            ],
+            "artist": [
+                {"value": "Yes", "count": 2},
+                {"value": "Genesis", "count": 1},
+            ],
+            "decade": [
+                {"value": 1970, "count": 2},
+                {"value": 1980, "count": 1},
+            ],
+        }
+
+    def test_respects_filters(self):
+        response = self.client.get(self.url, {"artist": "yes", "facet": "decade"})
+        assert response.data == {
+            "decade": [
+                {"value": 1970, "count": 1},
+                {"value": 1980, "count": 1},
+            ]
+        }
+
+    def test_filtered_matches_unfiltered_shape(self):
+        unfiltered = self.client.get(self.url).data
+        filtered = self.client.get(self.url, {"year__gte": 1900}).data
+        assert filtered == unfiltered
+
+    def test_limit(self):
+        response = self.client.get(self.url, {"facet": "genre,artist", "limit": 1})
+        assert response.data == {
+            "genre": [{"value": "prog", "count": 2}],
+            "artist": [{"value": "Yes", "count": 2}],
+        }
+
+    def test_invalid_params(self):
+        assert self.client.get(self.url, {"facet": "label"}).status_code == (
+            status.HTTP_400_BAD_REQUEST
+        )
+        assert self.client.get(self.url, {"limit": "0"}).status_code == (
+            status.HTTP_400_BAD_REQUEST
+        )
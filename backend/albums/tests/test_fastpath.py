@@ -0,0 +1,97 @@
+import pytest
+from albums.fastpath import compile_field_mapping
+from albums.models import Album
+from albums.renderers import FastJSONRenderer
+from albums.serializers import AlbumSerializer
+from albums.tests.factories import AlbumFactory
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+
+class AlbumWithLabelSerializer(AlbumSerializer):
+    label = serializers.SerializerMethodField()
+
+    class Meta(AlbumSerializer.Meta):
+        fields = AlbumSerializer.Meta.fields + ["label"]
+
+    def get_label(self, album):
+        return f"{album.artist} - {album.title}"
+
+
+def test_field_mapping_covers_serializer_fields():
+    names, columns = compile_field_mapping(AlbumSerializer)
+    assert names == tuple(AlbumSerializer.Meta.fields)
+    assert columns == names
+
+
+def test_field_mapping_rejects_computed_fields():
+    assert compile_field_mapping(AlbumWithLabelSerializer) is None
+
+
+def test_renderer_matches_json_renderer():
+    data = {
+        "title": "Line\u2028break\u2029 “quoted” \\ \x01 Zoë",
+        "values": [1, None, True, 2**70],
+    }
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONRenderer().render(
+        data, "application/json; indent=4"
+    ) == JSONRenderer().render(data, "application/json; indent=4")
+
+
+@pytest.mark.django_db
+class TestFastReadPath:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+        AlbumFactory(artist="Sigur Rós", title="( )\u2028", genre="Post-Rock")
+        AlbumFactory.create_batch(4)
+
+    def expected(self, data):
+        return JSONRenderer().render(data)
+
+    def test_list_matches_serializer(self):
+        response = self.client.get(self.list_url, {"ordering": "-artist"})
+        assert response.status_code == status.HTTP_200_OK
+        albums = Album.objects.order_by("-artist", "id")
+        assert response.content == self.expected(
+            {
+                "count": 5,
+                "count_exact": True,
+                "next": None,
+                "previous": None,
+                "results": AlbumSerializer(albums, many=True).data,
+            }
+        )
+
+    def test_cursor_page_matches_serializer(self):
+        response = self.client.get(
+            self.list_url, {"pagination": "cursor", "page_size": 2}
+        )
+        albums = Album.objects.order_by("id")[:2]
+        assert response.data["next"]
+        assert response.content == self.expected(
+            {
+                "next": response.data["next"],
+                "results": AlbumSerializer(albums, many=True).data,
+            }
+        )
+
+    def test_retrieve_matches_serializer(self):
+        album = Album.objects.get(artist="Sigur Rós")
+        response = self.client.get(reverse("album-detail", args=[album.id]))
+        assert response.content == self.expected(AlbumSerializer(album).data)
+
+    def test_retrieve_missing_album(self):
+        response = self.client.get(reverse("album-detail", args=[999999]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_random_matches_serializer(self):
+        response = self.client.get(reverse("album-random"), {"count": 5})
+        albums = Album.objects.in_bulk([album["id"] for album in response.data])
+        assert response.content == self.expected(
+            [AlbumSerializer(albums[item["id"]]).data for item in response.data]
+        )
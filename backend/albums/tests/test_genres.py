@@ -0,0 +1,86 @@
+import io
+
+import pytest
+from albums.models import Album, AlbumGenre, Genre
+from albums.tests.factories import AlbumFactory
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+def tags(album):
+    return sorted(album.genres.values_list("name", flat=True))
+
+
+@pytest.mark.django_db
+class TestGenreLinks:
+    def test_save_links_tags(self):
+        album = AlbumFactory(genre="Art Pop / art rock / worldbeat")
+        assert tags(album) == ["art pop", "art rock", "worldbeat"]
+
+        album = Album.objects.get(pk=album.pk)
+        album.genre = "art rock / jazz"
+        album.save()
+        assert tags(album) == ["art rock", "jazz"]
+
+    def test_delete_removes_links(self):
+        album = AlbumFactory(genre="rock")
+        album.delete()
+        assert not AlbumGenre.objects.exists()
+        assert Genre.objects.filter(name="rock").exists()
+
+    def test_bulk_endpoints(self):
+        client = APIClient()
+        url = reverse("album-bulk-create")
+        response = client.post(
+            url,
+            [{"artist": "Can", "title": "Tago Mago", "year": 1971, "genre": "kraut"}],
+            format="json",
+        )
+        album = Album.objects.get(pk=response.data[0]["id"])
+        assert tags(album) == ["kraut"]
+
+        client.patch(url, [{"id": album.pk, "genre": "kraut / funk"}], format="json")
+        assert tags(album) == ["funk", "kraut"]
+
+    def test_seed_csv(self, tmp_path):
+        csv_path = tmp_path / "albums.csv"
+        csv_path.write_text(
+            "artist,title,year,genre\n"
+            "Sting,Ten Summoner's Tales,1993,pop rock / jazz rock\n"
+        )
+        call_command("seed_csv", "--path", str(csv_path), stdout=io.StringIO())
+        assert tags(Album.objects.get()) == ["jazz rock", "pop rock"]
+
+
+@pytest.mark.django_db
+class TestGenreFilters:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.url = reverse("album-list")
+        self.rock = AlbumFactory(genre="rock", year=1970)
+        self.art_rock = AlbumFactory(genre="art rock / pop", year=1971)
+        self.kraut = AlbumFactory(genre="krautrock / rock", year=1972)
+        self.jazz = AlbumFactory(genre="jazz", year=1973)
+
+    def ids(self, **params):
+        response = self.client.get(self.url, {**params, "ordering": "year"})
+        assert response.status_code == status.HTTP_200_OK
+        return [album["id"] for album in response.data["results"]]
+
+    def test_genre_any_matches_exact_tags(self):
+        assert self.ids(genre_any="rock") == [self.rock.id, self.kraut.id]
+        assert self.ids(genre_any="Jazz, pop") == [self.art_rock.id, self.jazz.id]
+
+    def test_genre_all(self):
+        assert self.ids(genre_all="rock,krautrock") == [self.kraut.id]
+        assert self.ids(genre_all="rock,jazz") == []
+
+    def test_combined_with_other_filters(self):
+        assert self.ids(genre_any="rock", year__gte=1971) == [self.kraut.id]
+
+    def test_genre_field_still_in_output(self):
+        response = self.client.get(reverse("album-detail", args=[self.kraut.id]))
+        assert response.data["genre"] == "krautrock / rock"
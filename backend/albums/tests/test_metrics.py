@@ -0,0 +1,102 @@
+import logging
+
+import pytest
+from albums import metrics
+from albums.models import Album
+from albums.tests.factories import AlbumFactory
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+def route_label(url):
+    """The route label the middleware records for ``url``."""
+    return f'route="{metrics.escape(resolve(url).route)}"'
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    metrics.registry.reset()
+
+
+@pytest.mark.django_db
+class TestMetricsMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.ALBUMS_CACHE_ENABLED = False
+        self.list_url = reverse("album-list")
+        self.list_route = f'{route_label(self.list_url)},method="GET"'
+
+    def scrape(self):
+        response = APIClient().get(reverse("metrics"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        return response.content.decode()
+
+    def test_records_latency_queries_and_size_per_route(self):
+        AlbumFactory.create_batch(3)
+        client = APIClient()
+        client.get(self.list_url)
+        client.get(self.list_url, {"page": 2})
+        detail_url = reverse("album-detail", args=[Album.objects.first().pk])
+        client.get(detail_url)
+
+        body = self.scrape()
+        assert f'http_requests_total{{{self.list_route},status="200"}} 1' in body
+        assert f'http_requests_total{{{self.list_route},status="404"}} 1' in body
+        assert f"http_request_duration_seconds_count{{{self.list_route}}} 2" in body
+        assert f"http_response_size_bytes_count{{{self.list_route}}} 2" in body
+        assert f"db_queries_per_request_count{{{self.list_route}}} 2" in body
+        assert f"db_query_duration_seconds_total{{{self.list_route}}}" in body
+        assert f'{{{self.list_route},phase="serialize"}}' in body
+        assert f'{{{self.list_route},phase="render"}}' in body
+        assert route_label(detail_url) in body
+
+    @pytest.mark.parametrize("urls", ["mymusicapi.urls", "albums.tests.async_urls"])
+    def test_counts_queries_under_asgi(self, settings, urls):
+        # A sync view, then the async views reading through the async ORM.
+        settings.ROOT_URLCONF = urls
+        AlbumFactory.create_batch(3)
+        response = async_to_sync(AsyncClient().get)(self.list_url)
+        assert response.status_code == status.HTTP_200_OK
+
+        route = f'{route_label(self.list_url)},method="GET"'
+        prefix = f"db_queries_per_request_sum{{{route}}} "
+        body = metrics.registry.expose()
+        (line,) = [line for line in body.splitlines() if line.startswith(prefix)]
+        assert float(line.removeprefix(prefix)) > 0
+
+    def test_server_timing_is_opt_in(self, settings):
+        assert "Server-Timing" not in APIClient().get(self.list_url)
+
+        settings.ALBUMS_METRICS_SERVER_TIMING = True
+        response = APIClient().get(self.list_url)
+        timing = response["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert "serialize;dur=" in timing
+        assert "total;dur=" in timing
+
+    def test_warns_about_repeated_statements(self, settings, caplog):
+        settings.ALBUMS_METRICS_REPEATED_QUERY_THRESHOLD = 3
+        AlbumFactory.create_batch(3)
+        # Each nested album list is prefetched: no repeated statement.
+        with caplog.at_level(logging.WARNING, logger="albums.metrics"):
+            APIClient().get(reverse("artist-list"))
+        assert not caplog.records
+
+        settings.ALBUMS_METRICS_REPEATED_QUERY_THRESHOLD = 1
+        with caplog.at_level(logging.WARNING, logger="albums.metrics"):
+            APIClient().get(self.list_url)
+        assert "Possible N+1 on GET /api/albums/" in caplog.text
+
+    def test_warns_about_slow_queries(self, settings, caplog):
+        settings.ALBUMS_METRICS_SLOW_QUERY_MS = 0
+        with caplog.at_level(logging.WARNING, logger="albums.metrics"):
+            APIClient().get(self.list_url)
+        assert "Slow query on GET /api/albums/" in caplog.text
+
+
+def test_label_values_are_escaped():
+    assert metrics.format_labels((("route", 'a"b\\c'),)) == r'{route="a\"b\\c"}'
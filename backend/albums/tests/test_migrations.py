@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+BEFORE_NATURAL_KEY = [("albums", "0005_catalogue_version")]
+NATURAL_KEY = [("albums", "0006_album_natural_key")]
+
+
+@pytest.fixture
+def migrate():
+    """Migrate albums to a target, and back to the latest migration afterwards."""
+
+    def migrate(targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    yield migrate
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestNaturalKeyMigration:
+    def test_merges_duplicates_into_the_oldest_album(self, migrate, capsys):
+        Album = migrate(BEFORE_NATURAL_KEY).get_model("albums", "Album")
+        kept = Album.objects.create(
+            artist="Tool", title="Lateralus", year=2001, genre="Rock"
+        )
+        merged = Album.objects.create(
+            artist="TOOL", title=" lateralus", year=2001, genre="Progressive"
+        )
+        repeated = Album.objects.create(
+            artist="Tool", title="Lateralus", year=2001, genre="rock"
+        )
+        other = Album.objects.create(
+            artist="Tool", title="Lateralus", year=2002, genre="Rock"
+        )
+
+        Album = migrate(NATURAL_KEY).get_model("albums", "Album")
+        assert dict(Album.objects.values_list("id", "genre")) == {
+            kept.id: "Rock / Progressive",
+            other.id: "Rock",
+        }
+        output = capsys.readouterr().out
+        assert f"Merged duplicate album {merged.id} into {kept.id}" in output
+        assert f"Merged duplicate album {repeated.id} into {kept.id}" in output
+
+    def test_fails_when_the_genres_do_not_fit(self, migrate):
+        Album = migrate(BEFORE_NATURAL_KEY).get_model("albums", "Album")
+        albums = [
+            Album.objects.create(artist="Tool", title="Undertow", year=1993, genre=g)
+            for g in ["a" * 200, "b" * 200]
+        ]
+
+        with pytest.raises(RuntimeError, match=str([a.id for a in albums])):
+            migrate(NATURAL_KEY)
+        Album = migrate(BEFORE_NATURAL_KEY).get_model("albums", "Album")
+        assert Album.objects.count() == 2
+        Album.objects.all().delete()
@@ -1,7 +1,16 @@
 import pytest
+from albums.models import Album
 
 
 @pytest.mark.django_db
 def test_album_str_representation(album_factory):
     album = album_factory(artist="Metallica", title="Ride the Lightning", year=1984)
     assert str(album) == "Metallica - Ride the Lightning (1984)"
+
+
+@pytest.mark.django_db
+def test_natural_key_is_a_fixed_length_digest(album_factory):
+    # Casefolding doubles the length of these names.
+    album = album_factory(artist="ß" * 255, title="ß" * 255, year=2001)
+    assert len(album.natural_key) == 64
+    assert album.natural_key == Album.build_natural_key("SS" * 255, "ss" * 255, 2001)
@@ -0,0 +1,120 @@
+import pytest
+from albums.models import Album
+from albums.tests.factories import AlbumFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+
+    def collect_pages(self, params):
+        ids = []
+        response = self.client.get(self.list_url, params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            ids += [album["id"] for album in response.data["results"]]
+            if response.data["next"] is None:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_cursor_walks_every_album_once(self):
+        for year in (1970, 1980, 1990):
+            AlbumFactory.create_batch(7, year=year)
+
+        ids = self.collect_pages(
+            {"pagination": "cursor", "ordering": "-year,artist", "page_size": 4}
+        )
+
+        expected = list(
+            Album.objects.order_by("-year", "artist", "id").values_list("id", flat=True)
+        )
+        assert ids == expected
+
+    def test_cursor_keeps_filters(self):
+        AlbumFactory.create_batch(5, genre="jazz")
+        AlbumFactory.create_batch(5, genre="rock")
+
+        ids = self.collect_pages(
+            {"pagination": "cursor", "genre": "jazz", "page_size": 2}
+        )
+
+        assert len(ids) == 5
+        assert set(
+            Album.objects.filter(id__in=ids).values_list("genre", flat=True)
+        ) == {"jazz"}
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.list_url, {"cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestCountModes:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.ALBUMS_CACHE_ENABLED = False
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+        AlbumFactory.create_batch(5, genre="jazz")
+
+    def test_exact_by_default(self):
+        response = self.client.get(self.list_url)
+        assert response.data["count"] == 5
+        assert response.data["count_exact"] is True
+
+    def test_none_skips_the_count(self):
+        params = {"count_mode": "none", "page_size": 2, "ordering": "id"}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, params)
+        assert not any("COUNT(" in query["sql"] for query in queries)
+
+        assert response.data["count"] is None
+        assert response.data["count_exact"] is False
+        assert len(response.data["results"]) == 2
+        assert response.data["previous"] is None
+
+        ids = []
+        while True:
+            ids += [album["id"] for album in response.data["results"]]
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+        assert ids == list(Album.objects.order_by("id").values_list("id", flat=True))
+        assert "page=2" in response.data["previous"]
+
+    def test_none_past_the_last_page(self):
+        response = self.client.get(self.list_url, {"count_mode": "none", "page": 9})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = self.client.get(self.list_url, {"count_mode": "none", "page": 0})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_approximate_count_is_cached_per_filter(self):
+        params = {"count_mode": "approximate", "genre": "jazz"}
+        response = self.client.get(self.list_url, params)
+        assert response.data["count"] == 5
+        assert response.data["count_exact"] is False
+
+        AlbumFactory(genre="jazz")
+        assert self.client.get(self.list_url, params).data["count"] == 5
+        other = {"count_mode": "approximate", "genre": "rock"}
+        assert self.client.get(self.list_url, other).data["count"] == 0
+
+    def test_default_mode_from_settings(self, settings):
+        settings.ALBUMS_PAGINATION_COUNT = "none"
+        assert self.client.get(self.list_url).data["count"] is None
+        response = self.client.get(self.list_url, {"count_mode": "exact"})
+        assert response.data["count"] == 5
+
+    def test_unknown_mode(self):
+        response = self.client.get(self.list_url, {"count_mode": "roughly"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
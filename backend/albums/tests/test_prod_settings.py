@@ -0,0 +1,66 @@
+import importlib
+
+import pytest
+from albums.tests.factories import AlbumFactory
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from mymusicapi.settings import base, prod
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestProductionMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.MIDDLEWARE = prod.MIDDLEWARE
+        settings.BROWSER_MIDDLEWARE = prod.BROWSER_MIDDLEWARE
+        settings.STATELESS_PATH_PREFIXES = prod.STATELESS_PATH_PREFIXES
+        self.client = APIClient()
+
+    def test_api_skips_session_and_csrf(self):
+        AlbumFactory()
+        self.client.cookies["sessionid"] = "unknown"
+        response = self.client.get(reverse("album-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert "Cookie" not in response.get("Vary", "")
+        assert "X-Frame-Options" not in response
+
+    def test_api_writes_need_no_csrf_token(self):
+        client = APIClient(enforce_csrf_checks=True)
+        response = client.post(
+            reverse("album-list"),
+            {"artist": "Yes", "title": "Fragile", "year": 1971, "genre": "prog"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_admin_keeps_sessions_and_csrf(self):
+        response = self.client.get(reverse("admin:login"))
+        assert response.status_code == status.HTTP_200_OK
+        assert "csrftoken" in response.cookies
+        assert response["X-Frame-Options"] == "DENY"
+
+        get_user_model().objects.create_superuser("admin", "", "secret")
+        self.client.login(username="admin", password="secret")
+        assert self.client.get(reverse("admin:index")).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "backend, enabled",
+    [
+        ("django.core.cache.backends.locmem.LocMemCache", False),
+        ("django.core.cache.backends.redis.RedisCache", True),
+    ],
+)
+def test_response_cache_needs_a_shared_backend(monkeypatch, backend, enabled):
+    monkeypatch.setenv("ALBUMS_CACHE_BACKEND", backend)
+    try:
+        importlib.reload(base)
+        assert importlib.reload(prod).ALBUMS_CACHE_ENABLED is enabled
+    finally:
+        monkeypatch.undo()
+        importlib.reload(base)
+        importlib.reload(prod)
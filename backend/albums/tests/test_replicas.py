@@ -0,0 +1,154 @@
+from unittest import mock
+
+import pytest
+from albums import replicas
+from albums.batch import lru
+from albums.models import Album
+from albums.replicas import ReplicaRouter, replica_reads
+from albums.tests.factories import AlbumFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+COOKIE = "albums_read_primary"
+
+
+class TestReplicaRouter:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.ALBUMS_READ_REPLICAS = ["replica1", "replica2"]
+        self.router = ReplicaRouter()
+
+    def test_reads_use_primary_outside_replica_reads(self):
+        assert self.router.db_for_read(Album) is None
+
+    def test_reads_use_a_replica_inside_replica_reads(self):
+        with replica_reads():
+            assert self.router.db_for_read(Album) in {"replica1", "replica2"}
+            assert self.router.db_for_write(Album) == "default"
+        assert self.router.db_for_read(Album) is None
+
+    def test_relations_across_primary_and_replicas_are_allowed(self):
+        primary, replica = Album(), Album()
+        primary._state.db, replica._state.db = "default", "replica1"
+        assert self.router.allow_relation(primary, replica)
+
+        replica._state.db = "other"
+        assert self.router.allow_relation(primary, replica) is None
+
+
+@pytest.mark.django_db
+class TestReplicaReads:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        # The primary stands in for the replica, so the queries succeed.
+        settings.ALBUMS_READ_REPLICAS = ["default"]
+        settings.ALBUMS_CACHE_ENABLED = False
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+        self.album = AlbumFactory()
+
+    @pytest.fixture
+    def picks(self):
+        with mock.patch.object(
+            replicas, "pick_replica", wraps=replicas.pick_replica
+        ) as pick:
+            yield pick
+
+    def test_reads_go_to_a_replica(self, picks):
+        for url in [
+            self.list_url,
+            reverse("album-detail", args=[self.album.pk]),
+            reverse("album-random"),
+            reverse("artist-list"),
+        ]:
+            assert self.client.get(url).status_code == status.HTTP_200_OK
+        self.client.get(self.list_url, {"search": "x"})
+        assert picks.call_count == 5
+
+    def test_writes_stay_on_primary_and_stick_the_client(self, picks):
+        response = self.client.patch(
+            reverse("album-detail", args=[self.album.pk]),
+            {"title": "New"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.cookies[COOKIE]["max-age"] == 5
+        assert not picks.called
+
+        # The client keeps the cookie: its next reads use the primary.
+        assert self.client.get(self.list_url).data["results"][0]["title"] == "New"
+        assert not picks.called
+
+    def test_failed_write_does_not_stick(self):
+        response = self.client.post(self.list_url, {}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert COOKIE not in response.cookies
+
+    def test_header_reads_primary(self, picks):
+        self.client.get(self.list_url, HTTP_X_READ_PRIMARY="1")
+        assert not picks.called
+
+    def test_no_replicas_no_cookie(self, settings, picks):
+        settings.ALBUMS_READ_REPLICAS = []
+        self.client.get(self.list_url)
+        response = self.client.delete(reverse("album-detail", args=[self.album.pk]))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert COOKIE not in response.cookies
+        assert not picks.called
+
+
+@pytest.mark.django_db
+class TestPinnedClientsAndCaches:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.ALBUMS_READ_REPLICAS = ["default"]
+        settings.ALBUMS_BATCH_LRU_SIZE = 10
+        lru.clear()
+        self.client = APIClient()
+        self.album = AlbumFactory(title="Old")
+        self.detail_url = reverse("album-detail", args=[self.album.pk])
+        self.batch_url = reverse("album-batch")
+        yield
+        lru.clear()
+
+    def lag_replica(self):
+        """Cache the current title, then change it without a cache bump."""
+        assert self.client.get(self.detail_url)["X-Cache"] == "MISS"
+        self.client.get(self.batch_url, {"ids": self.album.pk})
+        Album.objects.filter(pk=self.album.pk).update(title="New")
+
+    def test_pinned_client_reads_past_the_response_cache(self):
+        self.lag_replica()
+        response = self.client.get(self.detail_url, HTTP_X_READ_PRIMARY="1")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["title"] == "New"
+
+        # What the primary returned replaced the lagging entry.
+        response = self.client.get(self.detail_url)
+        assert response["X-Cache"] == "HIT"
+        assert response.data["title"] == "New"
+
+    def test_pinned_client_reads_past_the_batch_lru(self):
+        self.lag_replica()
+        params = {"ids": self.album.pk}
+        response = self.client.get(self.batch_url, params, HTTP_X_READ_PRIMARY="1")
+        assert response.data["results"][0]["title"] == "New"
+
+        response = self.client.get(self.batch_url, params)
+        assert response.data["results"][0]["title"] == "New"
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("albums.tests.async_urls")
+def test_async_reads_go_to_a_replica(settings):
+    settings.ALBUMS_READ_REPLICAS = ["default"]
+    AlbumFactory()
+    with mock.patch.object(
+        replicas, "pick_replica", wraps=replicas.pick_replica
+    ) as pick:
+        response = APIClient().get(reverse("album-list"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert pick.called
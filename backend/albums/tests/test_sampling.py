@@ -0,0 +1,61 @@
+import random
+from collections import Counter
+
+import pytest
+from albums.models import Album
+from albums.sampling import arandom_albums, random_albums
+from albums.tests.factories import AlbumFactory
+from asgiref.sync import async_to_sync
+
+
+def sync_sample(queryset, count, draws):
+    return [album.pk for _ in range(draws) for album in random_albums(queryset, count)]
+
+
+@async_to_sync
+async def async_sample(queryset, count, draws):
+    return [
+        album.pk
+        for _ in range(draws)
+        for album in await arandom_albums(queryset, count)
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("sample", [sync_sample, async_sample], ids=["sync", "async"])
+class TestRandomAlbums:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        random.seed(0)
+        albums = AlbumFactory.build_batch(100, genre="rock")
+        for album in albums:
+            album.refresh_natural_key()
+        self.albums = Album.objects.bulk_create(albums)
+        self.lower_half = {album.pk for album in self.albums[:50]}
+
+    def lower_half_share(self, sample, count, draws):
+        picks = sample(Album.objects.all(), count, draws)
+        assert len(picks) == count * draws
+        return sum(pk in self.lower_half for pk in picks) / len(picks)
+
+    @pytest.mark.parametrize("count, draws", [(1, 1000), (20, 50)])
+    def test_uniform_over_the_table(self, sample, count, draws):
+        assert 0.45 < self.lower_half_share(sample, count, draws) < 0.55
+
+    def test_uniform_under_a_selective_filter(self, sample):
+        # Uneven gaps in front of the matching albums.
+        jazz = [self.albums[i] for i in [0, 1, 2, 60, 99]]
+        Album.objects.filter(pk__in=[album.pk for album in jazz]).update(genre="jazz")
+
+        draws = 600
+        picks = Counter(sample(Album.objects.filter(genre="jazz"), 1, draws))
+        assert set(picks) == {album.pk for album in jazz}
+        for album in jazz:
+            assert 0.12 < picks[album.pk] / draws < 0.28
+
+    def test_returns_every_match_when_count_exceeds_them(self, sample):
+        queryset = Album.objects.filter(pk__in=[self.albums[3].pk, self.albums[70].pk])
+        assert sorted(sample(queryset, 5, 1)) == [
+            self.albums[3].pk,
+            self.albums[70].pk,
+        ]
@@ -0,0 +1,54 @@
+import pytest
+from albums.tests.factories import AlbumFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestFullTextSearch:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+
+    def search(self, query, **params):
+        response = self.client.get(self.list_url, {"q": query, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return [album["title"] for album in response.data["results"]]
+
+    def test_results_are_ranked(self):
+        AlbumFactory(artist="Sting", title="Ten Summoner's Tales", genre="jazz rock")
+        AlbumFactory(artist="Miles Davis", title="Kind of Blue", genre="jazz")
+        AlbumFactory(artist="Jazz Collective", title="Jazz Nights", genre="jazz")
+        AlbumFactory(artist="Metallica", title="Master of Puppets", genre="metal")
+
+        titles = self.search("jazz")
+
+        assert titles[0] == "Jazz Nights"
+        assert set(titles[1:]) == {"Ten Summoner's Tales", "Kind of Blue"}
+
+    def test_prefix_matching_on_every_term(self):
+        AlbumFactory(artist="Radiohead", title="OK Computer", genre="alternative")
+        AlbumFactory(artist="Radiohead", title="Kid A", genre="electronic")
+
+        assert self.search("radio comp") == ["OK Computer"]
+
+    def test_genre_tags_are_split(self):
+        AlbumFactory(artist="Peter Gabriel", title="So", genre="art pop / art rock")
+
+        assert self.search("rock") == ["So"]
+
+    def test_index_follows_updates(self):
+        album = AlbumFactory(artist="Genesis", title="Duke", genre="rock")
+        album.title = "Abacab"
+        album.save()
+
+        assert self.search("duke") == []
+        assert self.search("abacab") == ["Abacab"]
+
+    def test_explicit_ordering_wins(self):
+        AlbumFactory(title="Blue Train", year=1957, genre="jazz")
+        AlbumFactory(title="Blue Blue Blue", year=1990, genre="blues")
+
+        assert self.search("blue", ordering="-year") == ["Blue Blue Blue", "Blue Train"]
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from albums.tests.factories import AlbumFactory
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.client = APIClient()
+        self.list_url = reverse("album-list")
+        self.albums = AlbumFactory.create_batch(3)
+
+    def test_fields_prunes_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {"fields": "title,id"})
+
+        assert response.status_code == status.HTTP_200_OK
+        # Serializer order, not request order.
+        assert list(response.data["results"][0]) == ["id", "title"]
+        page_query = queries[-1]["sql"]
+        assert '"title"' in page_query
+        assert '"genre"' not in page_query
+        assert '"artist"' not in page_query
+
+    def test_omit(self):
+        album = self.albums[0]
+        response = self.client.get(
+            reverse("album-detail", args=[album.pk]), {"omit": "genre,year"}
+        )
+        assert response.data == {
+            "id": album.pk,
+            "artist": album.artist,
+            "title": album.title,
+        }
+
+    def test_cursor_pagination_without_the_ordering_fields(self):
+        ids = []
+        response = self.client.get(
+            self.list_url,
+            {"pagination": "cursor", "page_size": 2, "fields": "title"},
+        )
+        while True:
+            assert list(response.data["results"][0]) == ["title"]
+            ids += [album["title"] for album in response.data["results"]]
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+        assert sorted(ids) == sorted(album.title for album in self.albums)
+
+    def test_random_batch_and_export(self):
+        params = {"fields": "id,year"}
+        random = self.client.get(reverse("album-random"), {"count": 2, **params})
+        assert [set(album) for album in random.data] == [{"id", "year"}] * 2
+
+        ids = ",".join(str(album.pk) for album in self.albums)
+        batch = self.client.get(reverse("album-batch"), {"ids": ids, **params})
+        assert [album["id"] for album in batch.data["results"]] == [
+            album.pk for album in self.albums
+        ]
+        assert set(batch.data["results"][0]) == {"id", "year"}
+
+        export = self.client.get(reverse("album-export"), params)
+        lines = b"".join(export.streaming_content).splitlines()
+        assert set(json.loads(lines[0])) == {"id", "year"}
+
+        csv = self.client.get(reverse("album-export"), {"format": "csv", **params})
+        assert b"".join(csv.streaming_content).splitlines()[0] == b"id,year"
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"fields": "title,label"}, {"omit": "nope"}, {"fields": "id", "omit": "id"}],
+    )
+    def test_invalid_fields(self, params):
+        response = self.client.get(self.list_url, params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_schema_documents_parameters(self):
+        schema = self.client.get(reverse("schema"), {"format": "json"}).json()
+        paths = schema["paths"]
+
+        def parameters(path):
+            return {param["name"] for param in paths[path]["get"]["parameters"]}
+
+        assert {"fields", "omit"} <= parameters("/api/albums/")
+        assert {"fields", "omit"} <= parameters("/api/albums/batch/")
+        assert not {"fields", "omit"} & parameters("/api/albums/facets/")
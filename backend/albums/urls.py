@@ -1,9 +1,15 @@
 from albums import views
+from albums.async_views import AsyncReadRouter
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-router = DefaultRouter()
+if getattr(settings, "ALBUMS_ASYNC_READS", False):
+    router = AsyncReadRouter()
+else:
+    router = DefaultRouter()
 router.register(r"albums", views.AlbumViewSet, basename="album")
+router.register(r"artists", views.ArtistViewSet, basename="artist")
 
 urlpatterns = [
     path("", include(router.urls)),
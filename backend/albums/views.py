@@ -1,8 +1,18 @@
-import random
-
-from albums.models import Album
+from albums.batch import BatchRetrieveMixin
+from albums.bulk import BulkActionsMixin
+from albums.cache import CachedResponseMixin
+from albums.changes import ChangeFeedMixin
+from albums.conditional import ConditionalGetMixin
+from albums.export import ExportActionMixin
+from albums.facets import FacetsActionMixin
+from albums.fastpath import FastReadMixin
+from albums.models import Album, Artist
 from albums.pagination import CustomPagination
-from albums.serializers import AlbumSerializer
+from albums.replicas import ReplicaReadMixin
+from albums.sampling import arandom_albums, random_albums
+from albums.serializers import AlbumSerializer, ArtistSerializer
+from django.conf import settings
+from django.db.models import Count, Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import (
     OpenApiExample,
@@ -15,7 +25,7 @@ from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from .filters import AlbumFilter
+from .filters import AlbumFilter, AlbumFullTextSearchFilter, ArtistFilter
 
 
 @extend_schema_view(
@@ -32,6 +42,12 @@ from .filters import AlbumFilter
                 required=False,
                 type=str,
             ),
+            OpenApiParameter(
+                name="artist_id",
+                description="Albums of the artist with this id (see `/api/artists/`)",
+                required=False,
+                type=int,
+            ),
             OpenApiParameter(
                 name="title",
                 description="Filter by album title",
@@ -50,12 +66,33 @@ from .filters import AlbumFilter
                 required=False,
                 type=str,
             ),
+            OpenApiParameter(
+                name="genre_any",
+                description="Albums tagged with any of these comma-separated "
+                "genres (exact tag match, e.g. `rock,jazz`)",
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="genre_all",
+                description="Albums tagged with all of these comma-separated "
+                "genres (exact tag match, e.g. `art rock,worldbeat`)",
+                required=False,
+                type=str,
+            ),
             OpenApiParameter(
                 name="search",
                 description="Search term across artist, title, year, and genre",
                 required=False,
                 type=str,
             ),
+            OpenApiParameter(
+                name="q",
+                description="Full-text search across artist, title and genre tags, "
+                "ranked by relevance (prefix matching)",
+                required=False,
+                type=str,
+            ),
             OpenApiParameter(
                 name="ordering",
                 description="Order results by one or more fields (e.g. `year`, `-artist`)",
@@ -209,17 +246,43 @@ from .filters import AlbumFilter
         },
     ),
 )
-class AlbumViewSet(viewsets.ModelViewSet):
+class AlbumViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    BatchRetrieveMixin,
+    BulkActionsMixin,
+    ChangeFeedMixin,
+    ExportActionMixin,
+    FacetsActionMixin,
+    FastReadMixin,
+    viewsets.ModelViewSet,
+):
     """
     **Albums API**
 
     Provides CRUD operations, filtering, search, and ordering capabilities
     for the music albums collection.
 
-    - Filter by: `artist`, `title`, `year`, `genre`
+    - Bulk create / update / delete: `POST` / `PATCH` / `DELETE` on `bulk/`
+    - Several albums by id in one request: `batch/?ids=3,1,2`
+    - Streamed export of the filtered catalogue: `export/` (NDJSON or CSV)
+    - Changes and deletions after a cursor, for mirrors: `changes/?since=`
+
+    - Filter by: `artist`, `artist_id`, `title`, `year`, `genre`
+    - Exact genre tags: `genre_any`, `genre_all`
+    - Facet counts by genre tag, artist and decade: `facets/`
     - Search across: `artist`, `title`, `year`, `genre`
+    - Full-text search (`q`): ranked, prefix matching on artist, title, genre
     - Ordering: `year`, `artist`, `title`
+    - Sparse fieldsets: `fields=id,title` or `omit=genre` (unread columns are skipped)
     - Pagination: 20 items per page (default)
+    - `count_mode=none` / `approximate` skip the exact `COUNT(*)` of a page
+    - List and detail responses are cached until the catalogue changes
+    - Conditional GET: `ETag` / `Last-Modified`, 304 on `If-None-Match`
+    - Reads skip model instances: rows are serialized straight from `values_list()`
+    - Reads go to a read replica when configured; a client's own writes are
+      followed by primary reads for a few seconds
     """
 
     queryset = Album.objects.all().order_by("id")
@@ -229,6 +292,7 @@ class AlbumViewSet(viewsets.ModelViewSet):
         DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
+        AlbumFullTextSearchFilter,
     ]
     filterset_class = AlbumFilter
     search_fields = ["artist", "title", "year", "genre"]
@@ -238,9 +302,20 @@ class AlbumViewSet(viewsets.ModelViewSet):
     @extend_schema(
         summary="Get a random album",
         description="Return one random album from the database. "
-        "If no albums exist, returns a 404 error.",
+        "Accepts the same filters and search as the list endpoint. "
+        "Pass `count` to get a list of up to 50 distinct random albums instead. "
+        "If no albums match, returns a 404 error.",
+        parameters=[
+            OpenApiParameter(
+                name="count",
+                description="Number of distinct random albums to return (max 50)",
+                required=False,
+                type=int,
+            ),
+        ],
         responses={
             200: AlbumSerializer,
+            400: OpenApiResponse(description="Invalid count"),
             404: OpenApiResponse(description="No albums found"),
         },
         examples=[
@@ -259,13 +334,97 @@ class AlbumViewSet(viewsets.ModelViewSet):
     )
     @action(detail=False, methods=["get"])
     def random(self, request):
-        count = Album.objects.count()
-        if count == 0:
+        count, error = self.get_random_count(request)
+        if error is not None:
+            return error
+
+        queryset = self.filter_queryset(self.get_queryset())
+        albums = random_albums(self.get_read_queryset(queryset, "pk"), count or 1)
+        return self.random_response(albums, count)
+
+    async def arandom(self, request):
+        count, error = self.get_random_count(request)
+        if error is not None:
+            return error
+
+        queryset = self.filter_queryset(self.get_queryset())
+        albums = await arandom_albums(
+            self.get_read_queryset(queryset, "pk"), count or 1
+        )
+        return self.random_response(albums, count)
+
+    def get_random_count(self, request):
+        """Return ``(count, error response)``; ``count`` is ``None`` if absent."""
+        count = request.query_params.get("count")
+        if count is None:
+            return None, None
+        try:
+            count = int(count)
+        except ValueError:
+            count = 0
+        if not 1 <= count <= self.paginator.max_page_size:
+            return None, Response(
+                {
+                    "error": "count must be an integer between 1 and "
+                    f"{self.paginator.max_page_size}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return count, None
+
+    def random_response(self, albums, count):
+        if not albums:
             return Response(
                 {"error": "No albums found"}, status=status.HTTP_404_NOT_FOUND
             )
+        if count is None:
+            return Response(self.represent(albums[0]))
+        return Response(self.represent(albums, many=True))
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List artists",
+        description="Paginated list of artists, each with all of its albums "
+        "in release order.",
+    ),
+    retrieve=extend_schema(
+        summary="Retrieve artist",
+        description="An artist and all of its albums in release order.",
+        responses={
+            200: ArtistSerializer,
+            404: OpenApiResponse(description="Artist not found"),
+        },
+    ),
+)
+class ArtistViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    **Artists API**
 
-        random_index = random.randint(0, count - 1)
-        album = Album.objects.all()[random_index]
-        serializer = self.get_serializer(album)
-        return Response(serializer.data)
+    Artists of the albums collection, each with its album count, a link to
+    all of its albums and the first `ALBUMS_ARTIST_NESTED_ALBUMS` of them
+    nested. Albums are loaded with one prefetch query per page, not one
+    query per artist, and at most that many per artist.
+
+    - Filter by: `name`
+    - Ordering: `name`
+    """
+
+    queryset = Artist.objects.order_by("name", "id")
+    serializer_class = ArtistSerializer
+    pagination_class = CustomPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = ArtistFilter
+    ordering_fields = ["name"]
+
+    def get_queryset(self):
+        limit = getattr(settings, "ALBUMS_ARTIST_NESTED_ALBUMS", 10)
+        albums = Album.objects.order_by("year", "id")[:limit]
+        return (
+            super()
+            .get_queryset()
+            .annotate(album_count=Count("albums"))
+            .prefetch_related(
+                Prefetch("albums", queryset=albums, to_attr="nested_albums")
+            )
+        )
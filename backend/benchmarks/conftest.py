@@ -0,0 +1,50 @@
+"""
+Microbenchmarks for the album read paths (pytest-benchmark).
+
+They run against the test database of the active settings: SQLite with
+``mymusicapi.settings.base``, or a local PostgreSQL with
+``mymusicapi.settings.dev`` (``DB_HOST=localhost``). The catalogue is topped
+up once per session to ``BENCH_ROWS`` synthetic albums (default 20000) and
+kept between runs by ``--reuse-db``.
+"""
+
+import os
+
+import pytest
+from albums.synthetic import top_up
+from albums.views import AlbumViewSet
+from django.test import RequestFactory
+
+BENCH_ROWS = int(os.environ.get("BENCH_ROWS", 20_000))
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        top_up(BENCH_ROWS, seed=0)
+
+
+@pytest.fixture(autouse=True)
+def uncached(settings):
+    """Measure the views, not the response cache."""
+    settings.ALBUMS_CACHE_ENABLED = False
+
+
+@pytest.fixture
+def album_view(db):
+    """
+    ``album_view(action, params, **kwargs)`` runs one GET through
+    ``AlbumViewSet`` and returns the rendered response.
+    """
+    factory = RequestFactory()
+    views = {}
+
+    def call(action, params=None, **kwargs):
+        if action not in views:
+            views[action] = AlbumViewSet.as_view({"get": action})
+        response = views[action](factory.get("/api/albums/", params or {}), **kwargs)
+        response.render()
+        assert response.status_code == 200, response.content
+        return response
+
+    return call
@@ -0,0 +1,57 @@
+"""
+Album admin changelist on the synthetic catalogue: the scalable AlbumAdmin
+against the previous configuration (``list_filter`` on year and genre,
+``icontains`` search, exact counts).
+"""
+
+import pytest
+from albums.admin import AlbumAdmin
+from albums.models import Album
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+
+class LegacyAlbumAdmin(admin.ModelAdmin):
+    list_display = ("id", "artist", "title", "year", "genre")
+    list_display_links = ("id", "title")
+    search_fields = ("artist", "title", "genre")
+    list_filter = ("year", "genre")
+    ordering = ("year", "artist")
+
+
+@pytest.fixture
+def changelist(db):
+    user = get_user_model()(username="bench", is_staff=True, is_superuser=True)
+    factory = RequestFactory()
+
+    def load(model_admin_class, params=None):
+        request = factory.get("/admin/albums/album/", params or {})
+        request.user = user
+        response = model_admin_class(Album, admin.site).changelist_view(request)
+        response.render()
+        assert response.status_code == 200
+        return response
+
+    return load
+
+
+@pytest.mark.parametrize("model_admin_class", [LegacyAlbumAdmin, AlbumAdmin])
+def test_changelist(benchmark, changelist, model_admin_class):
+    benchmark(changelist, model_admin_class)
+
+
+@pytest.mark.parametrize(
+    "model_admin_class, params",
+    [
+        (LegacyAlbumAdmin, {"year__gte": 1990, "year__lt": 2000}),
+        (AlbumAdmin, {"decade": 1990}),
+    ],
+)
+def test_changelist_filtered(benchmark, changelist, model_admin_class, params):
+    benchmark(changelist, model_admin_class, params)
+
+
+@pytest.mark.parametrize("model_admin_class", [LegacyAlbumAdmin, AlbumAdmin])
+def test_changelist_search(benchmark, changelist, model_admin_class):
+    benchmark(changelist, model_admin_class, {"q": "love"})
@@ -0,0 +1,19 @@
+import pytest
+from albums.models import Album
+
+
+@pytest.fixture
+def latest(db):
+    """A cursor just before the last 100 albums in change order."""
+    rows = Album.objects.order_by("-change_seq", "-id")
+    seq, pk = rows.values_list("change_seq", "id")[100]
+    return f"{seq}:{pk}"
+
+
+def test_changes_since_cursor(benchmark, album_view, latest):
+    """O(changes): 100 albums after the cursor, whatever the catalogue size."""
+    benchmark(album_view, "changes", {"since": latest})
+
+
+def test_changes_first_page(benchmark, album_view):
+    benchmark(album_view, "changes", {"limit": 100})
@@ -0,0 +1,29 @@
+import pytest
+from albums.compression import CODINGS, compress
+from albums.models import Album
+from albums.renderers import FastJSONRenderer
+from albums.views import AlbumViewSet
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+
+@pytest.fixture
+def view(db):
+    request = Request(RequestFactory().get("/api/albums/"))
+    return AlbumViewSet(request=request, action="list", format_kwarg=None)
+
+
+@pytest.mark.parametrize("coding", list(CODINGS))
+@pytest.mark.parametrize("size", [20, 50])
+def test_compress_page(benchmark, album_view, coding, size):
+    body = album_view("list", {"page_size": size}).content
+    compressed = benchmark(compress, coding, body)
+    benchmark.extra_info["ratio"] = len(compressed) / len(body)
+
+
+@pytest.mark.parametrize("coding", list(CODINGS))
+def test_compress_catalogue(benchmark, view, coding):
+    rows = view.get_read_queryset(Album.objects.order_by("id"))
+    body = FastJSONRenderer().render(view.represent(rows, many=True))
+    compressed = benchmark.pedantic(compress, (coding, body), rounds=3)
+    benchmark.extra_info["ratio"] = len(compressed) / len(body)
@@ -0,0 +1,19 @@
+import pytest
+
+SCENARIOS = {
+    "unfiltered": {},
+    "artist": {"artist": "wolves"},
+    "artist_id": {"artist_id": 1},
+    "genre": {"genre": "krautrock"},
+    "genre_any": {"genre_any": "krautrock,soul"},
+    "genre_all": {"genre_all": "rock,soul"},
+    "year_range": {"year__gte": 1990, "year__lte": 1994, "ordering": "year"},
+    "search": {"search": "midnight"},
+    "full_text": {"q": "midnight ocean"},
+    "ordering": {"ordering": "-artist"},
+}
+
+
+@pytest.mark.parametrize("params", SCENARIOS.values(), ids=SCENARIOS.keys())
+def test_list(benchmark, album_view, params):
+    benchmark(album_view, "list", params)
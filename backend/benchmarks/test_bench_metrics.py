@@ -0,0 +1,26 @@
+"""
+The album list through the whole middleware stack with and without
+``MetricsMiddleware``; compare the two medians to check its overhead
+(budget: 2%).
+"""
+
+import pytest
+from django.conf import settings as django_settings
+from django.test import Client
+
+METRICS_MIDDLEWARE = "albums.metrics.MetricsMiddleware"
+
+
+@pytest.fixture(params=["with_metrics", "without_metrics"])
+def client(request, settings, db):
+    if request.param == "without_metrics":
+        settings.MIDDLEWARE = [
+            name for name in django_settings.MIDDLEWARE if name != METRICS_MIDDLEWARE
+        ]
+    return Client()
+
+
+@pytest.mark.benchmark(group="metrics-overhead")
+def test_list_middleware_stack(benchmark, client):
+    response = benchmark(client.get, "/api/albums/", HTTP_ACCEPT="application/json")
+    assert response.status_code == 200
@@ -0,0 +1,40 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from albums.models import Album
+
+
+@pytest.fixture
+def deep_page(db):
+    return max(Album.objects.count() // 20 // 2, 1)
+
+
+def test_first_page(benchmark, album_view):
+    benchmark(album_view, "list", {"page": 1})
+
+
+def test_deep_page(benchmark, album_view, deep_page):
+    benchmark(album_view, "list", {"page": deep_page})
+
+
+def test_page_size_50(benchmark, album_view):
+    benchmark(album_view, "list", {"page_size": 50})
+
+
+def test_keyset_first_page(benchmark, album_view):
+    benchmark(album_view, "list", {"cursor": ""})
+
+
+def test_keyset_next_page(benchmark, album_view):
+    next_url = album_view("list", {"cursor": "", "ordering": "year"}).data["next"]
+    query = parse_qs(urlsplit(next_url).query)
+    params = {key: values[0] for key, values in query.items()}
+    benchmark(album_view, "list", params)
+
+
+def test_deep_page_without_count(benchmark, album_view, deep_page):
+    benchmark(album_view, "list", {"page": deep_page, "count_mode": "none"})
+
+
+def test_deep_page_approximate_count(benchmark, album_view, deep_page):
+    benchmark(album_view, "list", {"page": deep_page, "count_mode": "approximate"})
@@ -0,0 +1,18 @@
+import pytest
+
+SCENARIOS = {
+    "single": {},
+    "count_10": {"count": 10},
+    "filtered": {"genre": "jazz"},
+    "filtered_count_10": {"year__gte": 2000, "count": 10},
+}
+
+
+@pytest.mark.parametrize("params", SCENARIOS.values(), ids=SCENARIOS.keys())
+def test_random(benchmark, album_view, params):
+    benchmark(album_view, "random", params)
+
+
+def test_retrieve(benchmark, album_view):
+    pk = album_view("random").data["id"]
+    benchmark(album_view, "retrieve", pk=pk)
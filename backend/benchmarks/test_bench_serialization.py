@@ -0,0 +1,26 @@
+import pytest
+from albums.models import Album
+from albums.renderers import FastJSONRenderer
+from albums.serializers import AlbumSerializer
+from albums.views import AlbumViewSet
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+
+@pytest.fixture
+def view(db):
+    request = Request(RequestFactory().get("/api/albums/"))
+    return AlbumViewSet(request=request, action="list", format_kwarg=None)
+
+
+@pytest.mark.parametrize("size", [20, 50])
+def test_model_serializer(benchmark, db, size):
+    albums = list(Album.objects.order_by("id")[:size])
+    benchmark(lambda: JSONRenderer().render(AlbumSerializer(albums, many=True).data))
+
+
+@pytest.mark.parametrize("size", [20, 50])
+def test_fast_path(benchmark, view, size):
+    rows = list(view.get_read_queryset(Album.objects.order_by("id"))[:size])
+    benchmark(lambda: FastJSONRenderer().render(view.represent(rows, many=True)))
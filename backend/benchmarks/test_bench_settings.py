@@ -0,0 +1,41 @@
+"""
+The album list and detail through the middleware stack and DEBUG setting
+of ``mymusicapi.settings.base`` and of ``mymusicapi.settings.prod``. Persistent database
+connections, the other production gain, only show between real deployments:
+compare them with ``bench_http`` (see the README).
+"""
+
+import pytest
+from albums.models import Album
+from django.test import Client
+from mymusicapi.settings import base, prod
+
+PROFILES = {
+    "base": {"DEBUG": base.DEBUG, "MIDDLEWARE": base.MIDDLEWARE},
+    "prod": {
+        "DEBUG": False,
+        "MIDDLEWARE": prod.MIDDLEWARE,
+        "BROWSER_MIDDLEWARE": prod.BROWSER_MIDDLEWARE,
+        "STATELESS_PATH_PREFIXES": prod.STATELESS_PATH_PREFIXES,
+    },
+}
+
+
+@pytest.fixture(params=PROFILES)
+def client(request, settings, db):
+    for name, value in PROFILES[request.param].items():
+        setattr(settings, name, value)
+    return Client()
+
+
+@pytest.mark.benchmark(group="profile-list")
+def test_list(benchmark, client):
+    response = benchmark(client.get, "/api/albums/", HTTP_ACCEPT="application/json")
+    assert response.status_code == 200
+
+
+@pytest.mark.benchmark(group="profile-detail")
+def test_detail(benchmark, client):
+    url = f"/api/albums/{Album.objects.values_list('pk', flat=True).first()}/"
+    response = benchmark(client.get, url, HTTP_ACCEPT="application/json")
+    assert response.status_code == 200
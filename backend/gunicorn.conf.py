@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration for the production profile.
+
+    gunicorn -c gunicorn.conf.py
+
+SERVER_MODE=wsgi (default) runs threaded sync workers; SERVER_MODE=asgi runs
+uvicorn workers, for use with ALBUMS_ASYNC_READS=1. WEB_CONCURRENCY sets the
+worker count (default: 2 per CPU + 1).
+"""
+
+import multiprocessing
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mymusicapi.settings.prod")
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+if os.environ.get("SERVER_MODE", "wsgi") == "asgi":
+    wsgi_app = "mymusicapi.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "mymusicapi.wsgi:application"
+    worker_class = "gthread"
+    # Threads overlap database waits; each holds its own persistent connection.
+    threads = int(os.environ.get("WEB_THREADS", 4))
+
+# Load the app once before forking so workers share its memory. Django opens
+# database connections lazily, so none are inherited across the fork.
+preload_app = True
+keepalive = int(os.environ.get("WEB_KEEPALIVE", 5))
+# Recycle workers now and then to bound memory growth; the jitter keeps them
+# from restarting together.
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+timeout = int(os.environ.get("WEB_TIMEOUT", 30))
@@ -0,0 +1,54 @@
+from asgiref.sync import (
+    async_to_sync,
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+def adapt(handler, handler_is_async, is_async):
+    if is_async and not handler_is_async:
+        return sync_to_async(handler, thread_sensitive=True)
+    if handler_is_async and not is_async:
+        return async_to_sync(handler)
+    return handler
+
+
+class BrowserMiddleware:
+    """
+    Runs ``settings.BROWSER_MIDDLEWARE`` (sessions, auth, messages, CSRF...)
+    only for paths outside ``settings.STATELESS_PATH_PREFIXES``.
+
+    The JSON API needs none of them: DRF views are CSRF-exempt and the API
+    has no session users. Requests under those prefixes go straight to the
+    rest of ``MIDDLEWARE``; the admin still gets the full stack. The inner
+    chain is built and adapted to sync/async the way Django builds
+    ``MIDDLEWARE``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefixes = tuple(settings.STATELESS_PATH_PREFIXES)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        handler, handler_is_async = get_response, self.is_async
+        for path in reversed(settings.BROWSER_MIDDLEWARE):
+            middleware = import_string(path)
+            middleware_is_async = getattr(middleware, "async_capable", False) and (
+                handler_is_async or not getattr(middleware, "sync_capable", True)
+            )
+            handler = middleware(adapt(handler, handler_is_async, middleware_is_async))
+            handler_is_async = middleware_is_async
+        self.browser_response = adapt(handler, handler_is_async, self.is_async)
+
+    def __call__(self, request):
+        if request.path_info.startswith(self.prefixes):
+            return self.get_response(request)
+        return self.browser_response(request)
@@ -0,0 +1,36 @@
+from drf_spectacular import openapi
+from drf_spectacular.utils import OpenApiParameter
+
+
+class AutoSchema(openapi.AutoSchema):
+    """
+    drf-spectacular's schema plus the ``fields``/``omit`` sparse fieldset
+    parameters on the read actions that accept them.
+    """
+
+    def get_override_parameters(self):
+        parameters = super().get_override_parameters()
+        accepts = getattr(self.view, "accepts_sparse_fieldsets", None)
+        if self.method != "GET" or accepts is None or not accepts():
+            return parameters
+        names = ", ".join(
+            f"`{name}`"
+            for name, field in self.view.get_serializer_class()().fields.items()
+            if not field.write_only
+        )
+        return [
+            OpenApiParameter(
+                name=self.view.fields_query_param,
+                description="Comma-separated fields to return, e.g. `id,title`; "
+                f"the others are not read from the database. One of: {names}.",
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                name=self.view.omit_query_param,
+                description="Comma-separated fields to leave out, e.g. `genre`.",
+                required=False,
+                type=str,
+            ),
+            *parameters,
+        ]
@@ -27,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "albums.metrics.MetricsMiddleware",
+    "albums.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -55,12 +57,117 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "mymusicapi.wsgi.application"
 
+
+def replica_databases(primary):
+    """
+    ``replica1``, ``replica2``... for the read replicas listed in
+    ``DB_REPLICAS``: comma-separated ``host[:port]`` for PostgreSQL, file
+    paths for SQLite (e.g. a copy of the primary, to try the routing
+    locally). Each one is ``primary`` with its location replaced; tests use
+    the primary's test database for them.
+    """
+    databases = {}
+    locations = os.environ.get("DB_REPLICAS", "").split(",")
+    for number, location in enumerate(filter(None, map(str.strip, locations)), 1):
+        replica = {**primary, "TEST": {"MIRROR": "default"}}
+        if primary["ENGINE"] == "django.db.backends.sqlite3":
+            replica["NAME"] = location
+        else:
+            replica["HOST"], _, port = location.partition(":")
+            replica["PORT"] = port or primary.get("PORT", "")
+        databases[f"replica{number}"] = replica
+    return databases
+
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+DATABASES.update(replica_databases(DATABASES["default"]))
+
+# GET requests to the album and artist endpoints read from these databases
+# (albums.replicas); writes and everything else use "default".
+ALBUMS_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["albums.replicas.ReplicaRouter"]
+# After a successful write the client reads from the primary for this long.
+ALBUMS_REPLICA_STICKY_SECONDS = int(os.environ.get("ALBUMS_REPLICA_STICKY_SECONDS", 5))
+ALBUMS_REPLICA_STICKY_COOKIE = "albums_read_primary"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Album response cache. Point it at a shared backend (e.g.
+    # django.core.cache.backends.redis.RedisCache) when running several workers.
+    "albums": {
+        "BACKEND": os.environ.get(
+            "ALBUMS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("ALBUMS_CACHE_LOCATION", "albums"),
+    },
+}
+
+ALBUMS_CACHE_ALIAS = "albums"
+ALBUMS_CACHE_ENABLED = os.environ.get("ALBUMS_CACHE_ENABLED", "1") == "1"
+ALBUMS_CACHE_TIMEOUT = int(os.environ.get("ALBUMS_CACHE_TIMEOUT", 300))
+
+# Maximum number of items accepted by the bulk album endpoints.
+ALBUMS_BULK_MAX_BATCH = int(os.environ.get("ALBUMS_BULK_MAX_BATCH", 1000))
+
+# Maximum number of ids per batch retrieve (/api/albums/batch/?ids=), and
+# the size of each worker's LRU of serialized albums for it (0 turns it off).
+ALBUMS_BATCH_MAX_IDS = int(os.environ.get("ALBUMS_BATCH_MAX_IDS", 200))
+ALBUMS_BATCH_LRU_SIZE = int(os.environ.get("ALBUMS_BATCH_LRU_SIZE", 0))
+
+# Albums nested in each artist of /api/artists/, in release order; the rest
+# are listed by the artist's albums_url.
+ALBUMS_ARTIST_NESTED_ALBUMS = int(os.environ.get("ALBUMS_ARTIST_NESTED_ALBUMS", 10))
+
+# Serve album list/detail/random reads as async views. Enable it when
+# running under ASGI; under WSGI every async view gets its own event loop.
+ALBUMS_ASYNC_READS = os.environ.get("ALBUMS_ASYNC_READS", "0") == "1"
+
+# How paginated lists get their total when the request has no count_mode:
+# "exact" (COUNT(*)), "approximate" (table statistics or a cached count) or
+# "none". Cached counts of filtered lists live this many seconds.
+ALBUMS_PAGINATION_COUNT = os.environ.get("ALBUMS_PAGINATION_COUNT", "exact")
+ALBUMS_COUNT_CACHE_TIMEOUT = int(os.environ.get("ALBUMS_COUNT_CACHE_TIMEOUT", 300))
+
+# Genre tags offered by the album admin's genre filter, most common first.
+ALBUMS_ADMIN_TOP_GENRES = int(os.environ.get("ALBUMS_ADMIN_TOP_GENRES", 20))
+
+# Most changes returned by one call to the change feed (albums/changes/).
+ALBUMS_CHANGES_PAGE_SIZE = int(os.environ.get("ALBUMS_CHANGES_PAGE_SIZE", 1000))
+
+# Rows fetched per database round trip by the streamed album export.
+ALBUMS_EXPORT_CHUNK_SIZE = int(os.environ.get("ALBUMS_EXPORT_CHUNK_SIZE", 2000))
+
+# JSON/CSV responses of at least this many bytes are compressed with the
+# best coding the client accepts (zstd, br, gzip); streams always are.
+ALBUMS_COMPRESSION_MIN_SIZE = int(os.environ.get("ALBUMS_COMPRESSION_MIN_SIZE", 1024))
+
+# Request metrics (served at /metrics): log a warning when one request runs
+# the same SQL statement this many times, or a single query takes longer
+# than this many milliseconds. Server-Timing headers are off by default.
+ALBUMS_METRICS_REPEATED_QUERY_THRESHOLD = int(
+    os.environ.get("ALBUMS_METRICS_REPEATED_QUERY_THRESHOLD", 10)
+)
+ALBUMS_METRICS_SLOW_QUERY_MS = int(os.environ.get("ALBUMS_METRICS_SLOW_QUERY_MS", 200))
+ALBUMS_METRICS_SERVER_TIMING = (
+    os.environ.get("ALBUMS_METRICS_SERVER_TIMING", "0") == "1"
+)
+
+# FastJSONRenderer uses orjson when installed and renders the same bytes as
+# DRF's JSONRenderer otherwise.
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "albums.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_SCHEMA_CLASS": "mymusicapi.openapi.AutoSchema",
+}
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -17,6 +17,8 @@ DATABASES = {
         "PORT": os.getenv("DB_PORT", 5432),
     }
 }
+DATABASES.update(replica_databases(DATABASES["default"]))
+ALBUMS_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
 
 INSTALLED_APPS += [
     "debug_toolbar",
@@ -38,12 +40,12 @@ if "debug_toolbar" in INSTALLED_APPS:
 
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "albums.renderers.FastJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
     ],
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_SCHEMA_CLASS": "mymusicapi.openapi.AutoSchema",
 }
 
 SPECTACULAR_SETTINGS = {
@@ -0,0 +1,120 @@
+import os
+
+from .base import *
+
+DEBUG = False
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+# Persistent connections, checked before reuse so a restarted database or
+# a dropped connection costs one retry instead of a failed request. With
+# DB_PGBOUNCER=1 the app talks to pgbouncer in transaction pooling mode:
+# server-side cursors (used by .iterator(), e.g. the streamed export) do
+# not survive between transactions there, so they are turned off.
+DB_PGBOUNCER = os.environ.get("DB_PGBOUNCER", "0") == "1"
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DB_NAME"),
+        "USER": os.environ.get("DB_USER"),
+        "PASSWORD": os.environ.get("DB_PASSWORD"),
+        "HOST": os.environ.get("DB_HOST", "db"),
+        "PORT": os.environ.get("DB_PORT", 5432),
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+    }
+}
+DATABASES.update(replica_databases(DATABASES["default"]))
+ALBUMS_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# The response cache and its generation counters live in the albums cache,
+# which every worker must share: with a per-process backend the other
+# workers would keep serving pages from before a write. Without a shared
+# ALBUMS_CACHE_BACKEND (e.g. django.core.cache.backends.redis.RedisCache
+# with ALBUMS_CACHE_LOCATION=redis://...) the response cache is off.
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+ALBUMS_CACHE_ENABLED = (
+    ALBUMS_CACHE_ENABLED
+    and CACHES[ALBUMS_CACHE_ALIAS]["BACKEND"] not in PROCESS_LOCAL_CACHE_BACKENDS
+)
+
+# Sessions, auth, messages, CSRF and clickjacking protection only run for
+# the admin and other browser pages (mymusicapi.middleware.BrowserMiddleware);
+# the JSON API and /metrics skip them.
+STATELESS_PATH_PREFIXES = ["/api/", "/metrics"]
+BROWSER_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+MIDDLEWARE = [
+    "albums.metrics.MetricsMiddleware",
+    "albums.compression.CompressionMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "mymusicapi.middleware.BrowserMiddleware",
+]
+# The admin checks look for its middleware in MIDDLEWARE only.
+SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+
+# Templates (admin, API docs) are compiled once per process.
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                )
+            ],
+        },
+    },
+]
+
+STATIC_ROOT = os.environ.get("STATIC_ROOT", BASE_DIR / "staticfiles")
+
+# JSON in and out; the export action sets its own CSV/NDJSON renderers. The
+# API is public, so requests skip DRF's session and basic authenticators.
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "albums.renderers.FastJSONRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+    ],
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_SCHEMA_CLASS": "mymusicapi.openapi.AutoSchema",
+}
+
+# Metrics warnings (N+1, slow queries) and errors go to stderr.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "root": {
+        "handlers": ["console"],
+        "level": os.environ.get("LOG_LEVEL", "WARNING"),
+    },
+}
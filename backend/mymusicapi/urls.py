@@ -1,3 +1,4 @@
+from albums.metrics import metrics_view
 from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
@@ -7,6 +8,7 @@ from . import schema
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("albums.urls")),
+    path("metrics", metrics_view, name="metrics"),
     path("", include(schema.urlpatterns)),
 ]
 